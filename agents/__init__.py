@@ -38,37 +38,71 @@ Usage:
     status = manager.get_all_status()
 """
 
+import importlib
+import sys
+from pathlib import Path
+
 from .base_agent import BaseAgent, AgentMessage, AgentEvent
-from .state_context_agent import StateContextAgent
-from .input_processing_agent import InputProcessingAgent
-from .qa_agent import QAAgent
-from .schema_evolution_agent import SchemaEvolutionAgent
-from .architecture_agent import ArchitectureAgent
-from .regression_guard_agent import RegressionGuardAgent
-from .integration_orchestrator_agent import IntegrationOrchestratorAgent
-from .experiment_tracker_agent import ExperimentTrackerAgent
-from .project_manager_agent import ProjectManagerAgent
-from .security_agent import SecurityAgent
-from .integration_guardian_agent import IntegrationGuardianAgent
 from .agent_manager import AgentManager
 
 # Import existing agents from project root
-import sys
-from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-try:
-    from ocr_learning_agent import OCRLearningAgent, get_learning_agent
-    from db_action_agent import DBActionAgent, get_action_agent
-    _EXISTING_AGENTS_AVAILABLE = True
-except ImportError:
-    OCRLearningAgent = None
-    DBActionAgent = None
-    get_learning_agent = None
-    get_action_agent = None
-    _EXISTING_AGENTS_AVAILABLE = False
+# טעינה עצלה (PEP 562) - מודול הסוכן נטען רק בגישה הראשונה לשם
+_LAZY_AGENTS = {
+    'StateContextAgent': '.state_context_agent',
+    'InputProcessingAgent': '.input_processing_agent',
+    'QAAgent': '.qa_agent',
+    'SchemaEvolutionAgent': '.schema_evolution_agent',
+    'ArchitectureAgent': '.architecture_agent',
+    'RegressionGuardAgent': '.regression_guard_agent',
+    'IntegrationOrchestratorAgent': '.integration_orchestrator_agent',
+    'ExperimentTrackerAgent': '.experiment_tracker_agent',
+    'ProjectManagerAgent': '.project_manager_agent',
+    'SecurityAgent': '.security_agent',
+    'IntegrationGuardianAgent': '.integration_guardian_agent',
+}
+
+# סוכנים קיימים משורש הפרויקט - None אם התלויות שלהם חסרות
+_LAZY_EXISTING_AGENTS = {
+    'OCRLearningAgent': 'ocr_learning_agent',
+    'get_learning_agent': 'ocr_learning_agent',
+    'DBActionAgent': 'db_action_agent',
+    'get_action_agent': 'db_action_agent',
+}
+
+
+def _existing_agents_available() -> bool:
+    """בדיקה (וטעינה) של הסוכנים הקיימים משורש הפרויקט"""
+    return all(
+        (globals()[name] if name in globals() else __getattr__(name)) is not None
+        for name in _LAZY_EXISTING_AGENTS
+    )
+
+
+def __getattr__(name):
+    if name in _LAZY_AGENTS:
+        module = importlib.import_module(_LAZY_AGENTS[name], __name__)
+        value = getattr(module, name)
+    elif name in _LAZY_EXISTING_AGENTS:
+        try:
+            module = importlib.import_module(_LAZY_EXISTING_AGENTS[name])
+            value = getattr(module, name)
+        except ImportError:
+            value = None
+    elif name == '_EXISTING_AGENTS_AVAILABLE':
+        return _existing_agents_available()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_AGENTS) | set(_LAZY_EXISTING_AGENTS))
 
 __all__ = [
     # Base classes
@@ -107,6 +141,7 @@ def get_all_agents_info() -> dict:
     Returns:
         Dictionary with agent information
     """
+    _EXISTING_AGENTS_AVAILABLE = _existing_agents_available()
     agents_info = {
         "core_agents": {
             "StateContextAgent": "ניהול מצב והקשר, תיעוד החלטות וניסויים",
@@ -4,21 +4,183 @@ Agent Manager - מנהל מרכזי לכל הסוכנים
 מספק ממשק אחיד להפעלה, תיאום ותקשורת בין כל הסוכנים במערכת.
 """
 
-import json
+import array
+import atexit
+import hashlib
+import importlib
+import itertools
+import os
+import queue
+import reprlib
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Type
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Type
 from pathlib import Path
-from enum import Enum
+from enum import IntEnum
 
-from .base_agent import BaseAgent, AgentMessage, AgentEvent, DOCS_DIR, LOGS_DIR
+from .base_agent import (
+    BaseAgent, AgentMessage, AgentEvent, DOCS_DIR, LOGS_DIR, json_dumps, json_loads
+)
 
 
-class AgentStatus(Enum):
+# סוכני הליבה (מודול, מחלקה) - נטענים פעם אחת, בקריאה הראשונה ל-_get_agent_classes
+_AGENT_MODULES = (
+    ("state_context_agent", "StateContextAgent"),
+    ("input_processing_agent", "InputProcessingAgent"),
+    ("qa_agent", "QAAgent"),
+    ("schema_evolution_agent", "SchemaEvolutionAgent"),
+    ("architecture_agent", "ArchitectureAgent"),
+    ("regression_guard_agent", "RegressionGuardAgent"),
+    ("integration_orchestrator_agent", "IntegrationOrchestratorAgent"),
+    ("experiment_tracker_agent", "ExperimentTrackerAgent"),
+    ("project_manager_agent", "ProjectManagerAgent"),
+    ("security_agent", "SecurityAgent"),
+    ("integration_guardian_agent", "IntegrationGuardianAgent"),
+)
+
+_AGENT_CLASSES: Optional[List[Tuple[str, Any]]] = None
+
+# repr מקוצר לפרמטרים ביומן - לא בונה את ה-repr המלא של קלט גדול
+_args_repr = reprlib.Repr()
+_args_repr.maxstring = 80
+_args_repr.maxother = 80
+
+
+def _get_agent_classes() -> List[Tuple[str, Any]]:
+    """
+    טעינת מחלקות סוכני הליבה (פעם אחת לתהליך)
+
+    Returns:
+        רשימת (שם מחלקה, המחלקה או חריגת הייבוא שלה)
+    """
+    global _AGENT_CLASSES
+    if _AGENT_CLASSES is None:
+        classes = []
+        # כל מודול נטען בנפרד - כשל ייבוא בסוכן אחד לא מפיל את השאר
+        for module_name, class_name in _AGENT_MODULES:
+            try:
+                module = importlib.import_module(f".{module_name}", __package__)
+                classes.append((class_name, getattr(module, class_name)))
+            except Exception as e:
+                classes.append((class_name, e))
+        _AGENT_CLASSES = classes
+    return _AGENT_CLASSES
+
+
+def _build_agent(agent_class: Any) -> BaseAgent:
+    """בניית מופע סוכן (או העברת חריגת הייבוא שנשמרה עבורו)"""
+    if isinstance(agent_class, Exception):
+        raise agent_class
+    return agent_class()
+
+
+class AgentStatus(IntEnum):
     """סטטוס סוכן"""
-    IDLE = "idle"
-    RUNNING = "running"
-    ERROR = "error"
-    DISABLED = "disabled"
+    IDLE = 0
+    RUNNING = 1
+    ERROR = 2
+    DISABLED = 3
+
+
+# שם הסטטוס כפי שמוצג בדוחות ("idle", "running", ...)
+_STATUS_NAMES = {status: status.name.lower() for status in AgentStatus}
+
+
+class EventJournal:
+    """
+    יומן אירועים מצטבר (JSONL) הנכתב ברקע
+
+    אירועים נכנסים לתור ונכתבים ע"י thread ייעודי באצוות - קריאת write
+    אחת לכל אצווה, מחוץ לנתיב הקריטי של run_agent / send_message.
+    """
+
+    def __init__(self, path: Path, max_batch: int = 256):
+        """
+        Args:
+            path: נתיב קובץ היומן
+            max_batch: מספר אירועים מקסימלי לכתיבה אחת
+        """
+        self.path = path
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(path, flags, 0o644)
+        self.size = os.fstat(self._fd).st_size
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"journal-{path.name}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, line: bytes):
+        """הוספת שורה לתור הכתיבה"""
+        self.size += len(line)
+        self._queue.put(line)
+
+    def _run(self):
+        """לולאת הכתיבה - מרוקנת את התור באצוות"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            data = b"".join(line for line in batch if line is not None)
+            try:
+                if data:
+                    self._write_all(data)
+            except OSError:
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if None in batch:
+                return
+
+    def _write_all(self, data: bytes):
+        """כתיבת כל הבאפר (os.write עשוי לכתוב חלקית)"""
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def flush(self):
+        """המתנה עד שכל השורות שבתור נכתבו לדיסק"""
+        if not self._closed:
+            self._queue.join()
+
+    def truncate(self):
+        """
+        ריקון היומן אחרי compaction
+
+        הקורא אחראי לכך שלא יתווספו שורות חדשות במהלך הקריאה.
+        """
+        self.flush()
+        if not self._closed:
+            os.ftruncate(self._fd, 0)
+        self.size = 0
+
+    @property
+    def closed(self) -> bool:
+        """האם היומן נסגר"""
+        return self._closed
+
+    def close(self):
+        """ריקון התור וסגירת הקובץ"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._thread.join()
+        os.close(self._fd)
 
 
 class AgentManager:
@@ -42,42 +204,111 @@ class AgentManager:
         self.config = config or {}
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_status: Dict[str, AgentStatus] = {}
-        self.message_queue: List[AgentMessage] = []
-        self.event_log: List[AgentEvent] = []
+        # שם מחלקת כל סוכן - נקבע פעם אחת ברישום
+        self._agent_types: Dict[str, str] = {}
+        # גבולות זיכרון - ההודעות/האירועים הישנים ביותר נזרקים
+        max_messages = self.config.get("max_messages", 100_000)
+        max_events = self.config.get("max_events", 10_000)
+        # תיבות דואר: רשימה לכל מקבל של (-עדיפות, מספר סידורי, הודעה) - ממוינת בקריאה
+        self._inbox: Dict[str, List[Tuple[int, int, AgentMessage]]] = defaultdict(list)
+        self._read: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_messages))
+        # שידורים נשמרים פעם אחת; לכל מקבל סמן קריאה משלו
+        self._broadcasts: deque = deque(maxlen=max_messages)
+        self._broadcast_base = 0
+        self._broadcast_cursor: Dict[str, int] = defaultdict(int)
+        self._msg_seq = itertools.count()
+        # מונים רצים לסטטיסטיקות הודעות
+        self._msg_total = 0
+        self._msg_unread = 0
+        self._msg_by_type: Counter = Counter()
+        self.event_log: deque = deque(maxlen=max_events)
         self.created_at = datetime.now()
+        # מגן על סטטוס הסוכנים ויומן האירועים בהרצה מקבילית
+        self._lock = threading.RLock()
+        # מטמון סטטוס: שם -> (גרסה, זמן חישוב, סטטוס)
+        self._status_cache: Dict[str, Tuple[int, float, Dict[str, Any]]] = {}
+        self._status_version: Dict[str, int] = defaultdict(int)
+        # hash של ה-snapshot האחרון שנכתב - לדילוג על כתיבה זהה
+        self._last_state_hash = b""
 
         # טעינת מצב קודם אם קיים
         self._load_state()
 
+        # יומן אירועים מצטבר - נכתב ברקע
+        self._journal = EventJournal(
+            self._get_journal_file(),
+            max_batch=self.config.get("journal_max_batch", 256)
+        )
+
     def _get_state_file(self) -> Path:
         """נתיב קובץ מצב"""
         return DOCS_DIR / "agent_manager_state.json"
 
+    def _get_journal_file(self) -> Path:
+        """נתיב יומן האירועים המצטבר"""
+        return DOCS_DIR / "agent_manager_events.jsonl"
+
     def _load_state(self):
-        """טעינת מצב קודם"""
+        """טעינת מצב קודם - snapshot ואחריו זנב היומן המצטבר"""
+        events = deque(maxlen=100)  # שמירת 100 אחרונים
+
         state_file = self._get_state_file()
         if state_file.exists():
             try:
-                with open(state_file, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                    # שחזור event log
-                    self.event_log = [
-                        AgentEvent(e["type"], e["source"], e["data"])
-                        for e in state.get("event_log", [])[-100:]  # שמירת 100 אחרונים
-                    ]
+                data = state_file.read_bytes()
+                state = json_loads(data)
+                self._last_state_hash = hashlib.sha256(data).digest()
+                events.extend(state.get("event_log", []))
             except Exception:
                 pass
 
+        journal_file = self._get_journal_file()
+        if journal_file.exists():
+            try:
+                with open(journal_file, 'rb') as f:
+                    tail = deque(f, maxlen=100)
+                for line in tail:
+                    try:
+                        events.append(json_loads(line))
+                    except ValueError:
+                        continue  # שורה חלקית מכתיבה שנקטעה
+            except OSError:
+                pass
+
+        # שחזור event log - הצורה השמורה נשמרת כמו שהיא
+        self.event_log.clear()
+        for e in events:
+            try:
+                event = AgentEvent(e["type"], e["source"], e["data"])
+            except (KeyError, TypeError):
+                continue
+            event._cached_dict = e
+            self.event_log.append(event)
+
     def _save_state(self):
-        """שמירת מצב"""
+        """
+        שמירת snapshot מלא ו-compaction של היומן המצטבר
+
+        נקרא מ-cleanup() או כשהיומן חורג מ-journal_max_bytes.
+        """
         state_file = self._get_state_file()
-        state = {
-            "created_at": self.created_at.isoformat(),
-            "agents": list(self.agents.keys()),
-            "event_log": [e.to_dict() for e in self.event_log[-100:]]
-        }
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        with self._lock:
+            state = {
+                "created_at": self.created_at.isoformat(),
+                "agents": list(self.agents.keys()),
+                "event_log": [e._cached_dict for e in self._recent_events(100)]
+            }
+            data = json_dumps(state)
+            state_hash = hashlib.sha256(data).digest()
+
+            self._journal.flush()
+            if state_hash != self._last_state_hash:
+                # כתיבה אטומית - קובץ זמני ואז החלפה
+                tmp_file = state_file.with_suffix(".json.tmp")
+                tmp_file.write_bytes(data)
+                os.replace(tmp_file, state_file)
+                self._last_state_hash = state_hash
+            self._journal.truncate()
 
     def register_agent(self, agent: BaseAgent) -> bool:
         """
@@ -89,17 +320,22 @@ class AgentManager:
         Returns:
             True אם הרישום הצליח
         """
-        if agent.name in self.agents:
+        with self._lock:
+            already_registered = agent.name in self.agents
+            if not already_registered:
+                self.agents[agent.name] = agent
+                self.agent_status[agent.name] = AgentStatus.IDLE
+                self._agent_types[agent.name] = type(agent).__name__
+                self._status_version[agent.name] += 1
+
+        if already_registered:
             self._log_event("agent_registration_failed", agent.name, {
                 "reason": "Agent already registered"
             })
             return False
 
-        self.agents[agent.name] = agent
-        self.agent_status[agent.name] = AgentStatus.IDLE
-
         self._log_event("agent_registered", agent.name, {
-            "type": agent.__class__.__name__
+            "type": self._agent_types[agent.name]
         })
 
         return True
@@ -117,8 +353,11 @@ class AgentManager:
         if agent_name not in self.agents:
             return False
 
-        del self.agents[agent_name]
-        del self.agent_status[agent_name]
+        with self._lock:
+            del self.agents[agent_name]
+            del self.agent_status[agent_name]
+            del self._agent_types[agent_name]
+            self._status_cache.pop(agent_name, None)
 
         self._log_event("agent_unregistered", "manager", {
             "agent": agent_name
@@ -126,6 +365,50 @@ class AgentManager:
 
         return True
 
+    def _set_status(self, agent_name: str, status: AgentStatus):
+        """עדכון סטטוס סוכן"""
+        with self._lock:
+            self.agent_status[agent_name] = status
+            self._status_version[agent_name] += 1
+
+    def invalidate_status(self, agent_name: Optional[str] = None):
+        """
+        סימון סטטוס שמור כלא-עדכני (למשל אחרי הפעלת סוכן ישירות)
+
+        Args:
+            agent_name: שם הסוכן, או None לכל הסוכנים
+        """
+        with self._lock:
+            for name in [agent_name] if agent_name else list(self.agents):
+                self._status_version[name] += 1
+
+    def _get_cached_status(self, agent_name: str) -> Dict[str, Any]:
+        """
+        סטטוס סוכן מהמטמון, מחושב מחדש רק אם הסוכן השתנה או שפג תוקפו
+
+        Args:
+            agent_name: שם הסוכן
+
+        Returns:
+            רשומת סטטוס (עותק)
+        """
+        version = self._status_version[agent_name]
+        ttl = self.config.get("status_cache_ttl", 30.0)
+        now = time.monotonic()
+
+        cached = self._status_cache.get(agent_name)
+        if cached and cached[0] == version and now - cached[1] < ttl:
+            return dict(cached[2])
+
+        record = {
+            "status": _STATUS_NAMES[self.agent_status[agent_name]],
+            "type": self._agent_types[agent_name],
+            **self.agents[agent_name].get_status()
+        }
+        self._status_cache[agent_name] = (version, now, record)
+
+        return dict(record)
+
     def get_agent(self, agent_name: str) -> Optional[BaseAgent]:
         """
         קבלת סוכן לפי שם
@@ -149,20 +432,21 @@ class AgentManager:
         Returns:
             תוצאות הפעולה
         """
-        if agent_name not in self.agents:
+        agent = self.agents.get(agent_name)
+        if agent is None:
             return {"error": f"Agent not found: {agent_name}"}
 
-        agent = self.agents[agent_name]
-        self.agent_status[agent_name] = AgentStatus.RUNNING
+        self._set_status(agent_name, AgentStatus.RUNNING)
 
-        self._log_event("agent_started", agent_name, {
-            "args": str(args)[:100],
-            "kwargs": str(kwargs)[:100]
-        })
+        event_data = {"action": kwargs.get("action")}
+        if self.config.get("verbose_logging", False):
+            event_data["args"] = _args_repr.repr(args)
+            event_data["kwargs"] = _args_repr.repr(kwargs)
+        self._log_event("agent_started", agent_name, event_data)
 
         try:
             result = agent.run(*args, **kwargs)
-            self.agent_status[agent_name] = AgentStatus.IDLE
+            self._set_status(agent_name, AgentStatus.IDLE)
 
             self._log_event("agent_completed", agent_name, {
                 "success": True
@@ -171,7 +455,7 @@ class AgentManager:
             return result
 
         except Exception as e:
-            self.agent_status[agent_name] = AgentStatus.ERROR
+            self._set_status(agent_name, AgentStatus.ERROR)
 
             self._log_event("agent_error", agent_name, {
                 "error": str(e)
@@ -181,28 +465,64 @@ class AgentManager:
 
     def run_agents_parallel(
         self,
-        agent_tasks: List[Dict[str, Any]]
+        agent_tasks: List[Dict[str, Any]],
+        serial: bool = False
     ) -> Dict[str, Dict[str, Any]]:
         """
-        הפעלת מספר סוכנים (סדרתית - ניתן להרחיב לפרללית)
+        הפעלת מספר סוכנים במקביל (ThreadPoolExecutor)
+
+        משימות של אותו סוכן רצות זו אחר זו באותו worker (סוכן אינו בטוח
+        להרצה מקבילית עם עצמו); סוכנים שונים רצים במקביל.
 
         Args:
             agent_tasks: רשימת משימות [{agent_name, args, kwargs}, ...]
+            serial: הרצה סדרתית (כמו בעבר)
 
         Returns:
-            תוצאות כל הסוכנים
+            תוצאות כל הסוכנים - לסוכן עם כמה משימות, תוצאת האחרונה שבהן
         """
-        results = {}
-
+        # משימות לפי סוכן, בסדר ההופעה הראשונה של כל סוכן
+        groups: Dict[str, List[Dict[str, Any]]] = {}
         for task in agent_tasks:
-            agent_name = task.get("agent_name")
-            args = task.get("args", [])
-            kwargs = task.get("kwargs", {})
+            groups.setdefault(task.get("agent_name"), []).append(task)
+
+        max_workers = min(len(groups), self.config.get("max_parallel_agents", 8))
+
+        if serial or max_workers <= 1:
+            return {
+                agent_name: self._run_agent_tasks(agent_name, tasks)
+                for agent_name, tasks in groups.items()
+            }
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (agent_name, executor.submit(self._run_agent_tasks, agent_name, tasks))
+                for agent_name, tasks in groups.items()
+            ]
 
-            results[agent_name] = self.run_agent(agent_name, *args, **kwargs)
+            # איסוף לפי סדר המשימות - run_agent לא זורק חריגות
+            for agent_name, future in futures:
+                results[agent_name] = future.result()
 
         return results
 
+    def _run_agent_tasks(self, agent_name: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        הרצת משימות של סוכן אחד לפי הסדר
+
+        Args:
+            agent_name: שם הסוכן
+            tasks: המשימות שלו [{agent_name, args, kwargs}, ...]
+
+        Returns:
+            תוצאת המשימה האחרונה
+        """
+        result = None
+        for task in tasks:
+            result = self.run_agent(agent_name, *task.get("args", []), **task.get("kwargs", {}))
+        return result
+
     def send_message(
         self,
         sender: str,
@@ -224,11 +544,15 @@ class AgentManager:
         Returns:
             True אם ההודעה נשלחה
         """
-        if receiver not in self.agents and receiver != "broadcast":
+        if receiver == "broadcast":
+            return self.broadcast(sender, message_type, content, priority)
+
+        if receiver not in self.agents:
             return False
 
         message = AgentMessage(sender, receiver, message_type, content, priority)
-        self.message_queue.append(message)
+        self._inbox[receiver].append((-priority, next(self._msg_seq), message))
+        self._count_message(message_type)
 
         self._log_event("message_sent", sender, {
             "receiver": receiver,
@@ -252,38 +576,97 @@ class AgentManager:
         Returns:
             רשימת הודעות
         """
-        messages = []
+        entries = []
+        if not unread_only:
+            entries.extend(self._read.get(receiver, ()))
+
+        # כל ההודעות שבתיבה נקראות - נלקחות כמו שהן וממוינות פעם אחת למטה
+        unread = self._inbox.pop(receiver, [])
+        entries.extend(unread)
 
-        for msg in self.message_queue:
-            if msg.receiver == receiver or msg.receiver == "broadcast":
-                if not unread_only or not msg.read:
-                    messages.append(msg)
-                    msg.read = True
+        # שידורים - רק מהסמן של המקבל הזה והלאה
+        cursor = max(self._broadcast_cursor[receiver], self._broadcast_base)
+        start = cursor - self._broadcast_base if unread_only else 0
+        entries.extend(itertools.islice(self._broadcasts, start, None))
+        self._broadcast_cursor[receiver] = self._broadcast_base + len(self._broadcasts)
 
-        # מיון לפי עדיפות
-        messages.sort(key=lambda m: m.priority, reverse=True)
+        for entry in entries:
+            msg = entry[2]
+            if not msg.read:
+                msg.read = True
+                self._msg_unread -= 1
 
-        return messages
+        # הודעות ישירות שנקראו עוברות להיסטוריה (לטובת unread_only=False)
+        if unread:
+            history = self._read[receiver]
+            for entry in unread:
+                if len(history) == history.maxlen:
+                    self._forget_messages((history.popleft(),))
+                history.append(entry)
 
-    def broadcast(self, sender: str, message_type: str, content: Any):
+        # מיון לפי עדיפות (ובתוכה לפי סדר שליחה)
+        entries.sort(key=lambda e: (e[0], e[1]))
+
+        return [entry[2] for entry in entries]
+
+    def broadcast(
+        self,
+        sender: str,
+        message_type: str,
+        content: Any,
+        priority: int = 0
+    ) -> bool:
         """
         שידור הודעה לכל הסוכנים
 
+        ההודעה נשמרת פעם אחת; כל סוכן מקבל אותה ב-get_messages לפי
+        סמן הקריאה שלו, כך שקריאה של סוכן אחד לא מסתירה אותה מהאחרים.
+
         Args:
             sender: שם הסוכן השולח
             message_type: סוג ההודעה
             content: תוכן ההודעה
+            priority: עדיפות (0 = רגיל)
+
+        Returns:
+            True (שידור תמיד מתקבל)
         """
-        self.send_message(sender, "broadcast", message_type, content)
+        message = AgentMessage(sender, "broadcast", message_type, content, priority)
+
+        if len(self._broadcasts) == self._broadcasts.maxlen:
+            self._forget_messages((self._broadcasts.popleft(),))
+            self._broadcast_base += 1
+        self._broadcasts.append((-priority, next(self._msg_seq), message))
+        self._count_message(message_type)
+
+        self._log_event("message_sent", sender, {
+            "receiver": "broadcast",
+            "type": message_type
+        })
+
+        return True
+
+    def _count_message(self, message_type: str):
+        """עדכון המונים עבור הודעה חדשה"""
+        self._msg_total += 1
+        self._msg_unread += 1
+        self._msg_by_type[message_type] += 1
 
     def _log_event(self, event_type: str, source: str, data: Dict[str, Any]):
         """תיעוד אירוע"""
         event = AgentEvent(event_type, source, data)
-        self.event_log.append(event)
+        # המרה למילון פעם אחת - משמשת את היומן, ה-snapshot ו-get_event_log
+        event._cached_dict = event.to_dict()
+        line = json_dumps(event._cached_dict)
+
+        with self._lock:
+            self.event_log.append(event)
+
+            # כתיבה ליומן המצטבר ברקע; snapshot מלא רק כשהיומן גדל מדי
+            self._journal.submit(line + b"\n")
 
-        # שמירת מצב כל 10 אירועים
-        if len(self.event_log) % 10 == 0:
-            self._save_state()
+            if self._journal.size >= self.config.get("journal_max_bytes", 1 << 20):
+                self._save_state()
 
     def get_all_status(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -294,17 +677,15 @@ class AgentManager:
         """
         status = {}
 
-        for name, agent in self.agents.items():
+        for name in list(self.agents):
             try:
-                agent_status = agent.get_status()
+                status[name] = self._get_cached_status(name)
             except Exception as e:
-                agent_status = {"error": str(e)}
-
-            status[name] = {
-                "status": self.agent_status[name].value,
-                "type": agent.__class__.__name__,
-                **agent_status
-            }
+                status[name] = {
+                    "status": _STATUS_NAMES[self.agent_status[name]],
+                    "type": self._agent_types[name],
+                    "error": str(e)
+                }
 
         return status
 
@@ -321,13 +702,9 @@ class AgentManager:
         if agent_name not in self.agents:
             return None
 
-        agent = self.agents[agent_name]
-
         return {
             "name": agent_name,
-            "status": self.agent_status[agent_name].value,
-            "type": agent.__class__.__name__,
-            **agent.get_status()
+            **self._get_cached_status(agent_name)
         }
 
     def get_event_log(self, limit: int = 50) -> List[Dict]:
@@ -338,9 +715,15 @@ class AgentManager:
             limit: מספר אירועים מקסימלי
 
         Returns:
-            רשימת אירועים
+            רשימת אירועים (המילונים השמורים - לקריאה בלבד)
         """
-        return [e.to_dict() for e in self.event_log[-limit:]]
+        return [e._cached_dict for e in self._recent_events(limit)]
+
+    def _recent_events(self, limit: int) -> List[AgentEvent]:
+        """האירועים האחרונים (עד limit) בסדר כרונולוגי - O(limit)"""
+        recent = list(itertools.islice(reversed(self.event_log), limit))
+        recent.reverse()
+        return recent
 
     def get_message_stats(self) -> Dict[str, Any]:
         """
@@ -349,25 +732,23 @@ class AgentManager:
         Returns:
             סטטיסטיקות
         """
-        total = len(self.message_queue)
-        unread = sum(1 for m in self.message_queue if not m.read)
-
-        by_type = {}
-        for msg in self.message_queue:
-            by_type[msg.message_type] = by_type.get(msg.message_type, 0) + 1
-
         return {
-            "total": total,
-            "unread": unread,
-            "by_type": by_type
+            "total": self._msg_total,
+            "unread": self._msg_unread,
+            "by_type": {t: n for t, n in self._msg_by_type.items() if n}
         }
 
-    def run_workflow(self, workflow: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def run_workflow(
+        self,
+        workflow: List[Dict[str, Any]],
+        keep_results: bool = True
+    ) -> Dict[str, Any]:
         """
         הרצת workflow של סוכנים
 
         Args:
             workflow: רשימת שלבים [{agent, action, params}, ...]
+            keep_results: שמירת תוצאת כל שלב (False - רק הצלחה וגודל)
 
         Returns:
             תוצאות ה-workflow
@@ -378,6 +759,32 @@ class AgentManager:
             "success": True
         }
 
+        for step_result in self.run_workflow_iter(workflow, keep_results):
+            results["steps"].append(step_result)
+            if not step_result["success"]:
+                results["success"] = False
+
+        results["completed_at"] = datetime.now().isoformat()
+        return results
+
+    def run_workflow_iter(
+        self,
+        workflow: List[Dict[str, Any]],
+        keep_results: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        הרצת workflow של סוכנים שלב אחר שלב
+
+        כל שלב מוחזר מיד עם סיומו, כך שהקורא יכול לעבד (או לשמור בעצמו)
+        תוצאות גדולות בלי שה-workflow יחזיק את כולן בזיכרון.
+
+        Args:
+            workflow: רשימת שלבים [{agent, action, params}, ...]
+            keep_results: שמירת תוצאת השלב (False - רק הצלחה וגודל)
+
+        Yields:
+            תוצאת כל שלב
+        """
         for i, step in enumerate(workflow):
             agent_name = step.get("agent")
             action = step.get("action")
@@ -391,27 +798,26 @@ class AgentManager:
 
             try:
                 result = self.run_agent(agent_name, action=action, **params)
-                step_result["result"] = result
+                if keep_results:
+                    step_result["result"] = result
+                else:
+                    step_result["result_size"] = len(result)
                 step_result["success"] = "error" not in result
+                if not keep_results and not step_result["success"]:
+                    step_result["error"] = result["error"]
 
-                if not step_result["success"]:
-                    results["success"] = False
-                    if step.get("stop_on_error", True):
-                        step_result["stopped"] = True
-                        results["steps"].append(step_result)
-                        break
+                if not step_result["success"] and step.get("stop_on_error", True):
+                    step_result["stopped"] = True
+                    yield step_result
+                    return
 
             except Exception as e:
                 step_result["error"] = str(e)
                 step_result["success"] = False
-                results["success"] = False
-                results["steps"].append(step_result)
-                break
-
-            results["steps"].append(step_result)
+                yield step_result
+                return
 
-        results["completed_at"] = datetime.now().isoformat()
-        return results
+            yield step_result
 
     def initialize_all_agents(self) -> Dict[str, bool]:
         """
@@ -420,45 +826,27 @@ class AgentManager:
         Returns:
             מילון עם סטטוס אתחול לכל סוכן
         """
-        from .state_context_agent import StateContextAgent
-        from .input_processing_agent import InputProcessingAgent
-        from .qa_agent import QAAgent
-        from .schema_evolution_agent import SchemaEvolutionAgent
-        from .architecture_agent import ArchitectureAgent
-        from .regression_guard_agent import RegressionGuardAgent
-        from .integration_orchestrator_agent import IntegrationOrchestratorAgent
-        from .experiment_tracker_agent import ExperimentTrackerAgent
-        from .project_manager_agent import ProjectManagerAgent
-        from .security_agent import SecurityAgent
-        from .integration_guardian_agent import IntegrationGuardianAgent
-
-        agents_to_init = [
-            StateContextAgent,
-            InputProcessingAgent,
-            QAAgent,
-            SchemaEvolutionAgent,
-            ArchitectureAgent,
-            RegressionGuardAgent,
-            IntegrationOrchestratorAgent,
-            ExperimentTrackerAgent,
-            ProjectManagerAgent,
-            SecurityAgent,
-            IntegrationGuardianAgent
-        ]
-
+        agent_classes = _get_agent_classes()
         results = {}
 
-        for AgentClass in agents_to_init:
-            try:
-                agent = AgentClass()
-                success = self.register_agent(agent)
-                results[agent.name] = success
-            except Exception as e:
-                results[AgentClass.__name__] = False
-                self._log_event("agent_init_error", "manager", {
-                    "agent_class": AgentClass.__name__,
-                    "error": str(e)
-                })
+        # בנייה מקבילית (אתחול סוכן ניגש לדיסק), רישום לפי הסדר
+        with ThreadPoolExecutor(max_workers=len(agent_classes)) as executor:
+            futures = [
+                (class_name, executor.submit(_build_agent, AgentClass))
+                for class_name, AgentClass in agent_classes
+            ]
+
+            for class_name, future in futures:
+                try:
+                    agent = future.result()
+                    success = self.register_agent(agent)
+                    results[agent.name] = success
+                except Exception as e:
+                    results[class_name] = False
+                    self._log_event("agent_init_error", "manager", {
+                        "agent_class": class_name,
+                        "error": str(e)
+                    })
 
         self._save_state()
         return results
@@ -473,12 +861,12 @@ class AgentManager:
         Returns:
             True אם האיפוס הצליח
         """
-        if agent_name not in self.agents:
+        agent = self.agents.get(agent_name)
+        if agent is None:
             return False
 
-        agent = self.agents[agent_name]
         agent.reset()
-        self.agent_status[agent_name] = AgentStatus.IDLE
+        self._set_status(agent_name, AgentStatus.IDLE)
 
         self._log_event("agent_reset", "manager", {
             "agent": agent_name
@@ -499,7 +887,7 @@ class AgentManager:
         if agent_name not in self.agents:
             return False
 
-        self.agent_status[agent_name] = AgentStatus.DISABLED
+        self._set_status(agent_name, AgentStatus.DISABLED)
 
         self._log_event("agent_disabled", "manager", {
             "agent": agent_name
@@ -520,7 +908,7 @@ class AgentManager:
         if agent_name not in self.agents:
             return False
 
-        self.agent_status[agent_name] = AgentStatus.IDLE
+        self._set_status(agent_name, AgentStatus.IDLE)
 
         self._log_event("agent_enabled", "manager", {
             "agent": agent_name
@@ -535,29 +923,76 @@ class AgentManager:
         Returns:
             סיכום כללי
         """
-        status_counts = {}
+        counts = array.array('i', [0] * len(AgentStatus))
         for status in self.agent_status.values():
-            status_counts[status.value] = status_counts.get(status.value, 0) + 1
+            counts[status] += 1
+
+        status_counts = {
+            _STATUS_NAMES[status]: counts[status]
+            for status in AgentStatus if counts[status]
+        }
 
         return {
             "total_agents": len(self.agents),
             "status_breakdown": status_counts,
-            "messages_pending": sum(1 for m in self.message_queue if not m.read),
+            "messages_pending": self._msg_unread,
             "events_logged": len(self.event_log),
             "uptime_since": self.created_at.isoformat()
         }
 
     def cleanup(self):
         """ניקוי משאבים"""
-        # ניקוי הודעות ישנות
-        self.message_queue = [m for m in self.message_queue if not m.read]
+        # ניקוי הודעות שנקראו
+        for entries in self._read.values():
+            self._forget_messages(entries)
+        self._read.clear()
+
+        # שידורים שכל הסוכנים הרשומים כבר קראו
+        if self.agents:
+            seen = min(self._broadcast_cursor[name] for name in self.agents)
+            drop = seen - self._broadcast_base
+            if drop > 0:
+                for _ in range(drop):
+                    self._forget_messages((self._broadcasts.popleft(),))
+                self._broadcast_base = seen
 
         # שמירת מצב
         self._save_state()
 
         self._log_event("cleanup", "manager", {
-            "messages_remaining": len(self.message_queue)
+            "messages_remaining": self._msg_total
         })
 
+    def close(self):
+        """
+        סגירת המנהל - סגירת הסוכנים הרשומים, snapshot מלא, ריקון היומן
+        המצטבר וסגירתו
+
+        קריאה נוספת אינה עושה דבר. ניתן גם להשתמש במנהל כ-context manager.
+        """
+        if self._journal.closed:
+            return
+        for agent in list(self.agents.values()):
+            try:
+                agent.close()
+            except Exception as e:
+                agent.logger.error(f"Failed to close agent: {e}")
+        self._save_state()
+        self._journal.close()
+
+    def __enter__(self) -> "AgentManager":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _forget_messages(self, entries):
+        """עדכון המונים עבור הודעות שנמחקו"""
+        for _, _, msg in entries:
+            self._msg_total -= 1
+            self._msg_by_type[msg.message_type] -= 1
+            if not msg.read:
+                self._msg_unread -= 1
+
     def __repr__(self):
         return f"<AgentManager(agents={len(self.agents)})>"
@@ -8,15 +8,39 @@ Architecture Agent - סוכן ארכיטקטורה
 - ייעוץ ארכיטקטוני
 """
 
-import json
+import hashlib
 import re
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from enum import Enum
 
-from .base_agent import BaseAgent, DOCS_DIR
+from .base_agent import (
+    BaseAgent, DOCS_DIR, _DATACLASS_SLOTS, _ensure_dir, _write_atomic, json_dumps, json_loads
+)
+
+# pyahocorasick אופציונלי - סריקה אחת של הקוד לכל המחרוזות האסורות
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# מילה לצורך חיפוש ב-ask (עברית/אנגלית/ספרות)
+_WORD_RE = re.compile(r"\w+")
+
+# שורה בהחלטת ADR שאוסרת מחרוזת בקוד, למשל "FORBID: import pickle"
+_FORBID_RE = re.compile(r"^\s*FORBID:\s*(.+?)\s*$", re.MULTILINE)
+
+
+def _tokenize(text: str) -> frozenset:
+    """פירוק טקסט לקבוצת מילים (באותיות קטנות)"""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+# דחיסת יומן ה-ADRs לתמונת מצב כשהוא גדל מעבר ל-4 מגודל התמונה (ולפחות 64KB)
+_ADR_LOG_COMPACT_RATIO = 4
+_ADR_LOG_COMPACT_MIN = 64 * 1024
 
 
 class ADRStatus(Enum):
@@ -27,7 +51,7 @@ class ADRStatus(Enum):
     SUPERSEDED = "superseded"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ADR:
     """Architecture Decision Record"""
     id: int
@@ -43,45 +67,200 @@ class ADR:
     superseded_by: int = None
 
 
+def _adr_to_json(adr: ADR) -> Dict[str, Any]:
+    """המרת ADR למילון לשמירה - העתקה רדודה (asdict מעתיק לעומק)"""
+    return {
+        "id": adr.id,
+        "title": adr.title,
+        "status": adr.status,
+        "context": adr.context,
+        "decision": adr.decision,
+        "reasoning": adr.reasoning,
+        "alternatives": adr.alternatives,
+        "consequences": adr.consequences,
+        "created_at": adr.created_at,
+        "updated_at": adr.updated_at,
+        "superseded_by": adr.superseded_by,
+    }
+
+
 class ArchitectureAgent(BaseAgent):
     """סוכן ארכיטקטורה"""
 
     def __init__(self, config: Optional[Dict] = None):
         super().__init__("architecture", config)
+        # שינויים שנדחו (defer=True) וממתינים ל-flush()
+        self._pending_adr_ops: List[bytes] = []
+        self._dirty_arch = False
+        self._pending_adr_md = set()
+        self._last_adrs_hash = b""
+        # תוצאות שמורות: שם -> (גרסאות שעליהן חושבו, תוצאה)
+        self._memo: Dict[str, Tuple[tuple, Any]] = {}
         self._init_directories()
         self._load_adrs()
         self._load_architecture_doc()
 
+        # פקודות run() - נבנות פעם אחת ולא בכל קריאה
+        self._commands = {
+            "create_adr": self.create_adr,
+            "update_adr_status": self.update_adr_status,
+            "list_adrs": self.list_adrs,
+            "register_component": self.register_component,
+            "add_principle": self.add_principle,
+            "check_consistency": self.check_consistency,
+            "check_compliance": self.check_adr_compliance,
+            "ask": self.ask,
+            "generate_doc": self.generate_architecture_doc,
+            "flush": self.flush,
+        }
+
     def _init_directories(self):
         """יצירת מבנה תיקיות"""
         self.arch_dir = DOCS_DIR / "architecture"
         self.adr_dir = self.arch_dir / "adrs"
 
         for directory in [self.arch_dir, self.adr_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(directory)
 
     def _load_adrs(self):
-        """טעינת ADRs"""
-        adrs_file = self.adr_dir / "adrs.json"
-        if adrs_file.exists():
-            with open(adrs_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.adrs = [ADR(**adr) for adr in data]
-        else:
-            self.adrs = []
+        """
+        טעינת ADRs - עצלה: הקובץ נקרא ומופעי ADR נבנים רק בגישה הראשונה
+        """
+        self._adrs: Optional[List[ADR]] = None
+        # הרשומות כפי שנקראו מהקובץ (מילונים) - עד שנבנים מופעי ADR
+        self._adrs_raw: Optional[List[Dict]] = None
+        self._adr_by_id: Dict[int, ADR] = {}
+        self._adr_tokens: List[frozenset] = []
+        self._forbidden_patterns = None
+        # מונה גרסה - עולה בכל שינוי ב-ADRs
+        self._adr_version = 0
+
+        # adrs.json - תמונת מצב; adrs.log.jsonl - שינויים שנוספו אחריה
+        self._adrs_snapshot_size = 0
+        self._adr_log = None
+        self._adr_log_size = 0
+
+    def _read_adrs_raw(self) -> List[Dict]:
+        """קריאת תמונת המצב והרצת יומן השינויים - רשימת מילונים (פעם אחת)"""
+        if self._adrs_raw is None:
+            adrs_file = self.adr_dir / "adrs.json"
+            if adrs_file.exists():
+                content = adrs_file.read_bytes()
+                self._adrs_snapshot_size = len(content)
+                records = json_loads(content)
+            else:
+                records = []
+
+            log_file = self.adr_dir / "adrs.log.jsonl"
+            if log_file.exists():
+                records = self._replay_adr_log(records, log_file.read_bytes())
+
+            self._adrs_raw = records
+        return self._adrs_raw
+
+    def _replay_adr_log(self, records: List[Dict], log: bytes) -> List[Dict]:
+        """
+        החלת יומן השינויים על רשומות תמונת המצב
+
+        ההחלה אידמפוטנטית (create מחליף רשומה קיימת עם אותו מזהה), כך
+        שיומן שלא נקטע אחרי דחיסה לא יוצר כפילויות.
+        """
+        by_id = {record["id"]: record for record in records}
+        for line in log.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json_loads(line)
+            except ValueError:
+                # שורה חלקית (קריסה באמצע כתיבה)
+                self.logger.warning("Skipping corrupt ADR log line")
+                continue
+
+            if entry["op"] == "create":
+                by_id[entry["adr"]["id"]] = entry["adr"]
+            elif entry["op"] == "update" and entry["id"] in by_id:
+                by_id[entry["id"]].update(entry["fields"])
+
+        return sorted(by_id.values(), key=lambda record: record["id"])
+
+    @property
+    def adrs(self) -> List[ADR]:
+        """רשימת ה-ADRs (נבנית בגישה הראשונה)"""
+        if self._adrs is None:
+            self._adrs = [ADR(**adr) for adr in self._read_adrs_raw()]
+            self._adrs_raw = None
+
+            # אינדקס לפי מזהה, ומילות החיפוש של כל ADR (מקבילה ל-self.adrs)
+            self._adr_by_id = {adr.id: adr for adr in self._adrs}
+            self._adr_tokens = [self._adr_text_tokens(adr) for adr in self._adrs]
+        return self._adrs
+
+    def _adr_summaries(self):
+        """
+        (id, title, status, created_at) לכל ADR - ללא בניית מופעי ADR
+        אם הם טרם נבנו
+        """
+        if self._adrs is not None:
+            return [(a.id, a.title, a.status, a.created_at) for a in self._adrs]
+        return [
+            (a["id"], a["title"], a["status"], a["created_at"])
+            for a in self._read_adrs_raw()
+        ]
+
+    @staticmethod
+    def _adr_text_tokens(adr: ADR) -> frozenset:
+        """מילות החיפוש של ADR"""
+        return _tokenize(f"{adr.title} {adr.context} {adr.decision}")
 
     def _save_adrs(self):
-        """שמירת ADRs"""
-        adrs_file = self.adr_dir / "adrs.json"
-        with open(adrs_file, 'w', encoding='utf-8') as f:
-            json.dump([asdict(adr) for adr in self.adrs], f, ensure_ascii=False, indent=2)
+        """
+        כתיבת תמונת מצב מלאה של ה-ADRs וריקון יומן השינויים
+        (מדלג על כתיבת התמונה אם התוכן לא השתנה)
+        """
+        content = json_dumps([_adr_to_json(adr) for adr in self.adrs], indent=True)
+
+        content_hash = hashlib.blake2b(content).digest()
+        if content_hash != self._last_adrs_hash:
+            _write_atomic(self.adr_dir / "adrs.json", content)
+            self._last_adrs_hash = content_hash
+            self._adrs_snapshot_size = len(content)
+
+        # רק אחרי שהתמונה הוחלפה בדיסק
+        if self._adr_log is not None:
+            self._adr_log.truncate(0)
+        elif (self.adr_dir / "adrs.log.jsonl").exists():
+            (self.adr_dir / "adrs.log.jsonl").write_bytes(b"")
+        self._adr_log_size = 0
+
+    def _append_adr_log(self, ops: List[bytes]):
+        """הוספת שינויים ליומן ה-ADRs (כתיבה אחת) ודחיסה אם הוא גדל מדי"""
+        if self._adr_log is None:
+            self._adr_log = open(self.adr_dir / "adrs.log.jsonl", "ab")
+            self._adr_log_size = self._adr_log.tell()
+
+        data = b"".join(ops)
+        self._adr_log.write(data)
+        self._adr_log.flush()
+        self._adr_log_size += len(data)
+
+        threshold = max(
+            _ADR_LOG_COMPACT_RATIO * self._adrs_snapshot_size, _ADR_LOG_COMPACT_MIN
+        )
+        if self._adr_log_size > threshold:
+            self._save_adrs()
+
+    def close(self):
+        """סגירת יומן ה-ADRs"""
+        if self._adr_log is not None:
+            self._adr_log.close()
+            self._adr_log = None
+        super().close()
 
     def _load_architecture_doc(self):
         """טעינת מסמך ארכיטקטורה"""
         arch_file = self.arch_dir / "architecture.json"
         if arch_file.exists():
-            with open(arch_file, 'r', encoding='utf-8') as f:
-                self.architecture = json.load(f)
+            self.architecture = json_loads(arch_file.read_bytes())
         else:
             self.architecture = {
                 "version": "1.0",
@@ -89,15 +268,24 @@ class ArchitectureAgent(BaseAgent):
                 "components": {},
                 "principles": [],
                 "dependencies": {},
-                "updated_at": datetime.now().isoformat()
+                "updated_at": self._now_iso()
             }
 
+        # מונה גרסה - עולה בכל שינוי במסמך הארכיטקטורה
+        self._arch_version = 0
+
+        # מילות החיפוש של כל רכיב
+        self._component_tokens = {
+            name: _tokenize(f"{name} {comp.get('purpose', '')}")
+            for name, comp in self.architecture.get("components", {}).items()
+        }
+
     def _save_architecture_doc(self):
         """שמירת מסמך ארכיטקטורה"""
-        self.architecture["updated_at"] = datetime.now().isoformat()
+        self._dirty_arch = False
+        self.architecture["updated_at"] = self._now_iso()
         arch_file = self.arch_dir / "architecture.json"
-        with open(arch_file, 'w', encoding='utf-8') as f:
-            json.dump(self.architecture, f, ensure_ascii=False, indent=2)
+        arch_file.write_bytes(json_dumps(self.architecture, indent=True))
 
     # ======== ניהול ADRs ========
 
@@ -108,7 +296,8 @@ class ArchitectureAgent(BaseAgent):
         decision: str,
         reasoning: str,
         alternatives: List[Dict[str, str]],
-        consequences: str
+        consequences: str,
+        defer: bool = False
     ) -> ADR:
         """
         יצירת ADR חדש
@@ -120,6 +309,7 @@ class ArchitectureAgent(BaseAgent):
             reasoning: למה זה נכון
             alternatives: אלטרנטיבות [{name, pros, cons}]
             consequences: השלכות
+            defer: דחיית הכתיבה לדיסק עד flush()
         """
         adr_id = len(self.adrs) + 1
 
@@ -132,24 +322,72 @@ class ArchitectureAgent(BaseAgent):
             reasoning=reasoning,
             alternatives=alternatives,
             consequences=consequences,
-            created_at=datetime.now().isoformat()
+            created_at=self._now_iso()
         )
 
         self.adrs.append(adr)
-        self._save_adrs()
+        self._adr_by_id[adr_id] = adr
+        self._adr_tokens.append(self._adr_text_tokens(adr))
+        self._forbidden_patterns = None
+        self._persist_adr(adr, {"op": "create", "adr": _adr_to_json(adr)}, defer)
+
+        self.log_action("create_adr", {"id": adr_id, "title": title})
+        return adr
+
+    def _persist_adr(self, adr: ADR, op: Dict[str, Any], defer: bool):
+        """
+        שמירת ADR שהשתנה - הוספת השינוי ליומן מיד, או השהייתו עד flush()
+
+        Args:
+            adr: ה-ADR שהשתנה
+            op: רשומת השינוי ליומן (create / update)
+            defer: דחיית הכתיבה לדיסק עד flush()
+        """
+        self._adr_version += 1
+
+        line = json_dumps(op) + b"\n"
+        if defer:
+            self._pending_adr_ops.append(line)
+            self._pending_adr_md.add(adr.id)
+            return
+
+        self._append_adr_log([line])
 
         # שמירה כקובץ markdown
+        self._pending_adr_md.discard(adr.id)
         self._save_adr_md(adr)
 
-        self.log_action("create_adr", {"id": adr_id, "title": title})
-        return adr
+    def flush(self) -> Dict[str, Any]:
+        """
+        כתיבת כל השינויים שנדחו (defer=True) - כל קובץ פעם אחת
+
+        Returns:
+            מה נכתב
+        """
+        result = {"adrs": bool(self._pending_adr_ops), "architecture": self._dirty_arch}
+
+        if self._pending_adr_ops:
+            pending_ops = self._pending_adr_ops
+            self._pending_adr_ops = []
+            self._append_adr_log(pending_ops)
+
+        pending_md = sorted(self._pending_adr_md)
+        self._pending_adr_md.clear()
+        for adr_id in pending_md:
+            self._save_adr_md(self._adr_by_id[adr_id])
+        result["adr_markdown"] = pending_md
+
+        if self._dirty_arch:
+            self._save_architecture_doc()
+
+        return result
 
     def _save_adr_md(self, adr: ADR):
         """שמירת ADR כ-markdown"""
         filename = f"ADR-{adr.id:03d}-{adr.title[:30].replace(' ', '-')}.md"
         filepath = self.adr_dir / filename
 
-        content = f"""# ADR-{adr.id:03d}: {adr.title}
+        parts = [f"""# ADR-{adr.id:03d}: {adr.title}
 
 ## סטטוס
 {adr.status.upper()}
@@ -164,29 +402,34 @@ class ArchitectureAgent(BaseAgent):
 {adr.reasoning}
 
 ## אלטרנטיבות שנשקלו
-"""
+"""]
         for i, alt in enumerate(adr.alternatives, 1):
-            content += f"""
+            parts.append(f"""
 ### {i}. {alt.get('name', 'אפשרות')}
 - **יתרונות:** {alt.get('pros', '-')}
 - **חסרונות:** {alt.get('cons', '-')}
-"""
+""")
 
-        content += f"""
+        parts.append(f"""
 ## השלכות
 {adr.consequences}
 
 ## תאריך
 {adr.created_at[:10]}
-"""
+""")
 
         if adr.superseded_by:
-            content += f"\n## הוחלף על ידי\nADR-{adr.superseded_by:03d}\n"
+            parts.append(f"\n## הוחלף על ידי\nADR-{adr.superseded_by:03d}\n")
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        filepath.write_text("".join(parts), encoding='utf-8')
 
-    def update_adr_status(self, adr_id: int, new_status: str, superseded_by: int = None) -> Dict:
+    def update_adr_status(
+        self,
+        adr_id: int,
+        new_status: str,
+        superseded_by: int = None,
+        defer: bool = False
+    ) -> Dict:
         """
         עדכון סטטוס ADR
 
@@ -194,36 +437,46 @@ class ArchitectureAgent(BaseAgent):
             adr_id: מזהה ה-ADR
             new_status: סטטוס חדש
             superseded_by: מזהה ADR שמחליף (אם רלוונטי)
+            defer: דחיית הכתיבה לדיסק עד flush()
         """
-        adr = next((a for a in self.adrs if a.id == adr_id), None)
+        self.adrs  # טעינת ה-ADRs והאינדקס לפי מזהה
+        adr = self._adr_by_id.get(adr_id)
         if not adr:
             return {"error": f"ADR not found: {adr_id}"}
 
         adr.status = new_status
-        adr.updated_at = datetime.now().isoformat()
+        adr.updated_at = self._now_iso()
         if superseded_by:
             adr.superseded_by = superseded_by
 
-        self._save_adrs()
-        self._save_adr_md(adr)
+        self._forbidden_patterns = None
+        self._persist_adr(adr, {
+            "op": "update",
+            "id": adr_id,
+            "fields": {
+                "status": adr.status,
+                "updated_at": adr.updated_at,
+                "superseded_by": adr.superseded_by
+            }
+        }, defer)
 
         self.log_action("update_adr_status", {"id": adr_id, "status": new_status})
         return {"success": True, "adr_id": adr_id, "new_status": new_status}
 
     def list_adrs(self, status: str = None) -> List[Dict]:
         """רשימת ADRs"""
-        adrs = self.adrs
+        adrs = self._adr_summaries()
         if status:
-            adrs = [a for a in adrs if a.status == status]
+            adrs = [a for a in adrs if a[2] == status]
 
         return [
             {
-                "id": a.id,
-                "title": a.title,
-                "status": a.status,
-                "created_at": a.created_at[:10]
+                "id": adr_id,
+                "title": title,
+                "status": adr_status,
+                "created_at": created_at[:10]
             }
-            for a in adrs
+            for adr_id, title, adr_status, created_at in adrs
         ]
 
     # ======== ניהול ארכיטקטורה ========
@@ -234,7 +487,8 @@ class ArchitectureAgent(BaseAgent):
         technology: str,
         purpose: str,
         communication: str,
-        dependencies: List[str] = None
+        dependencies: List[str] = None,
+        defer: bool = False
     ):
         """
         רישום רכיב במסמך הארכיטקטורה
@@ -245,31 +499,41 @@ class ArchitectureAgent(BaseAgent):
             purpose: תפקיד
             communication: צורת תקשורת
             dependencies: תלויות
+            defer: דחיית הכתיבה לדיסק עד flush()
         """
         self.architecture["components"][name] = {
             "technology": technology,
             "purpose": purpose,
             "communication": communication,
             "dependencies": dependencies or [],
-            "registered_at": datetime.now().isoformat()
+            "registered_at": self._now_iso()
         }
+        self._component_tokens[name] = _tokenize(f"{name} {purpose}")
 
-        self._save_architecture_doc()
+        self._persist_architecture(defer)
         self.log_action("register_component", {"name": name})
 
-    def add_principle(self, principle: str, description: str):
+    def add_principle(self, principle: str, description: str, defer: bool = False):
         """הוספת עיקרון מנחה"""
         self.architecture["principles"].append({
             "principle": principle,
             "description": description,
-            "added_at": datetime.now().isoformat()
+            "added_at": self._now_iso()
         })
-        self._save_architecture_doc()
+        self._persist_architecture(defer)
 
-    def update_dependencies(self, component: str, dependencies: List[str]):
+    def update_dependencies(self, component: str, dependencies: List[str], defer: bool = False):
         """עדכון תלויות של רכיב"""
         if component in self.architecture["components"]:
             self.architecture["components"][component]["dependencies"] = dependencies
+            self._persist_architecture(defer)
+
+    def _persist_architecture(self, defer: bool):
+        """שמירת מסמך הארכיטקטורה - מיד, או סימון לכתיבה ב-flush()"""
+        self._arch_version += 1
+        if defer:
+            self._dirty_arch = True
+        else:
             self._save_architecture_doc()
 
     # ======== בדיקות עקביות ========
@@ -279,85 +543,218 @@ class ArchitectureAgent(BaseAgent):
         issues = []
         warnings = []
 
+        # בדיקות הגרף מחושבות מחדש רק אחרי שינוי בארכיטקטורה
+        circular, orphans = self._memoized(
+            "graph_checks", (self._arch_version,), self._graph_checks
+        )
+
         # בדיקת תלויות מעגליות
-        circular = self._find_circular_dependencies()
         if circular:
             issues.append({
                 "type": "CIRCULAR_DEPENDENCY",
-                "components": circular
+                "components": [list(scc) for scc in circular]
             })
 
         # בדיקת רכיבים לא מחוברים
-        orphans = self._find_orphan_components()
         if orphans:
             warnings.append({
                 "type": "ORPHAN_COMPONENT",
-                "components": orphans
+                "components": list(orphans)
             })
 
         # בדיקת ADRs לא מעודכנים
-        old_adrs = [
-            a for a in self.adrs
+        stale_count = self._memoized("stale_adrs", (self._adr_version,), lambda: sum(
+            1 for a in self.adrs
             if a.status == "accepted" and not a.updated_at
-        ]
-        if old_adrs:
+        ))
+        if stale_count:
             warnings.append({
                 "type": "STALE_ADRS",
-                "count": len(old_adrs)
+                "count": stale_count
             })
 
         return {
             "consistent": len(issues) == 0,
             "issues": issues,
             "warnings": warnings,
-            "checked_at": datetime.now().isoformat()
+            "checked_at": self._now_iso()
         }
 
-    def _find_circular_dependencies(self) -> List[List[str]]:
-        """זיהוי תלויות מעגליות"""
-        components = self.architecture.get("components", {})
-        circular = []
+    def _memoized(self, name: str, versions: tuple, compute):
+        """
+        תוצאה שמורה של compute() - מחושבת מחדש רק כשמוני הגרסה משתנים
+
+        Args:
+            name: שם התוצאה
+            versions: מוני הגרסה שהתוצאה תלויה בהם
+            compute: פונקציה לחישוב התוצאה
+        """
+        cached = self._memo.get(name)
+        if cached is None or cached[0] != versions:
+            cached = (versions, compute())
+            self._memo[name] = cached
+        return cached[1]
+
+    def _graph_checks(self) -> Tuple[List[List[str]], List[str]]:
+        """תלויות מעגליות ורכיבים לא מחוברים - על גרף אחד"""
+        _, circular = self._dependency_order()
+        return circular, self._find_orphan_components(self._dependency_graph())
+
+    def _dependency_graph(self):
+        """גרף התלויות (_build_adj) - נבנה מחדש רק אחרי שינוי בארכיטקטורה"""
+        return self._memoized("dependency_graph", (self._arch_version,), self._build_adj)
+
+    def _dependency_order(self) -> Tuple[List[str], List[List[str]]]:
+        """_topo_sort על הגרף הנוכחי - מחושב מחדש רק אחרי שינוי בארכיטקטורה"""
+        return self._memoized(
+            "dependency_order",
+            (self._arch_version,),
+            lambda: self._topo_sort(self._dependency_graph())
+        )
+
+    def _build_adj(self) -> Tuple[Tuple[str, ...], Dict[str, Tuple[str, ...]], Set[str]]:
+        """
+        בניית גרף התלויות במעבר אחד על הרכיבים
+
+        Returns:
+            (שמות הרכיבים, תלויות לכל רכיב, רכיבים שמישהו תלוי בהם)
+        """
+        deps: Dict[str, Tuple[str, ...]] = {}
+        referenced: Set[str] = set()
+        for name, comp in self.architecture.get("components", {}).items():
+            node_deps = tuple(comp.get("dependencies") or ())
+            deps[name] = node_deps
+            referenced.update(node_deps)
+
+        return tuple(deps), deps, referenced
+
+    def _topo_sort(self, adj=None) -> Tuple[List[str], List[List[str]]]:
+        """
+        סדר טופולוגי של הרכיבים (תלויות לפני התלויים בהן) ותלויות מעגליות
+
+        Kahn עם ספירת דרגות כניסה - מעבר לינארי אחד. רכיבים שנשארים עם
+        דרגה חיובית נמצאים במעגל או תלויים ברכיב שבמעגל; Tarjan רץ רק
+        עליהם כדי לחלץ את המעגלים עצמם.
+
+        Args:
+            adj: גרף מ-_build_adj (נבנה אם לא הועבר)
+
+        Returns:
+            (רכיבים בסדר תלויות - ללא רכיבי המעגלים, רשימת מעגלים)
+        """
+        nodes, deps, _ = adj or self._build_adj()
+
+        # תלויות ברכיבים שלא נרשמו לא משפיעות על הסדר
+        indegree = dict.fromkeys(nodes, 0)
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for name in nodes:
+            for dep in deps[name]:
+                if dep in indegree:
+                    indegree[name] += 1
+                    dependents[dep].append(name)
+
+        ready = deque(name for name in nodes if indegree[name] == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents.get(name, ()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) == len(nodes):
+            return order, []
+
+        residue = [name for name in nodes if indegree[name] > 0]
+        residue_set = set(residue)
+        residue_deps = {
+            name: tuple(dep for dep in deps[name] if dep in residue_set)
+            for name in residue
+        }
+        return order, self._strongly_connected_cycles(residue, residue_deps)
 
-        def dfs(node, visited, path):
-            if node in path:
-                cycle_start = path.index(node)
-                circular.append(path[cycle_start:] + [node])
-                return
+    def _find_circular_dependencies(self, adj=None) -> List[List[str]]:
+        """
+        זיהוי תלויות מעגליות
+
+        Args:
+            adj: גרף מ-_build_adj (נבנה אם לא הועבר)
+        """
+        return self._topo_sort(adj)[1]
 
-            if node in visited:
-                return
+    @staticmethod
+    def _strongly_connected_cycles(
+        nodes: List[str],
+        adjacency: Dict[str, Tuple[str, ...]]
+    ) -> List[List[str]]:
+        """
+        רכיבים קשירים היטב שמהווים מעגל (או רכיב שתלוי בעצמו)
 
-            visited.add(node)
-            path.append(node)
+        Tarjan SCC איטרטיבי - מעבר אחד ב-O(V+E), כל מעגל מדווח פעם אחת
+        (כרכיב קשיר היטב), וללא סכנת חריגה ממגבלת הרקורסיה.
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        scc_stack: List[str] = []
+        circular = []
 
-            comp = components.get(node, {})
-            for dep in comp.get("dependencies", []):
-                dfs(dep, visited, path)
+        def visit(node):
+            index[node] = lowlink[node] = len(index)
+            scc_stack.append(node)
+            on_stack.add(node)
 
-            path.pop()
+        for root in nodes:
+            if root in index:
+                continue
 
-        for comp_name in components:
-            dfs(comp_name, set(), [])
+            visit(root)
+            work = [(root, iter(adjacency[root]))]
+
+            while work:
+                node, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        visit(dep)
+                        work.append((dep, iter(adjacency.get(dep, ()))))
+                        break
+                    if dep in on_stack:
+                        lowlink[node] = min(lowlink[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        scc = []
+                        while True:
+                            member = scc_stack.pop()
+                            on_stack.discard(member)
+                            scc.append(member)
+                            if member == node:
+                                break
+                        scc.reverse()
+
+                        if len(scc) > 1 or node in adjacency.get(node, ()):
+                            circular.append(scc)
 
         return circular
 
-    def _find_orphan_components(self) -> List[str]:
-        """זיהוי רכיבים לא מחוברים"""
-        components = self.architecture.get("components", {})
+    def _find_orphan_components(self, adj=None) -> List[str]:
+        """
+        זיהוי רכיבים לא מחוברים
 
-        # רכיבים שמישהו תלוי בהם
-        referenced = set()
-        for comp in components.values():
-            for dep in comp.get("dependencies", []):
-                referenced.add(dep)
+        Args:
+            adj: גרף מ-_build_adj (נבנה אם לא הועבר)
+        """
+        nodes, deps, referenced = adj or self._build_adj()
 
         # רכיבים שלא תלויים באף אחד ואף אחד לא תלוי בהם
-        orphans = []
-        for name, comp in components.items():
-            if not comp.get("dependencies") and name not in referenced:
-                orphans.append(name)
+        no_deps = {name for name in nodes if not deps[name]}
 
-        return orphans
+        return sorted(no_deps - referenced)
 
     def check_adr_compliance(self, file_path: str) -> Dict:
         """
@@ -372,8 +769,10 @@ class ArchitectureAgent(BaseAgent):
         if not path.exists():
             return {"error": f"File not found: {file_path}"}
 
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            code = f.read()
+        code = path.read_text(encoding='utf-8', errors='ignore')
+
+        # סריקה אחת של הקוד לכל ה-ADRs הפעילים
+        forbidden_hits = self._scan_forbidden(code)
 
         # בדיקות לפי ADRs פעילים
         for adr in self.adrs:
@@ -381,7 +780,7 @@ class ArchitectureAgent(BaseAgent):
                 continue
 
             # חיפוש הפרות אפשריות
-            violation = self._check_code_against_adr(code, adr)
+            violation = self._check_code_against_adr(code, adr, forbidden_hits.get(adr.id))
             if violation:
                 violations.append({
                     "adr_id": adr.id,
@@ -393,12 +792,68 @@ class ArchitectureAgent(BaseAgent):
             "file": file_path,
             "violations_count": len(violations),
             "violations": violations,
-            "checked_at": datetime.now().isoformat()
+            "checked_at": self._now_iso()
         }
 
-    def _check_code_against_adr(self, code: str, adr: ADR) -> Optional[str]:
+    def _build_forbidden_scanner(self):
+        """בניית סורק יחיד לכל המחרוזות האסורות (FORBID:) ב-ADRs פעילים"""
+        patterns = {}
+        for adr in self.adrs:
+            if adr.status != "accepted":
+                continue
+            for pattern in _FORBID_RE.findall(adr.decision):
+                patterns.setdefault(pattern, []).append(adr.id)
+
+        self._forbidden_patterns = patterns
+        self._forbidden_scanner = None
+        if not patterns:
+            return
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for pattern in patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._forbidden_scanner = automaton
+        else:
+            # ביטוי רגולרי אחד עם חלופות; lookahead מאפשר התאמות חופפות
+            alternation = "|".join(
+                re.escape(p) for p in sorted(patterns, key=len, reverse=True)
+            )
+            self._forbidden_scanner = re.compile(f"(?=({alternation}))")
+
+    def _scan_forbidden(self, code: str) -> Dict[int, List[str]]:
+        """
+        סריקת הקוד למחרוזות אסורות
+
+        Returns:
+            מיפוי מזהה ADR -> המחרוזות האסורות שנמצאו
+        """
+        if self._forbidden_patterns is None:
+            self._build_forbidden_scanner()
+        if self._forbidden_scanner is None:
+            return {}
+
+        if ahocorasick is not None:
+            found = {pattern for _, pattern in self._forbidden_scanner.iter(code)}
+        else:
+            found = set(self._forbidden_scanner.findall(code))
+
+        hits = {}
+        for pattern in sorted(found):
+            for adr_id in self._forbidden_patterns[pattern]:
+                hits.setdefault(adr_id, []).append(pattern)
+        return hits
+
+    def _check_code_against_adr(
+        self,
+        code: str,
+        adr: ADR,
+        forbidden_hits: Optional[List[str]] = None
+    ) -> Optional[str]:
         """בדיקת קוד מול ADR ספציפי"""
-        # זו דוגמה פשוטה - ניתן להרחיב לפי הצורך
+        if forbidden_hits:
+            return f"Forbidden by ADR: {', '.join(forbidden_hits)}"
         return None
 
     # ======== ייעוץ ========
@@ -410,28 +865,21 @@ class ArchitectureAgent(BaseAgent):
         Args:
             question: השאלה
         """
-        # חיפוש ADRs רלוונטיים
-        relevant_adrs = []
-        question_lower = question.lower()
-
-        for adr in self.adrs:
-            if adr.status != "accepted":
-                continue
-
-            # חיפוש במילות מפתח
-            adr_text = f"{adr.title} {adr.context} {adr.decision}".lower()
-            if any(word in adr_text for word in question_lower.split()):
-                relevant_adrs.append({
-                    "id": adr.id,
-                    "title": adr.title,
-                    "decision": adr.decision[:200]
-                })
+        question_tokens = _tokenize(question)
+
+        # חיפוש ADRs רלוונטיים (במילות מפתח)
+        relevant_adrs = [
+            dict(summary)
+            for adr_tokens, summary in self._memoized(
+                "accepted_adrs", (self._adr_version,), self._accepted_adr_index
+            )
+            if adr_tokens & question_tokens
+        ]
 
         # חיפוש ברכיבים
         relevant_components = []
         for name, comp in self.architecture.get("components", {}).items():
-            comp_text = f"{name} {comp.get('purpose', '')}".lower()
-            if any(word in comp_text for word in question_lower.split()):
+            if self._component_tokens.get(name, frozenset()) & question_tokens:
                 relevant_components.append({
                     "name": name,
                     "technology": comp.get("technology"),
@@ -445,39 +893,66 @@ class ArchitectureAgent(BaseAgent):
             "note": "This is automated analysis. Review with team for final decision."
         }
 
+    def _accepted_adr_index(self) -> List[Tuple[frozenset, Dict[str, Any]]]:
+        """מילות החיפוש ותקציר של כל ADR פעיל"""
+        return [
+            (adr_tokens, {
+                "id": adr.id,
+                "title": adr.title,
+                "decision": adr.decision[:200]
+            })
+            for adr, adr_tokens in zip(self.adrs, self._adr_tokens)
+            if adr.status == "accepted"
+        ]
+
     # ======== דוחות ========
 
     def generate_architecture_doc(self) -> str:
-        """יצירת מסמך ארכיטקטורה"""
-        doc = """# ארכיטקטורת המערכת
+        """יצירת מסמך ארכיטקטורה (מדלג על יצירה וכתיבה אם דבר לא השתנה)"""
+        return self._memoized(
+            "architecture_doc",
+            (self._arch_version, self._adr_version),
+            self._render_architecture_doc
+        )
+
+    def _render_architecture_doc(self) -> str:
+        """בניית מסמך הארכיטקטורה ושמירתו ל-ARCHITECTURE.md"""
+        parts = ["""# ארכיטקטורת המערכת
 
 ## סקירה כללית
-"""
-        doc += self.architecture.get("overview", "טרם הוגדר.") + "\n\n"
+""", self.architecture.get("overview", "טרם הוגדר."), "\n\n"]
 
-        doc += "## רכיבים\n\n"
-        for name, comp in self.architecture.get("components", {}).items():
-            doc += f"""### {name}
+        # רכיבים בסדר תלויות; רכיבי מעגלים (ללא סדר אפשרי) בסוף
+        components = self.architecture.get("components", {})
+        order, _ = self._dependency_order()
+        placed = set(order)
+        ordered_names = order + [name for name in components if name not in placed]
+
+        parts.append("## רכיבים\n\n")
+        for name in ordered_names:
+            comp = components[name]
+            parts.append(f"""### {name}
 - **טכנולוגיה:** {comp.get('technology', '-')}
 - **תפקיד:** {comp.get('purpose', '-')}
 - **תקשורת:** {comp.get('communication', '-')}
 - **תלויות:** {', '.join(comp.get('dependencies', [])) or '-'}
 
-"""
+""")
 
-        doc += "## עקרונות מנחים\n\n"
+        parts.append("## עקרונות מנחים\n\n")
         for p in self.architecture.get("principles", []):
-            doc += f"1. **{p.get('principle')}** - {p.get('description')}\n"
+            parts.append(f"1. **{p.get('principle')}** - {p.get('description')}\n")
 
-        doc += "\n## החלטות ארכיטקטוניות (ADRs)\n\n"
+        parts.append("\n## החלטות ארכיטקטוניות (ADRs)\n\n")
         for adr in self.adrs:
             if adr.status == "accepted":
-                doc += f"- [ADR-{adr.id:03d}] {adr.title}\n"
+                parts.append(f"- [ADR-{adr.id:03d}] {adr.title}\n")
+
+        doc = "".join(parts)
 
         # שמירה
         doc_file = self.arch_dir / "ARCHITECTURE.md"
-        with open(doc_file, 'w', encoding='utf-8') as f:
-            f.write(doc)
+        doc_file.write_text(doc, encoding='utf-8')
 
         return doc
 
@@ -485,33 +960,23 @@ class ArchitectureAgent(BaseAgent):
 
     def run(self, command: str, **kwargs) -> Dict[str, Any]:
         """הפעלת פקודה"""
-        commands = {
-            "create_adr": self.create_adr,
-            "update_adr_status": self.update_adr_status,
-            "list_adrs": self.list_adrs,
-            "register_component": self.register_component,
-            "add_principle": self.add_principle,
-            "check_consistency": self.check_consistency,
-            "check_compliance": self.check_adr_compliance,
-            "ask": self.ask,
-            "generate_doc": self.generate_architecture_doc,
-        }
-
-        if command not in commands:
+        handler = self._commands.get(command)
+        if handler is None:
             return {"error": f"Unknown command: {command}"}
 
         try:
-            result = commands[command](**kwargs)
+            result = handler(**kwargs)
             return {"success": True, "result": result}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     def get_status(self) -> Dict[str, Any]:
         """קבלת סטטוס הסוכן"""
+        adrs = self._adr_summaries()
         return {
             "name": self.name,
-            "total_adrs": len(self.adrs),
-            "active_adrs": sum(1 for a in self.adrs if a.status == "accepted"),
+            "total_adrs": len(adrs),
+            "active_adrs": sum(1 for a in adrs if a[2] == "accepted"),
             "components_count": len(self.architecture.get("components", {})),
             "principles_count": len(self.architecture.get("principles", []))
         }
@@ -4,23 +4,262 @@ Base Agent - מחלקת בסיס לכל הסוכנים
 מספקת ממשק אחיד וכלים משותפים לכל הסוכנים במערכת.
 """
 
+import atexit
+import itertools
 import json
 import os
 import logging
+import logging.handlers
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Any, Union
 from pathlib import Path
 
+# orjson אופציונלי - קידוד JSON מהיר (C) ישירות ל-UTF-8 bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # הגדרת תיקיית הפרויקט
 PROJECT_ROOT = Path(__file__).parent.parent
 DOCS_DIR = PROJECT_ROOT / "docs"
 LOGS_DIR = PROJECT_ROOT / "logs"
 REPORTS_DIR = PROJECT_ROOT / "reports"
 
+# __slots__ ל-dataclass נתמך מ-Python 3.10 (README מצהיר על 3.9+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# תיקיות שכבר נוצרו בתהליך הנוכחי - נמנע מ-mkdir חוזר בכל יצירת סוכן
+_CREATED_DIRS = set()
+
+
+def _ensure_dir(path: Path):
+    """יצירת תיקייה (פעם אחת לכל תהליך)"""
+    if path not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+
+def _write_atomic(path: Path, data: bytes):
+    """
+    כתיבה אטומית של קובץ - קובץ זמני, fsync ואז החלפה
+
+    קריסה באמצע הכתיבה משאירה את הקובץ הקודם שלם.
+
+    Args:
+        path: נתיב הקובץ
+        data: התוכן המלא
+    """
+    tmp_file = path.with_name(path.name + ".tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def _process_pool_context():
+    """
+    הקשר multiprocessing למאגרי תהליכים - בלי fork
+
+    תהליך הסוכנים מריץ threads ברקע (יומן אירועים, לוגים, כתיבת מצב), ו-fork
+    שלו יכול להשאיר בתהליך הבן נעילה תפוסה. forkserver היכן שקיים, אחרת spawn
+    (Windows). פונקציות העבודה חייבות להיות ברמת המודול (pickle).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
 # יצירת תיקיות אם לא קיימות
 for directory in [DOCS_DIR, LOGS_DIR, REPORTS_DIR]:
-    directory.mkdir(exist_ok=True)
+    _ensure_dir(directory)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    קידוד JSON ל-UTF-8 bytes - orjson אם מותקן, אחרת json
+
+    Args:
+        obj: האובייקט לקידוד
+        indent: הזחה של 2 רווחים (לקבצים שנקראים ע"י אדם)
+
+    Returns:
+        JSON מקודד (ערכים לא נתמכים מומרים ל-str)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+
+    return json.dumps(
+        obj, ensure_ascii=False, indent=2 if indent else None, default=str
+    ).encode('utf-8')
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    פענוח JSON - orjson אם מותקן, אחרת json
+
+    Raises:
+        ValueError: JSON לא תקין (גם JSONDecodeError של orjson יורש ממנו)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _AgentLogRouter(logging.Handler):
+    """
+    מפנה כל רשומת לוג לקובץ של הסוכן שלה, לפי record.name
+
+    רץ ב-thread של ה-QueueListener - עיצוב הרשומה והכתיבה לקובץ לא
+    מתבצעים ב-thread של הסוכן.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._file_handlers: Dict[str, logging.FileHandler] = {}
+        self._formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+    def register(self, logger_name: str, log_file: Path):
+        """הגדרת קובץ הלוג של logger (פעם אחת לכל שם וקובץ)"""
+        current = self._file_handlers.get(logger_name)
+        if current is not None:
+            if current.baseFilename == os.path.abspath(log_file):
+                return
+            current.close()
+
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(self._formatter)
+        self._file_handlers[logger_name] = file_handler
+
+    def emit(self, record: logging.LogRecord):
+        file_handler = self._file_handlers.get(record.name)
+        if file_handler is not None:
+            file_handler.handle(record)
+
+
+# כל הסוכנים כותבים לתור אחד; listener יחיד מעצב וכותב לקבצים ברקע
+_LOG_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_LOG_QUEUE_HANDLER = logging.handlers.QueueHandler(_LOG_QUEUE)
+_LOG_ROUTER = _AgentLogRouter()
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+_LOG_LOCK = threading.Lock()
+
+
+def _register_agent_log(logger: logging.Logger, log_file: Path):
+    """חיבור logger של סוכן לתור הלוגים המשותף (והפעלת ה-listener)"""
+    global _LOG_LISTENER
+    with _LOG_LOCK:
+        _LOG_ROUTER.register(logger.name, log_file)
+        if _LOG_QUEUE_HANDLER not in logger.handlers:
+            logger.addHandler(_LOG_QUEUE_HANDLER)
+        if _LOG_LISTENER is None:
+            _LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _LOG_ROUTER)
+            _LOG_LISTENER.start()
+
+
+# נרשם לפני _flush_agents_at_exit ולכן רץ אחריו - גם לוגי השמירה נכתבים
+@atexit.register
+def _stop_log_listener():
+    if _LOG_LISTENER is not None:
+        _LOG_LISTENER.stop()
+
+
+class _StateWriter:
+    """
+    כותב רקע לקבצי המצב של הסוכנים
+
+    thread יחיד לכל התהליך (ולא thread לכל סוכן) - סוכנים קצרי חיים לא
+    משאירים threads אחריהם. בקשות שמגיעות יחד מאוחדות: כל סוכן נשמר
+    פעם אחת לכל אצווה.
+    """
+
+    def __init__(self, batch_window: float = 0.1):
+        """
+        Args:
+            batch_window: זמן מקסימלי (שניות) לאיסוף בקשות לאצווה אחת
+        """
+        self.batch_window = batch_window
+        self._queue: "queue.SimpleQueue[Optional[BaseAgent]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, agent: "BaseAgent"):
+        """בקשת שמירה של מצב הסוכן ברקע"""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="agent-state-writer", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(agent)
+
+    def _run(self):
+        """לולאת הכתיבה - אוספת בקשות עד שהתור ריק או שעבר batch_window"""
+        while True:
+            agent = self._queue.get()
+            if agent is None:
+                return
+
+            pending = {agent}
+            stop = False
+            deadline = time.monotonic() + self.batch_window
+            while time.monotonic() < deadline:
+                try:
+                    agent = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if agent is None:
+                    stop = True
+                    break
+                pending.add(agent)
+
+            for agent in pending:
+                try:
+                    agent.save_state()
+                except Exception as e:
+                    agent.logger.error(f"Background state save failed: {e}")
+
+            if stop:
+                return
+
+    def close(self, timeout: float = 2.0):
+        """סיום ה-thread לאחר כתיבת כל הבקשות שבתור"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+_STATE_WRITER = _StateWriter()
+
+# סוכנים עם פעולות שטרם נכתבו לדיסק - נשמרים ביציאה מהתהליך
+_UNFLUSHED_AGENTS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_agents_at_exit():
+    _STATE_WRITER.close()
+    for agent in list(_UNFLUSHED_AGENTS):
+        try:
+            agent.save_state()
+        except Exception:
+            pass
 
 
 class BaseAgent(ABC):
@@ -37,77 +276,134 @@ class BaseAgent(ABC):
         self.name = name
         self.config = config or {}
         self.created_at = datetime.now()
+        # בסיס לחותמות זמן זולות: שעון הקיר פעם אחת + הפרש monotonic
+        self._t0_mono = time.monotonic()
         self.logger = self._setup_logger()
         self.state: Dict[str, Any] = {}
+        # מגן על state ועל יומן הפעולות מול ה-thread שכותב ברקע
+        self._state_lock = threading.RLock()
+        self._state_file = self._get_state_file()
         self._load_state()
 
+        # יומן פעולות חסום בזיכרון - נכתב לדיסק ברקע כל flush_interval פעולות
+        self._action_log = deque(
+            self.state.get("action_log", []),
+            maxlen=self.config.get("action_log_max", 5000)
+        )
+        self._actions_since_flush = 0
+
     def _setup_logger(self) -> logging.Logger:
         """הגדרת מערכת לוגים"""
         logger = logging.getLogger(f"agent.{self.name}")
         logger.setLevel(logging.DEBUG)
 
-        # יצירת handler לקובץ
-        log_file = LOGS_DIR / f"{self.name}.log"
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-
-        # פורמט הלוג
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        # כתיבה לקובץ הסוכן דרך התור המשותף
+        _register_agent_log(logger, LOGS_DIR / f"{self.name}.log")
 
         return logger
 
+    def _format_monotonic(self, mono: float) -> str:
+        """המרת ערך time.monotonic() לזמן ISO לפי בסיס הסוכן"""
+        return (self.created_at + timedelta(seconds=mono - self._t0_mono)).isoformat()
+
+    def _now_iso(self) -> str:
+        """הזמן הנוכחי כ-ISO (ללא קריאה לשעון הקיר)"""
+        return self._format_monotonic(time.monotonic())
+
+    def _format_pending_actions(self):
+        """המרת זמני הפעולות שטרם פורמטו ל-ISO - פעם אחת לכל רשומה"""
+        for entry in reversed(self._action_log):
+            timestamp = entry["timestamp"]
+            if isinstance(timestamp, str):
+                break
+            entry["timestamp"] = self._format_monotonic(timestamp)
+
     def _get_state_file(self) -> Path:
         """נתיב קובץ מצב הסוכן"""
         return DOCS_DIR / f"{self.name}_state.json"
 
     def _load_state(self):
         """טעינת מצב הסוכן"""
-        state_file = self._get_state_file()
+        state_file = self._state_file
         if state_file.exists():
             try:
-                with open(state_file, 'r', encoding='utf-8') as f:
-                    self.state = json.load(f)
+                self.state = json_loads(state_file.read_bytes())
                 self.logger.info(f"State loaded from {state_file}")
-            except json.JSONDecodeError:
+            except ValueError:
                 self.logger.warning(f"Could not parse state file: {state_file}")
                 self.state = {}
 
     def save_state(self):
         """שמירת מצב הסוכן"""
-        state_file = self._get_state_file()
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(self.state, f, ensure_ascii=False, indent=2, default=str)
+        with self._state_lock:
+            if self._action_log or "action_log" in self.state:
+                self._format_pending_actions()
+                self.state["action_log"] = list(self._action_log)
+            self._actions_since_flush = 0
+            _UNFLUSHED_AGENTS.discard(self)
+
+            # כתיבה אטומית - שמירה ברקע / ביציאה שנקטעה לא משאירה קובץ קטוע
+            state_file = self._state_file
+            _write_atomic(state_file, json_dumps(self.state, indent=True))
         self.logger.debug(f"State saved to {state_file}")
 
+    @contextmanager
+    def mutate_state(self) -> Iterator[Dict[str, Any]]:
+        """
+        שינוי self.state מול ה-thread שכותב ברקע
+
+        save_state רץ ברקע (log_action) ומקודד את self.state תחת _state_lock.
+        שינוי של state - או של רשימה/מילון שנשמרים בו - צריך להיעשות בתוך
+        הבלוק, כדי שהקידוד לא יראה מבנה באמצע שינוי.
+
+        Yields:
+            self.state
+        """
+        with self._state_lock:
+            yield self.state
+
     def log(self, message: str, level: str = "info"):
         """כתיבה ללוג"""
         log_func = getattr(self.logger, level, self.logger.info)
         log_func(message)
 
-    def log_action(self, action: str, details: Optional[Dict] = None):
-        """תיעוד פעולה"""
+    def log_action(self, action: str, details: Optional[Dict] = None, force: bool = False):
+        """
+        תיעוד פעולה
+
+        Args:
+            action: שם הפעולה
+            details: פרטים נוספים
+            force: שמירת המצב לדיסק מיד (אחרת - ברקע, כל flush_interval פעולות)
+        """
+        # זמן גולמי (monotonic) - מפורמט ל-ISO רק בשמירה / בקריאה
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.monotonic(),
             "action": action,
             "details": details or {}
         }
 
-        if "action_log" not in self.state:
-            self.state["action_log"] = []
+        with self._state_lock:
+            self._action_log.append(log_entry)
+            self._actions_since_flush += 1
+            flush_due = self._actions_since_flush >= self.config.get("flush_interval", 50)
+            if flush_due:
+                self._actions_since_flush = 0
+            _UNFLUSHED_AGENTS.add(self)
 
-        self.state["action_log"].append(log_entry)
         self.logger.info(f"Action: {action} - {details}")
-        self.save_state()
+
+        if force:
+            self.save_state()
+        elif flush_due:
+            _STATE_WRITER.submit(self)
 
     def get_action_history(self, limit: int = 50) -> List[Dict]:
         """קבלת היסטוריית פעולות"""
-        history = self.state.get("action_log", [])
-        return history[-limit:]
+        with self._state_lock:
+            self._format_pending_actions()
+            start = max(len(self._action_log) - limit, 0)
+            return list(itertools.islice(self._action_log, start, None))
 
     @abstractmethod
     def run(self, *args, **kwargs) -> Dict[str, Any]:
@@ -141,17 +437,38 @@ class BaseAgent(ABC):
 
     def reset(self):
         """איפוס מצב הסוכן"""
-        self.state = {}
-        self.save_state()
+        with self._state_lock:
+            self.state = {}
+            self._action_log.clear()
+            self.save_state()
         self.logger.info("Agent state reset")
 
+    def close(self):
+        """
+        שחרור משאבים שהסוכן מחזיק (threads, קבצים פתוחים)
+
+        ברירת המחדל לא עושה דבר; סוכנים שמחזיקים משאבים דורסים אותה.
+        קריאה נוספת אינה עושה דבר.
+        """
+
     def __repr__(self):
         return f"<{self.__class__.__name__}(name='{self.name}')>"
 
 
+def _datetime_from_ns(timestamp_ns: int) -> datetime:
+    """המרת time.time_ns() ל-datetime מקומי (מדויק עד מיקרו-שנייה)"""
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000)
+
+
 class AgentMessage:
     """הודעה בין סוכנים"""
 
+    __slots__ = (
+        "sender", "receiver", "message_type", "content",
+        "priority", "timestamp_ns", "read"
+    )
+
     def __init__(
         self,
         sender: str,
@@ -160,24 +477,33 @@ class AgentMessage:
         content: Any,
         priority: int = 0
     ):
-        self.id = datetime.now().strftime("%Y%m%d%H%M%S%f")
         self.sender = sender
         self.receiver = receiver
         self.message_type = message_type
         self.content = content
         self.priority = priority
-        self.timestamp = datetime.now()
+        # זמן גולמי - הפורמט מחושב רק כשצריך (id / to_dict)
+        self.timestamp_ns = time.time_ns()
         self.read = False
 
+    @property
+    def timestamp(self) -> datetime:
+        return _datetime_from_ns(self.timestamp_ns)
+
+    @property
+    def id(self) -> str:
+        return self.timestamp.strftime("%Y%m%d%H%M%S%f")
+
     def to_dict(self) -> Dict:
+        timestamp = self.timestamp
         return {
-            "id": self.id,
+            "id": timestamp.strftime("%Y%m%d%H%M%S%f"),
             "sender": self.sender,
             "receiver": self.receiver,
             "type": self.message_type,
             "content": self.content,
             "priority": self.priority,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": timestamp.isoformat(),
             "read": self.read
         }
 
@@ -185,23 +511,36 @@ class AgentMessage:
 class AgentEvent:
     """אירוע במערכת הסוכנים"""
 
+    __slots__ = ("event_type", "source", "data", "timestamp_ns", "_cached_dict")
+
     def __init__(
         self,
         event_type: str,
         source: str,
         data: Dict[str, Any]
     ):
-        self.id = datetime.now().strftime("%Y%m%d%H%M%S%f")
         self.event_type = event_type
         self.source = source
         self.data = data
-        self.timestamp = datetime.now()
+        # זמן גולמי - הפורמט מחושב רק כשצריך (id / to_dict)
+        self.timestamp_ns = time.time_ns()
+        # to_dict() שמור - ממולא ע"י AgentManager בעת תיעוד האירוע
+        self._cached_dict: Optional[Dict] = None
+
+    @property
+    def timestamp(self) -> datetime:
+        return _datetime_from_ns(self.timestamp_ns)
+
+    @property
+    def id(self) -> str:
+        return self.timestamp.strftime("%Y%m%d%H%M%S%f")
 
     def to_dict(self) -> Dict:
+        timestamp = self.timestamp
         return {
-            "id": self.id,
+            "id": timestamp.strftime("%Y%m%d%H%M%S%f"),
             "type": self.event_type,
             "source": self.source,
             "data": self.data,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": timestamp.isoformat()
         }
@@ -9,14 +9,83 @@ Experiment Tracker Agent - סוכן מעקב ניסויים
 """
 
 import json
+import os
 import shutil
+import struct
+import threading
+from collections import Counter, defaultdict
+from collections.abc import MutableMapping
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields
 from enum import Enum
 
-from .base_agent import BaseAgent, DOCS_DIR
+from .base_agent import (
+    BaseAgent, DOCS_DIR, _DATACLASS_SLOTS, _ensure_dir, _write_atomic, json_dumps, json_loads
+)
+
+# fcntl קיים רק ב-POSIX - נדרש לשכפול reflink
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# numpy אופציונלי - בחירת הערך הטוב ביותר בהשוואת ניסויים גדולה
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# תתי-התיקיות של כל ניסוי
+_EXPERIMENT_SUBDIRS = ("code", "data", "results")
+
+# סימון לכל סטטוס בסיכום הניסויים
+_STATUS_EMOJI = {
+    "completed": "",
+    "failed": "",
+    "running": "",
+    "draft": "",
+    "abandoned": ""
+}
+
+# מתחת לגודל הזה (ניסויים x מדדים) השוואה ב-Python מהירה יותר מ-numpy -
+# מילוי המטריצה מתוך מילוני התוצאות הוא החלק היקר, לא ה-argmax
+_NUMPY_MIN_CELLS = 100_000
+
+# מסקנה שמכילה את המילה הזו מאשרת את ההיפותזה
+_CONFIRMED_MARKER = "אושרה"
+
+# דחיסת יומן הניסויים לתמונת מצב כשהוא עובר 1MB
+_JOURNAL_COMPACT_SIZE = 1024 * 1024
+
+
+# counter.bin - מזהה הניסוי האחרון שהוקצה (4 בתים, little-endian)
+_COUNTER = struct.Struct("<I")
+
+
+# ioctl לשכפול קובץ copy-on-write ב-Linux (Btrfs, XFS וכו')
+_FICLONE = 0x40049409
+
+
+def _reflink_copy(src: str, dst: str) -> str:
+    """
+    העתקת קובץ כשכפול reflink (שיתוף בלוקים, ללא העתקת נתונים) כשמערכת
+    הקבצים תומכת, אחרת העתקה רגילה
+
+    תואם ל-copy_function של shutil.copytree (כולל שמירת metadata כמו copy2).
+    """
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            # אין תמיכה (EOPNOTSUPP / EXDEV / EINVAL...) - העתקה רגילה
+            pass
+    return shutil.copy2(src, dst)
 
 
 class ExperimentStatus(Enum):
@@ -36,7 +105,7 @@ class ExperimentType(Enum):
     FEATURE_EXPERIMENT = "feature_experiment"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Metric:
     """מדד ניסוי"""
     name: str
@@ -44,7 +113,7 @@ class Metric:
     higher_is_better: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Experiment:
     """ניסוי"""
     id: str
@@ -60,6 +129,96 @@ class Experiment:
     created_at: str
     completed_at: Optional[str] = None
     artifacts: List[str] = field(default_factory=list)
+    # המסקנה מאשרת את ההיפותזה - נקבע ב-record_results
+    hypothesis_confirmed: bool = False
+
+    @classmethod
+    def from_dict_fast(cls, data: Dict) -> "Experiment":
+        """
+        בניית ניסוי מרשומה שנטענה מהדיסק
+
+        בלי slots (Python < 3.10) - עדכון __dict__ ישירות, בלי __init__ שנוצר
+        ובלי פירוק kwargs. עם slots ה-__init__ הרגיל הוא המסלול המהיר.
+        רשומה עם שדות חסרים/עודפים עוברת תמיד דרך הבנאי הרגיל.
+
+        Args:
+            data: מילון עם כל שדות הניסוי
+        """
+        if _EXPERIMENT_SLOTS or data.keys() != _EXPERIMENT_FIELDS:
+            return cls(**data)
+        experiment = object.__new__(cls)
+        experiment.__dict__.update(data)
+        return experiment
+
+
+def _experiment_to_json(experiment: Experiment) -> Dict[str, Any]:
+    """המרת ניסוי למילון לשמירה - העתקה רדודה (asdict מעתיק לעומק)"""
+    return {
+        "id": experiment.id,
+        "name": experiment.name,
+        "hypothesis": experiment.hypothesis,
+        "experiment_type": experiment.experiment_type,
+        "status": experiment.status,
+        "baseline_id": experiment.baseline_id,
+        "configuration": experiment.configuration,
+        "metrics": experiment.metrics,
+        "results": experiment.results,
+        "conclusion": experiment.conclusion,
+        "created_at": experiment.created_at,
+        "completed_at": experiment.completed_at,
+        "artifacts": experiment.artifacts,
+        "hypothesis_confirmed": experiment.hypothesis_confirmed,
+    }
+
+
+# שמות השדות של Experiment - לבדיקת רשומה לפני from_dict_fast
+_EXPERIMENT_FIELDS = frozenset(f.name for f in fields(Experiment))
+_EXPERIMENT_SLOTS = hasattr(Experiment, "__slots__")
+
+
+class _LazyExperimentMap(MutableMapping):
+    """
+    מיפוי מזהה -> Experiment שבונה כל ניסוי רק בגישה הראשונה אליו
+
+    הרשומות הגולמיות (מילונים מה-JSON) מוחלפות במקומן במופע Experiment,
+    כך שסדר ההכנסה נשמר וכל ניסוי נבנה פעם אחת בלבד.
+    """
+
+    def __init__(self, records: Dict[str, Dict]):
+        self._items: Dict[str, Any] = dict(records)
+
+    def __getitem__(self, exp_id: str) -> Experiment:
+        item = self._items[exp_id]
+        if isinstance(item, dict):
+            item = self._items[exp_id] = Experiment.from_dict_fast(item)
+        return item
+
+    def __setitem__(self, exp_id: str, experiment: Experiment):
+        self._items[exp_id] = experiment
+
+    def __delitem__(self, exp_id: str):
+        del self._items[exp_id]
+
+    def __contains__(self, exp_id: object) -> bool:
+        return exp_id in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def records(self, to_dict=_experiment_to_json) -> List[Dict]:
+        """
+        כל הניסויים כמילונים - רשומות שטרם נבנו מוחזרות כפי שנטענו
+
+        Args:
+            to_dict: המרת Experiment שכבר נבנה למילון
+        """
+        return [
+            item if isinstance(item, dict) else to_dict(item)
+            for item in self._items.values()
+        ]
 
 
 class ExperimentTrackerAgent(BaseAgent):
@@ -67,9 +226,34 @@ class ExperimentTrackerAgent(BaseAgent):
 
     def __init__(self, config: Optional[Dict] = None):
         super().__init__("experiment_tracker", config)
+        # מילון השמירה של כל ניסוי - מתחדש בכל שינוי (שעובר דרך _journal_experiment)
+        self._snapshot_cache: Dict[str, Dict] = {}
+        # experiments.json - תמונת מצב; experiments.log.jsonl - שינויים שנוספו אחריה
+        self._journal = None
+        self._journal_size = 0
+        # מונה מזהים עמיד - לא תלוי במספר הניסויים הטעונים
+        self._id_lock = threading.Lock()
+        self._next_id = 0
+        self._counter_fd = None
         self._init_directories()
         self._load_experiments()
 
+        # פקודות run() - נבנות פעם אחת ולא בכל קריאה
+        self._commands = {
+            "create": self.create_experiment,
+            "start": self.start_experiment,
+            "record_results": self.record_results,
+            "fail": self.fail_experiment,
+            "abandon": self.abandon_experiment,
+            "compare": self.compare_experiments,
+            "restore": self.restore_experiment,
+            "rerun": self.rerun_experiment,
+            "clone": self.clone_experiment,
+            "list": self.list_experiments,
+            "details": self.get_experiment_details,
+            "summary": self.generate_summary,
+        }
+
     def _init_directories(self):
         """יצירת מבנה תיקיות"""
         self.experiments_dir = DOCS_DIR / "experiments"
@@ -80,23 +264,155 @@ class ExperimentTrackerAgent(BaseAgent):
 
         for directory in [self.experiments_dir, self.active_dir, self.completed_dir,
                          self.failed_dir, self.templates_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(directory)
+
+        # התקן (st_dev) של תיקיות הסטטוס - העברה בתוך אותו התקן היא rename אחד
+        self._status_dir_devices = {
+            directory: os.stat(directory).st_dev
+            for directory in [self.active_dir, self.completed_dir, self.failed_dir]
+        }
 
     def _load_experiments(self):
-        """טעינת ניסויים"""
+        """טעינת ניסויים - תמונת המצב ואחריה השינויים מהיומן"""
         experiments_file = self.experiments_dir / "experiments.json"
         if experiments_file.exists():
-            with open(experiments_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.experiments = {e['id']: Experiment(**e) for e in data}
+            data = json_loads(experiments_file.read_bytes())
+            records = {e['id']: e for e in data}
         else:
-            self.experiments = {}
+            records = {}
+
+        journal_file = self.experiments_dir / "experiments.log.jsonl"
+        if journal_file.exists():
+            for line in journal_file.read_bytes().splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    # שורה חלקית (קריסה באמצע כתיבה)
+                    self.logger.warning("Skipping corrupt experiments journal line")
+                    continue
+                if entry.get("op") == "upsert":
+                    records[entry["exp"]["id"]] = entry["exp"]
+
+        # מופעי Experiment נבנים רק בגישה הראשונה לכל ניסוי
+        self.experiments = _LazyExperimentMap(records)
+
+        # אינדקסים משניים: סטטוס / סוג -> מזהי ניסויים (נבנים מהרשומות הגולמיות)
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_type: Dict[str, Set[str]] = defaultdict(set)
+        # זמן היצירה כ-timestamp - לסינון לפי תקופה בלי לפרסר ISO שוב ושוב
+        self._created_ts: Dict[str, float] = {}
+        for exp_id, record in records.items():
+            if "hypothesis_confirmed" not in record:
+                # רשומה שנשמרה לפני שהשדה נוסף
+                conclusion = record.get("conclusion")
+                record["hypothesis_confirmed"] = bool(conclusion) and _CONFIRMED_MARKER in conclusion
+            self._by_status[record["status"]].add(exp_id)
+            self._by_type[record["experiment_type"]].add(exp_id)
+            self._created_ts[exp_id] = datetime.fromisoformat(record["created_at"]).timestamp()
+
+        self._load_id_counter(records)
+
+    def _load_id_counter(self, records: Dict[str, Dict]):
+        """
+        טעינת מונה המזהים מ-counter.bin
+
+        המונה לא יורד מתחת למזהה הגבוה ביותר שנטען, כך שרשומות שנוצרו
+        לפני קיום הקובץ (או אחרי קריסה לפני עדכונו) לא יקבלו מזהה כפול.
+        """
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self._counter_fd = os.open(self.experiments_dir / "counter.bin", flags, 0o644)
+        data = os.read(self._counter_fd, _COUNTER.size)
+        stored = _COUNTER.unpack(data)[0] if len(data) == _COUNTER.size else 0
+
+        highest = 0
+        for exp_id in records:
+            number = exp_id.rpartition("-")[2]
+            if number.isdigit():
+                highest = max(highest, int(number))
+        self._next_id = max(stored, highest)
+
+    def _allocate_id(self) -> str:
+        """הקצאת מזהה ניסוי חדש ושמירת המונה (כתיבה אחת למקום קבוע)"""
+        with self._id_lock:
+            self._next_id += 1
+            number = self._next_id
+            data = _COUNTER.pack(number)
+            if hasattr(os, "pwrite"):
+                os.pwrite(self._counter_fd, data, 0)
+            else:
+                os.lseek(self._counter_fd, 0, os.SEEK_SET)
+                os.write(self._counter_fd, data)
+        return f"exp-{number:03d}"
+
+    def close(self):
+        """סגירת היומן וקובץ המונה"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._counter_fd is not None:
+            os.close(self._counter_fd)
+            self._counter_fd = None
+        super().close()
+
+    def _set_status(self, experiment: Experiment, new_status: str):
+        """שינוי סטטוס ניסוי ועדכון האינדקס לפי סטטוס"""
+        ids = self._by_status[experiment.status]
+        ids.discard(experiment.id)
+        if not ids:
+            del self._by_status[experiment.status]
+
+        experiment.status = new_status
+        self._by_status[new_status].add(experiment.id)
 
     def _save_experiments(self):
-        """שמירת ניסויים"""
+        """
+        שמירת תמונת מצב מלאה של הניסויים וריקון היומן (נקודת ביקורת)
+        """
         experiments_file = self.experiments_dir / "experiments.json"
-        with open(experiments_file, 'w', encoding='utf-8') as f:
-            json.dump([asdict(e) for e in self.experiments.values()], f, ensure_ascii=False, indent=2)
+        data = self.experiments.records(self._snapshot)
+        _write_atomic(experiments_file, json_dumps(data, indent=True))
+
+        # רק אחרי שתמונת המצב הוחלפה בדיסק
+        journal_file = self.experiments_dir / "experiments.log.jsonl"
+        if self._journal is not None:
+            self._journal.truncate(0)
+        elif journal_file.exists():
+            journal_file.write_bytes(b"")
+        self._journal_size = 0
+
+    def _snapshot(self, experiment: Experiment, refresh: bool = False) -> Dict:
+        """
+        מילון השמירה של ניסוי - מחושב מחדש רק אחרי שינוי
+
+        המילון (העתקה רדודה) משמש לכתיבה לדיסק בלבד; ממשקים שמחזירים ניסוי
+        לקורא ממשיכים להחזיר asdict חדש, כדי ששינוי בתוצאה לא ישנה את הניסוי.
+
+        Args:
+            experiment: הניסוי
+            refresh: הניסוי השתנה - חישוב מחדש
+        """
+        record = None if refresh else self._snapshot_cache.get(experiment.id)
+        if record is None:
+            record = self._snapshot_cache[experiment.id] = _experiment_to_json(experiment)
+        return record
+
+    def _journal_experiment(self, experiment: Experiment):
+        """הוספת מצב הניסוי ליומן (שורה אחת) ודחיסה אם היומן גדל מדי"""
+        if self._journal is None:
+            self._journal = open(
+                self.experiments_dir / "experiments.log.jsonl", "ab", buffering=0
+            )
+            self._journal_size = self._journal.tell()
+
+        record = self._snapshot(experiment, refresh=True)
+        line = json_dumps({"op": "upsert", "exp": record}) + b"\n"
+        self._journal.write(line)
+        self._journal_size += len(line)
+
+        if self._journal_size > _JOURNAL_COMPACT_SIZE:
+            self._save_experiments()
 
     # ======== יצירת ניסויים ========
 
@@ -121,7 +437,8 @@ class ExperimentTrackerAgent(BaseAgent):
             baseline_id: מזהה ניסוי baseline להשוואה
         """
         # יצירת מזהה
-        exp_id = f"exp-{len(self.experiments) + 1:03d}"
+        exp_id = self._allocate_id()
+        created = datetime.now()
 
         experiment = Experiment(
             id=exp_id,
@@ -134,11 +451,15 @@ class ExperimentTrackerAgent(BaseAgent):
             metrics=metrics,
             results=None,
             conclusion=None,
-            created_at=datetime.now().isoformat()
+            created_at=created.isoformat()
         )
 
         self.experiments[exp_id] = experiment
-        self._save_experiments()
+        self._by_status[experiment.status].add(exp_id)
+        self._by_type[experiment_type].add(exp_id)
+        self._created_ts[exp_id] = created.timestamp()
+
+        self._journal_experiment(experiment)
 
         # יצירת תיקיית ניסוי
         self._create_experiment_folder(experiment)
@@ -149,19 +470,29 @@ class ExperimentTrackerAgent(BaseAgent):
     def _create_experiment_folder(self, experiment: Experiment):
         """יצירת תיקיית ניסוי"""
         exp_dir = self.active_dir / experiment.id
-        exp_dir.mkdir(exist_ok=True)
-
-        (exp_dir / "code").mkdir(exist_ok=True)
-        (exp_dir / "data").mkdir(exist_ok=True)
-        (exp_dir / "results").mkdir(exist_ok=True)
+        self._batch_mkdirs([exp_dir] + [exp_dir / sub for sub in _EXPERIMENT_SUBDIRS])
 
         # שמירת config
         config_file = exp_dir / "config.yaml"
         self._save_experiment_config(experiment, config_file)
 
+    @staticmethod
+    def _batch_mkdirs(paths: List[Path]):
+        """
+        יצירת תיקיות לפי הסדר - mkdir אחד לכל תיקייה חדשה
+
+        בדיקת הקיום (stat) מתבצעת רק אם התיקייה כבר קיימת.
+        """
+        for path in paths:
+            try:
+                os.mkdir(path)
+            except FileExistsError:
+                if not path.is_dir():
+                    raise
+
     def _save_experiment_config(self, experiment: Experiment, filepath: Path):
         """שמירת קונפיגורציית ניסוי"""
-        content = f"""# Experiment: {experiment.id}
+        parts = [f"""# Experiment: {experiment.id}
 # Name: {experiment.name}
 # Created: {experiment.created_at}
 
@@ -177,19 +508,22 @@ experiment:
     experiment_id: {experiment.baseline_id or 'null'}
 
   configuration:
-"""
-        for key, value in experiment.configuration.items():
-            content += f"    {key}: {json.dumps(value)}\n"
+"""]
+        parts.extend(
+            f"    {key}: {json.dumps(value)}\n"
+            for key, value in experiment.configuration.items()
+        )
 
-        content += "\n  metrics:\n"
-        for metric in experiment.metrics:
-            content += f"""    - name: "{metric['name']}"
+        parts.append("\n  metrics:\n")
+        parts.extend(
+            f"""    - name: "{metric['name']}"
       description: "{metric.get('description', '')}"
       higher_is_better: {str(metric.get('higher_is_better', True)).lower()}
 """
+            for metric in experiment.metrics
+        )
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        filepath.write_text("".join(parts), encoding='utf-8')
 
     # ======== ניהול ניסויים ========
 
@@ -199,8 +533,8 @@ experiment:
         if not exp:
             return {"error": f"Experiment not found: {exp_id}"}
 
-        exp.status = ExperimentStatus.RUNNING.value
-        self._save_experiments()
+        self._set_status(exp, ExperimentStatus.RUNNING.value)
+        self._journal_experiment(exp)
 
         self.log_action("start_experiment", {"id": exp_id})
         return {"success": True, "status": exp.status}
@@ -226,13 +560,14 @@ experiment:
         exp.results = results
         if conclusion:
             exp.conclusion = conclusion
-            exp.status = ExperimentStatus.COMPLETED.value
+            exp.hypothesis_confirmed = _CONFIRMED_MARKER in conclusion
+            self._set_status(exp, ExperimentStatus.COMPLETED.value)
             exp.completed_at = datetime.now().isoformat()
 
             # העברה לתיקיית completed
             self._move_experiment_folder(exp, self.completed_dir)
 
-        self._save_experiments()
+        self._journal_experiment(exp)
 
         # שמירת תוצאות לקובץ
         self._save_results_file(exp)
@@ -247,24 +582,38 @@ experiment:
         else:
             results_dir = self.active_dir / experiment.id / "results"
 
-        results_dir.mkdir(parents=True, exist_ok=True)
+        payload = json_dumps({
+            "experiment_id": experiment.id,
+            "results": experiment.results,
+            "conclusion": experiment.conclusion,
+            "recorded_at": datetime.now().isoformat()
+        }, indent=True)
 
+        # התיקייה נוצרת עם הניסוי - mkdir רק אם היא חסרה
         results_file = results_dir / "results.json"
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "experiment_id": experiment.id,
-                "results": experiment.results,
-                "conclusion": experiment.conclusion,
-                "recorded_at": datetime.now().isoformat()
-            }, f, ensure_ascii=False, indent=2)
+        try:
+            results_file.write_bytes(payload)
+        except FileNotFoundError:
+            results_dir.mkdir(parents=True, exist_ok=True)
+            results_file.write_bytes(payload)
 
     def _move_experiment_folder(self, experiment: Experiment, target_dir: Path):
         """העברת תיקיית ניסוי"""
         source = self.active_dir / experiment.id
         target = target_dir / experiment.id
 
-        if source.exists():
-            shutil.move(str(source), str(target))
+        if not source.exists():
+            return
+
+        devices = self._status_dir_devices
+        if devices.get(self.active_dir) == devices.get(target_dir, -1):
+            try:
+                source.rename(target)
+                return
+            except OSError:
+                pass
+
+        shutil.move(str(source), str(target))
 
     def fail_experiment(self, exp_id: str, reason: str) -> Dict:
         """סימון ניסוי ככושל"""
@@ -272,12 +621,12 @@ experiment:
         if not exp:
             return {"error": f"Experiment not found: {exp_id}"}
 
-        exp.status = ExperimentStatus.FAILED.value
+        self._set_status(exp, ExperimentStatus.FAILED.value)
         exp.conclusion = f"FAILED: {reason}"
         exp.completed_at = datetime.now().isoformat()
 
         self._move_experiment_folder(exp, self.failed_dir)
-        self._save_experiments()
+        self._journal_experiment(exp)
 
         self.log_action("fail_experiment", {"id": exp_id, "reason": reason})
         return {"success": True}
@@ -288,11 +637,11 @@ experiment:
         if not exp:
             return {"error": f"Experiment not found: {exp_id}"}
 
-        exp.status = ExperimentStatus.ABANDONED.value
+        self._set_status(exp, ExperimentStatus.ABANDONED.value)
         exp.conclusion = f"ABANDONED: {reason}"
         exp.completed_at = datetime.now().isoformat()
 
-        self._save_experiments()
+        self._journal_experiment(exp)
 
         self.log_action("abandon_experiment", {"id": exp_id, "reason": reason})
         return {"success": True}
@@ -320,38 +669,97 @@ experiment:
             "metrics_comparison": []
         }
 
+        # (מזהה, תוצאות) לכל ניסוי - נבנה פעם אחת לכל ההשוואה
+        results_list = [(e.id, e.results or {}) for e in experiments]
+
         # איסוף כל המדדים
         all_metrics = set()
-        for exp in experiments:
-            if exp.results:
-                all_metrics.update(exp.results.keys())
+        for _, results in results_list:
+            all_metrics.update(results.keys())
+
+        # זיהוי הטוב ביותר לכל מדד
+        metric_names = list(all_metrics)
+        best_by_metric = self._best_per_metric(metric_names, results_list)
 
         # השוואה לפי מדד
-        for metric in all_metrics:
+        for metric in metric_names:
             metric_data = {
                 "metric": metric,
-                "values": {}
+                "values": {exp_id: results.get(metric) for exp_id, results in results_list}
             }
 
-            for exp in experiments:
-                value = exp.results.get(metric) if exp.results else None
-                metric_data["values"][exp.id] = value
-
-            # זיהוי הטוב ביותר
-            values_with_ids = [
-                (exp.id, exp.results.get(metric))
-                for exp in experiments
-                if exp.results and exp.results.get(metric) is not None
-            ]
-
-            if values_with_ids:
-                best = max(values_with_ids, key=lambda x: x[1])
-                metric_data["best"] = best[0]
+            if metric in best_by_metric:
+                metric_data["best"] = best_by_metric[metric]
 
             comparison["metrics_comparison"].append(metric_data)
 
         return comparison
 
+    def _best_per_metric(
+        self,
+        metric_names: List[str],
+        results_list: List[Tuple[str, Dict]]
+    ) -> Dict[str, str]:
+        """
+        מזהה הניסוי עם הערך הגבוה ביותר לכל מדד (הראשון מביניהם בשוויון)
+
+        בהשוואה גדולה עם ערכים מספריים בלבד - מטריצת numpy (מדדים x ניסויים)
+        ו-argmax אחד לכל השורות; אחרת max ב-Python לכל מדד.
+
+        Args:
+            metric_names: שמות המדדים
+            results_list: (מזהה ניסוי, תוצאות) לכל ניסוי בהשוואה
+        """
+        if np is not None and len(metric_names) * len(results_list) >= _NUMPY_MIN_CELLS:
+            best = self._best_per_metric_numpy(metric_names, results_list)
+            if best is not None:
+                return best
+
+        best = {}
+        for metric in metric_names:
+            best_id = best_value = None
+            for exp_id, results in results_list:
+                value = results.get(metric)
+                if value is not None and (best_id is None or value > best_value):
+                    best_id, best_value = exp_id, value
+
+            if best_id is not None:
+                best[metric] = best_id
+
+        return best
+
+    @staticmethod
+    def _best_per_metric_numpy(
+        metric_names: List[str],
+        results_list: List[Tuple[str, Dict]]
+    ) -> Optional[Dict[str, str]]:
+        """
+        _best_per_metric עם numpy
+
+        Returns:
+            None אם יש ערך לא מספרי (ההשוואה תתבצע ב-Python)
+        """
+        row_of = {metric: i for i, metric in enumerate(metric_names)}
+        values = np.full((len(metric_names), len(results_list)), np.nan)
+
+        for j, (_, results) in enumerate(results_list):
+            for metric, value in results.items():
+                if value is None:
+                    continue
+                if not isinstance(value, (int, float)):
+                    return None
+                values[row_of[metric], j] = value
+
+        missing = np.isnan(values)
+        has_value = ~missing.all(axis=1)
+        best_idx = np.where(missing, -np.inf, values).argmax(axis=1)
+
+        return {
+            metric: results_list[best_idx[i]][0]
+            for i, metric in enumerate(metric_names)
+            if has_value[i]
+        }
+
     def restore_experiment(
         self,
         exp_id: str,
@@ -374,7 +782,7 @@ experiment:
             if source.exists():
                 if target_dir:
                     target = Path(target_dir)
-                    shutil.copytree(str(source), str(target))
+                    shutil.copytree(str(source), str(target), copy_function=_reflink_copy)
                     return {
                         "success": True,
                         "restored_to": str(target),
@@ -466,12 +874,17 @@ experiment:
         limit: int = 50
     ) -> List[Dict]:
         """רשימת ניסויים"""
-        experiments = list(self.experiments.values())
-
-        if status:
-            experiments = [e for e in experiments if e.status == status]
-        if exp_type:
-            experiments = [e for e in experiments if e.experiment_type == exp_type]
+        if status or exp_type:
+            # סינון דרך האינדקסים - רק הניסויים שעברו את הסינון נטענים וממוינים
+            ids = None
+            if status:
+                ids = self._by_status.get(status, set())
+            if exp_type:
+                type_ids = self._by_type.get(exp_type, set())
+                ids = type_ids if ids is None else ids & type_ids
+            experiments = [self.experiments[eid] for eid in sorted(ids)]
+        else:
+            experiments = list(self.experiments.values())
 
         experiments.sort(key=lambda x: x.created_at, reverse=True)
 
@@ -501,79 +914,53 @@ experiment:
         # סינון לפי תקופה
         if period == "weekly":
             week_ago = datetime.now().timestamp() - 7 * 24 * 3600
-            experiments = [e for e in experiments
-                         if datetime.fromisoformat(e.created_at).timestamp() > week_ago]
+            experiments = [e for e in experiments if self._created_ts[e.id] > week_ago]
         elif period == "monthly":
             month_ago = datetime.now().timestamp() - 30 * 24 * 3600
-            experiments = [e for e in experiments
-                         if datetime.fromisoformat(e.created_at).timestamp() > month_ago]
+            experiments = [e for e in experiments if self._created_ts[e.id] > month_ago]
 
         # סטטיסטיקות
-        by_status = {}
-        for exp in experiments:
-            by_status[exp.status] = by_status.get(exp.status, 0) + 1
+        by_status = Counter(exp.status for exp in experiments)
 
-        summary = f"""# סיכום ניסויים - {period}
+        parts = [f"""# סיכום ניסויים - {period}
 
 ## סה"כ: {len(experiments)}
 
 ### לפי סטטוס
-"""
-        status_emoji = {
-            "completed": "",
-            "failed": "",
-            "running": "",
-            "draft": "",
-            "abandoned": ""
-        }
-
-        for status, count in by_status.items():
-            emoji = status_emoji.get(status, "")
-            summary += f"- {emoji} {status}: {count}\n"
+"""]
+        status_emoji = _STATUS_EMOJI
+        parts.extend(
+            f"- {status_emoji.get(status, '')} {status}: {count}\n"
+            for status, count in by_status.items()
+        )
 
         # ניסויים שהסתיימו
         completed = [e for e in experiments if e.status == "completed"]
         if completed:
-            summary += "\n### ניסויים שהושלמו\n"
+            parts.append("\n### ניסויים שהושלמו\n")
             for exp in completed[:10]:
-                result_emoji = "" if exp.conclusion and "אושרה" in exp.conclusion else ""
-                summary += f"- {result_emoji} [{exp.id}] {exp.name}\n"
+                result_emoji = "" if exp.hypothesis_confirmed else ""
+                parts.append(f"- {result_emoji} [{exp.id}] {exp.name}\n")
 
-        return summary
+        return "".join(parts)
 
     # ======== ממשק סוכן ========
 
     def run(self, command: str, **kwargs) -> Dict[str, Any]:
         """הפעלת פקודה"""
-        commands = {
-            "create": self.create_experiment,
-            "start": self.start_experiment,
-            "record_results": self.record_results,
-            "fail": self.fail_experiment,
-            "abandon": self.abandon_experiment,
-            "compare": self.compare_experiments,
-            "restore": self.restore_experiment,
-            "rerun": self.rerun_experiment,
-            "clone": self.clone_experiment,
-            "list": self.list_experiments,
-            "details": self.get_experiment_details,
-            "summary": self.generate_summary,
-        }
-
-        if command not in commands:
+        handler = self._commands.get(command)
+        if handler is None:
             return {"error": f"Unknown command: {command}"}
 
         try:
-            result = commands[command](**kwargs)
+            result = handler(**kwargs)
             return {"success": True, "result": result}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     def get_status(self) -> Dict[str, Any]:
         """קבלת סטטוס הסוכן"""
-        by_status = {}
-        for exp in self.experiments.values():
-            by_status[exp.status] = by_status.get(exp.status, 0) + 1
+        by_status = {status: len(ids) for status, ids in self._by_status.items()}
 
         return {
             "name": self.name,
@@ -8,15 +8,21 @@ Input Processing Agent - סוכן עיבוד ווולידציה של קלטים
 - דוחות עיבוד
 """
 
+import csv
 import json
 import os
+import re
 import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 from enum import Enum
 
-from .base_agent import BaseAgent, DOCS_DIR, REPORTS_DIR
+from .base_agent import (
+    BaseAgent, DOCS_DIR, REPORTS_DIR, _process_pool_context, json_dumps, json_loads
+)
 
 # ניסיון לייבא ספריות עיבוד
 try:
@@ -29,6 +35,256 @@ try:
 except ImportError:
     pdfplumber = None
 
+# numpy אופציונלי - ספירת תווים עבריים/אנגליים בזיהוי שפה
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _read_prefix(path: Path, size: int) -> bytes:
+    """קריאת תחילת קובץ - fd גולמי, בלי אובייקט קובץ ובאפר של Python"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _json_loads_lenient(raw: bytes) -> Any:
+    """
+    פענוח JSON מהיר (json_loads), עם חזרה ל-json עבור מה שרק הוא מקבל:
+    NaN/Infinity ומספרים שלמים מעבר ל-64 ביט
+    """
+    try:
+        return json_loads(raw)
+    except ValueError:
+        return json.loads(raw.decode('utf-8'))
+
+
+def _json_dumps_lenient(obj: Any, stdlib: bool = False) -> bytes:
+    """
+    קידוד JSON מהיר (json_dumps) עם הזחה, עם חזרה ל-json למספרים שלמים גדולים
+
+    json_dumps כותב NaN/Infinity כ-null, לכן נתונים שפוענחו ב-json (stdlib=True)
+    נכתבים שוב ב-json כדי שיישמרו כמו שהם.
+    """
+    if not stdlib:
+        try:
+            return json_dumps(obj, indent=True)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+
+
+# גודל מקטע לספירת מילים - רשימת המילים הזמנית נשארת קטנה
+_WORD_COUNT_CHUNK = 1 << 16
+
+
+def _count_words(text: str) -> int:
+    """
+    ספירת מילים כמו len(text.split()) - במקטעים, בלי רשימה של כל מילות הטקסט
+
+    מילה שנחתכת בין שני מקטעים נספרת פעם אחת.
+    """
+    count = 0
+    open_word = False
+    for start in range(0, len(text), _WORD_COUNT_CHUNK):
+        chunk = text[start:start + _WORD_COUNT_CHUNK]
+        count += len(chunk.split())
+        if open_word and not chunk[0].isspace():
+            count -= 1
+        open_word = not chunk[-1].isspace()
+    return count
+
+
+# גודל תחילת ה-PDF שנסרקת לזיהוי מהיר (בלי פתיחה ב-pdfplumber)
+_PDF_SNIFF_SIZE = 4096
+
+
+def _pdf_declares_fonts(path: Path) -> bool:
+    """
+    האם תחילת ה-PDF מגדירה גופנים (/Font) - סימן לקובץ עם טקסט
+
+    תשובה שלילית אינה מכרעת: הגופנים יכולים להופיע בהמשך הקובץ או בתוך
+    object stream דחוס, ואז נדרשת בדיקה מלאה.
+    """
+    try:
+        head = _read_prefix(path, _PDF_SNIFF_SIZE)
+    except OSError:
+        return False
+    return b'/Font' in head
+
+
+# תווים עבריים / אותיות לטיניות (ללא numpy)
+_HEBREW_CHAR_RE = re.compile('[\u0590-\u05FF]')
+_ENGLISH_CHAR_RE = re.compile('[a-zA-Z]')
+
+
+def _count_hebrew_english(sample: str) -> Tuple[int, int]:
+    """
+    ספירת תווים עבריים ואותיות אנגליות בדגימה
+
+    עם numpy - מעבר וקטורי אחד על נקודות הקוד; אחרת regex (לולאה ב-C).
+    """
+    if np is not None:
+        codes = np.frombuffer(sample.encode('utf-32-le'), dtype=np.uint32)
+        hebrew = (codes >= 0x0590) & (codes <= 0x05FF)
+        folded = codes | 0x20  # A-Z -> a-z
+        english = (folded >= 0x61) & (folded <= 0x7A)
+        return int(hebrew.sum()), int(english.sum())
+
+    return len(_HEBREW_CHAR_RE.findall(sample)), len(_ENGLISH_CHAR_RE.findall(sample))
+
+
+# אותיות עבריות בקידוד cp1255 (א-ת)
+_CP1255_HEBREW = bytes(range(0xE0, 0xFB))
+
+
+def _sniff_encoding(raw: bytes) -> str:
+    """
+    זיהוי encoding מתחילת קובץ
+
+    Args:
+        raw: הבתים הראשונים של הקובץ
+
+    Returns:
+        utf-8-sig / utf-16 (לפי BOM), utf-8, cp1255 (עברית) או cp1252
+    """
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # תו רב-בתי שנחתך בסוף הדגימה
+        if e.reason == 'unexpected end of data':
+            return 'utf-8'
+
+    # בתים שאינם אותיות עבריות נמחקים - מה שנשאר הוא מספר האותיות
+    hebrew = len(raw) - len(raw.translate(None, _CP1255_HEBREW))
+    return 'cp1255' if hebrew > len(raw) * 0.05 else 'cp1252'
+
+
+# תווים בעייתיים בטקסט מעובד (NUL / תו החלפה) - חיפוש אחד לשניהם
+_PROBLEMATIC_CHARS = ('\x00', '\ufffd')
+_BAD_CHARS_RE = re.compile('[\x00\ufffd]')
+
+# סימון לכל סטטוס בדוח העיבוד
+_STATUS_EMOJI = {"success": "", "partial": "", "failed": ""}
+
+# היסטוריית עיבודים: רשומות שנשמרות / אורך היומן שמעליו הוא נדחס
+_HISTORY_KEEP = 1000
+_HISTORY_COMPACT_LINES = 5000
+
+# מתחת למספר העמודים הזה עלות הפעלת תהליכים גבוהה מהרווח
+_PDF_PARALLEL_MIN_PAGES = 8
+
+# מעל מספר העמודים הזה העמודים נכתבים לקובץ JSONL ולא נשמרים בזיכרון
+_PDF_STREAM_MIN_PAGES = 500
+
+
+def _extract_page(page) -> Tuple[str, List]:
+    """חילוץ טקסט וטבלאות מעמוד PDF"""
+    return page.extract_text() or "", page.extract_tables() or []
+
+
+def _extract_page_range(path: str, start: int, end: int) -> List[Tuple[str, List]]:
+    """
+    חילוץ טווח עמודים בתהליך נפרד - כל תהליך פותח את ה-PDF בעצמו
+
+    Args:
+        path: נתיב קובץ ה-PDF
+        start: עמוד ראשון (כולל, מ-0)
+        end: עמוד אחרון (לא כולל)
+
+    Returns:
+        (טקסט, טבלאות) לכל עמוד בטווח - ערכים פשוטים בלבד, בלי אובייקטי pdfplumber
+    """
+    with pdfplumber.open(path) as pdf:
+        return [_extract_page(pdf.pages[i]) for i in range(start, end)]
+
+
+# מידע על העמוד הראשון של קבצי PDF אחרונים, לפי (נתיב, זמן שינוי, גודל)
+_PDF_FIRST_PAGE_CACHE_SIZE = 32
+_pdf_first_page_cache: "OrderedDict[Tuple[str, int, int], Optional[Dict]]" = OrderedDict()
+
+
+def _read_first_page(pdf) -> Dict:
+    """טקסט, טבלאות ותמונות של העמוד הראשון מ-PDF פתוח"""
+    info = {"page_count": len(pdf.pages)}
+    if pdf.pages:
+        first_page = pdf.pages[0]
+        info["text"], info["tables"] = _extract_page(first_page)
+        info["image_count"] = len(first_page.images or [])
+    return info
+
+
+def _pdf_first_page(path: str, mtime_ns: int, size: int, pdf=None) -> Optional[Dict]:
+    """
+    טקסט, טבלאות ותמונות של העמוד הראשון - פתיחה אחת של ה-PDF לכל הבדיקות
+
+    המפתח כולל זמן שינוי וגודל, כך שקובץ שהשתנה נקרא מחדש.
+
+    Args:
+        path: נתיב הקובץ
+        mtime_ns: זמן שינוי אחרון
+        size: גודל הקובץ
+        pdf: הקובץ כבר פתוח ב-pdfplumber (לא נסגר כאן), אם יש
+
+    Returns:
+        {"page_count", "text", "tables", "image_count"} (בלי text/tables/image_count
+        כשאין עמודים), או None אם לא ניתן לקרוא את הקובץ
+    """
+    key = (path, mtime_ns, size)
+    try:
+        info = _pdf_first_page_cache[key]
+        _pdf_first_page_cache.move_to_end(key)
+        return info
+    except KeyError:
+        pass
+
+    try:
+        if pdf is not None:
+            info = _read_first_page(pdf)
+        else:
+            with pdfplumber.open(path) as pdf:
+                info = _read_first_page(pdf)
+    except Exception:
+        info = None
+
+    _pdf_first_page_cache[key] = info
+    if len(_pdf_first_page_cache) > _PDF_FIRST_PAGE_CACHE_SIZE:
+        _pdf_first_page_cache.popitem(last=False)
+    return info
+
+
+def _pdf_first_page_text(path: str, mtime_ns: int, size: int) -> Optional[Dict]:
+    """
+    מספר העמודים וטקסט העמוד הראשון בלבד - בלי חילוץ טבלאות ותמונות
+
+    מידע שכבר נמצא במטמון של _pdf_first_page מוחזר ממנו; קריאה חלקית
+    אינה נשמרת במטמון.
+
+    Returns:
+        {"page_count", "text"} (בלי text כשאין עמודים), או None אם לא ניתן לקרוא
+    """
+    key = (path, mtime_ns, size)
+    if key in _pdf_first_page_cache:
+        return _pdf_first_page_cache[key]
+
+    try:
+        with pdfplumber.open(path) as pdf:
+            info = {"page_count": len(pdf.pages)}
+            if pdf.pages:
+                info["text"] = pdf.pages[0].extract_text() or ""
+            return info
+    except Exception:
+        return None
+
 
 class FileType(Enum):
     """סוגי קבצים נתמכים"""
@@ -58,6 +314,11 @@ class InputProcessingAgent(BaseAgent):
 
     def __init__(self, config: Optional[Dict] = None):
         super().__init__("input_processing", config)
+        # תהליכים לחילוץ עמודי PDF - נוצרים בקובץ הגדול הראשון
+        self._pdf_workers = self.config.get("pdf_workers", os.cpu_count() or 1)
+        self._pdf_pool = None
+        # כתיבת דוחות Markdown ברקע - תהליך היציאה ממתין לדוחות שבתור
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="input-io")
         self._init_directories()
         self._load_processing_history()
 
@@ -77,39 +338,102 @@ class InputProcessingAgent(BaseAgent):
                          self.versions_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
+        # קידומות נתיבי הפלט - נבנות פעם אחת (בלי Path ו-/ בכל קריאה)
+        self._normalized_prefix = str(self.output_dir / "normalized") + os.sep
+        self._reports_prefix = str(self.output_dir / "reports") + os.sep
+
     def _load_processing_history(self):
-        """טעינת היסטוריית עיבודים"""
-        history_file = self.output_dir / "processing_history.json"
+        """טעינת היסטוריית עיבודים - הרשומות האחרונות מיומן ה-JSONL"""
+        history_file = self.output_dir / "processing_history.jsonl"
+        self._history_log = None
+        self._history_lines = 0
+        self.processing_history = []
+
         if history_file.exists():
-            with open(history_file, 'r', encoding='utf-8') as f:
-                self.processing_history = json.load(f)
-        else:
-            self.processing_history = []
+            lines = history_file.read_bytes().splitlines()
+            self._history_lines = len(lines)
+            for line in lines[-_HISTORY_KEEP:]:
+                if not line.strip():
+                    continue
+                try:
+                    self.processing_history.append(json_loads(line))
+                except ValueError:
+                    # שורה חלקית (קריסה באמצע כתיבה)
+                    self.logger.warning("Skipping corrupt processing history line")
+            return
+
+        # היסטוריה בפורמט הקודם (מערך JSON אחד) - מועברת ליומן
+        legacy_file = self.output_dir / "processing_history.json"
+        if legacy_file.exists():
+            self.processing_history = json_loads(legacy_file.read_bytes())
+            self._save_processing_history()
 
     def _save_processing_history(self):
-        """שמירת היסטוריית עיבודים"""
-        history_file = self.output_dir / "processing_history.json"
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.processing_history[-1000:], f, ensure_ascii=False, indent=2)
-
-    def classify_input(self, file_path: str) -> Dict:
+        """
+        כתיבה מחדש של יומן ההיסטוריה עם הרשומות האחרונות בלבד (דחיסה)
+        """
+        history_file = self.output_dir / "processing_history.jsonl"
+        records = self.processing_history[-_HISTORY_KEEP:]
+
+        tmp_file = history_file.with_suffix(".jsonl.tmp")
+        tmp_file.write_bytes(b"".join(json_dumps(r) + b"\n" for r in records))
+        if self._history_log is not None:
+            self._history_log.close()
+            self._history_log = None
+        os.replace(tmp_file, history_file)
+        self._history_lines = len(records)
+
+    def _append_processing_history(self, record: Dict):
+        """הוספת רשומה ליומן ההיסטוריה (שורה אחת) ודחיסה כשהוא ארוך מדי"""
+        if self._history_log is None:
+            self._history_log = open(
+                self.output_dir / "processing_history.jsonl", "ab", buffering=0
+            )
+
+        self._history_log.write(json_dumps(record) + b"\n")
+        self._history_lines += 1
+
+        if self._history_lines > _HISTORY_COMPACT_LINES:
+            self._save_processing_history()
+
+    def classify_input(
+        self,
+        file_path: str,
+        deep: bool = True,
+        st: Optional[os.stat_result] = None,
+        metadata_only: bool = False
+    ) -> Dict:
         """
         זיהוי וסיווג קובץ
 
         Args:
             file_path: נתיב לקובץ
+            deep: זיהוי PDF דיגיטלי/סרוק תמיד לפי הטקסט בעמוד הראשון. בלי deep,
+                PDF שמצהיר על גופנים בתחילת הקובץ מסווג כדיגיטלי בלי לפתוח אותו
+                (מהיר, אך PDF סרוק שמגדיר גופנים יסווג כדיגיטלי)
+            st: תוצאת os.stat של הקובץ, אם כבר ידועה
+            metadata_only: סוג, גודל, encoding ושפה בלבד - בלי בדיקות האיכות
+                (טקסט, טבלאות ותמונות של העמוד הראשון) ובלי deep. מהיר בהרבה
+                לרשימת קבצים; quality_indicators מסומן skipped. PDF ללא הצהרת
+                גופנים עדיין נפתח לזיהוי דיגיטלי/סרוק, אך רק הטקסט של העמוד
+                הראשון מחולץ - בלי טבלאות ותמונות
 
         Returns:
             מידע על הקובץ
         """
         path = Path(file_path)
 
-        if not path.exists():
-            return {"error": f"File not found: {file_path}"}
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return {"error": f"File not found: {file_path}"}
 
         # זיהוי סוג קובץ
         ext = path.suffix.lower()
-        file_type = self._detect_file_type(path, ext)
+        file_type = self._detect_file_type(
+            path, ext, deep and not metadata_only, st, text_only=metadata_only
+        )
 
         # זיהוי encoding
         encoding = self._detect_encoding(path) if ext in ['.txt', '.csv', '.md'] else 'binary'
@@ -118,12 +442,15 @@ class InputProcessingAgent(BaseAgent):
         language = self._detect_language(path) if file_type != FileType.UNKNOWN else 'unknown'
 
         # בדיקות איכות
-        quality_indicators = self._check_quality_indicators(path, file_type)
+        if metadata_only:
+            quality_indicators = {"estimated_quality": "unknown", "skipped": True}
+        else:
+            quality_indicators = self._check_quality_indicators(path, file_type, st)
 
         return {
             "file_path": str(path.absolute()),
             "file_name": path.name,
-            "file_size": path.stat().st_size,
+            "file_size": st.st_size,
             "file_type": file_type.value,
             "encoding": encoding,
             "language": language,
@@ -131,8 +458,24 @@ class InputProcessingAgent(BaseAgent):
             "analyzed_at": datetime.now().isoformat()
         }
 
-    def _detect_file_type(self, path: Path, ext: str) -> FileType:
-        """זיהוי סוג קובץ"""
+    def _detect_file_type(
+        self,
+        path: Path,
+        ext: str,
+        deep: bool = True,
+        st: Optional[os.stat_result] = None,
+        text_only: bool = False
+    ) -> FileType:
+        """
+        זיהוי סוג קובץ
+
+        Args:
+            path: נתיב הקובץ
+            ext: סיומת (באותיות קטנות)
+            deep: ב-PDF - בדיקת טקסט העמוד הראשון גם כשהקובץ מצהיר על גופנים
+            st: תוצאת os.stat של הקובץ, אם כבר ידועה
+            text_only: ב-PDF - חילוץ הטקסט בלבד, בלי טבלאות ותמונות
+        """
         type_map = {
             '.pdf': FileType.PDF_DIGITAL,
             '.txt': FileType.TXT,
@@ -148,29 +491,58 @@ class InputProcessingAgent(BaseAgent):
 
         # בדיקה מעמיקה יותר ל-PDF
         if file_type == FileType.PDF_DIGITAL and pdfplumber:
-            try:
-                with pdfplumber.open(path) as pdf:
-                    first_page = pdf.pages[0] if pdf.pages else None
-                    if first_page:
-                        text = first_page.extract_text() or ""
-                        if len(text.strip()) < 50:
-                            file_type = FileType.PDF_SCANNED
-            except Exception:
-                pass
+            if not deep and _pdf_declares_fonts(path):
+                return file_type
+
+            info = self._pdf_first_page_info(path, st, text_only)
+            if info and info["page_count"] and len(info["text"].strip()) < 50:
+                file_type = FileType.PDF_SCANNED
 
         return file_type
 
+    @staticmethod
+    def _pdf_first_page_info(
+        path: Path,
+        st: Optional[os.stat_result] = None,
+        text_only: bool = False
+    ) -> Optional[Dict]:
+        """
+        מידע על העמוד הראשון של PDF (שמור לפי נתיב, זמן שינוי וגודל)
+
+        Args:
+            path: נתיב הקובץ
+            st: תוצאת os.stat של הקובץ, אם כבר ידועה
+            text_only: מספר עמודים וטקסט בלבד (_pdf_first_page_text)
+        """
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+        if text_only:
+            return _pdf_first_page_text(str(path), st.st_mtime_ns, st.st_size)
+        return _pdf_first_page(str(path), st.st_mtime_ns, st.st_size)
+
     def _detect_encoding(self, path: Path) -> str:
-        """זיהוי encoding של קובץ טקסט"""
-        if chardet:
+        """
+        זיהוי encoding של קובץ טקסט
+
+        BOM, אחרת בדיקת UTF-8 תקין, אחרת לפי שכיחות בתים של אותיות עבריות
+        ב-cp1255. chardet (איטי) רק כשמוגדר slow_encoding_detect.
+        """
+        try:
+            raw = _read_prefix(path, 10000)
+        except OSError:
+            return 'utf-8'
+
+        if chardet and self.config.get("slow_encoding_detect"):
             try:
-                with open(path, 'rb') as f:
-                    raw = f.read(10000)
-                    result = chardet.detect(raw)
-                    return result.get('encoding', 'utf-8') or 'utf-8'
+                result = chardet.detect(raw)
+                return result.get('encoding', 'utf-8') or 'utf-8'
             except Exception:
-                pass
-        return 'utf-8'
+                return 'utf-8'
+
+        return _sniff_encoding(raw)
 
     def _detect_language(self, path: Path) -> str:
         """זיהוי שפה (בסיסי)"""
@@ -178,9 +550,8 @@ class InputProcessingAgent(BaseAgent):
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 sample = f.read(1000)
 
-            # ספירת תווים עבריים
-            hebrew_chars = sum(1 for c in sample if '\u0590' <= c <= '\u05FF')
-            english_chars = sum(1 for c in sample if 'a' <= c.lower() <= 'z')
+            # ספירת תווים עבריים ואנגליים
+            hebrew_chars, english_chars = _count_hebrew_english(sample)
 
             if hebrew_chars > english_chars:
                 return 'he'
@@ -191,7 +562,12 @@ class InputProcessingAgent(BaseAgent):
         except Exception:
             return 'unknown'
 
-    def _check_quality_indicators(self, path: Path, file_type: FileType) -> Dict:
+    def _check_quality_indicators(
+        self,
+        path: Path,
+        file_type: FileType,
+        st: Optional[os.stat_result] = None
+    ) -> Dict:
         """בדיקת אינדיקטורים לאיכות"""
         indicators = {
             "has_selectable_text": True,
@@ -203,24 +579,21 @@ class InputProcessingAgent(BaseAgent):
 
         if file_type in [FileType.PDF_DIGITAL, FileType.PDF_SCANNED, FileType.PDF_MIXED]:
             if pdfplumber:
-                try:
-                    with pdfplumber.open(path) as pdf:
-                        if pdf.pages:
-                            first_page = pdf.pages[0]
-                            text = first_page.extract_text() or ""
-                            tables = first_page.extract_tables() or []
-
-                            indicators["has_selectable_text"] = len(text) > 50
-                            indicators["needs_ocr"] = len(text) < 50
-                            indicators["has_tables"] = len(tables) > 0
-                            indicators["has_images"] = len(first_page.images or []) > 0
-
-                            if indicators["needs_ocr"]:
-                                indicators["estimated_quality"] = "low"
-                            elif indicators["has_tables"]:
-                                indicators["estimated_quality"] = "medium"
-                except Exception:
+                info = self._pdf_first_page_info(path, st)
+                if info is None:
                     indicators["estimated_quality"] = "unknown"
+                elif info["page_count"]:
+                    text = info["text"]
+
+                    indicators["has_selectable_text"] = len(text) > 50
+                    indicators["needs_ocr"] = len(text) < 50
+                    indicators["has_tables"] = len(info["tables"]) > 0
+                    indicators["has_images"] = info["image_count"] > 0
+
+                    if indicators["needs_ocr"]:
+                        indicators["estimated_quality"] = "low"
+                    elif indicators["has_tables"]:
+                        indicators["estimated_quality"] = "medium"
 
         return indicators
 
@@ -244,8 +617,10 @@ class InputProcessingAgent(BaseAgent):
         path = Path(file_path)
         start_time = datetime.now()
 
-        # בדיקת קיום
-        if not path.exists():
+        # בדיקת קיום - stat אחד שמשמש גם את הסיווג
+        try:
+            st = os.stat(path)
+        except OSError:
             return self._create_error_result(file_path, "File not found")
 
         # יצירת מזהה
@@ -255,14 +630,25 @@ class InputProcessingAgent(BaseAgent):
         if not force and self._is_already_processed(file_id):
             return self._get_cached_result(file_id)
 
+        # PDF נפתח פעם אחת לסיווג ולחילוץ: העמוד הראשון נקרא לתוך מטמון
+        # הסיווג, והחילוץ ממשיך מאותו אובייקט בלי לקרוא את העמוד שוב
+        pdf = first_page = None
+        if pdfplumber and path.suffix.lower() == '.pdf':
+            try:
+                pdf = pdfplumber.open(path)
+            except Exception:
+                pdf = None
+            else:
+                first_page = _pdf_first_page(str(path), st.st_mtime_ns, st.st_size, pdf)
+
         # סיווג הקובץ
-        classification = self.classify_input(file_path)
+        classification = self.classify_input(file_path, st=st)
         file_type = FileType(classification.get("file_type", "unknown"))
 
         # עיבוד לפי סוג
         try:
             if file_type == FileType.PDF_DIGITAL:
-                result = self._process_pdf(path)
+                result = self._process_pdf(path, file_id, pdf, first_page)
             elif file_type == FileType.TXT:
                 result = self._process_text(path, classification.get("encoding", "utf-8"))
             elif file_type == FileType.JSON:
@@ -277,6 +663,9 @@ class InputProcessingAgent(BaseAgent):
         except Exception as e:
             result = self._create_error_result(file_path, str(e))
             result["status"] = ProcessingStatus.FAILED.value
+        finally:
+            if pdf is not None:
+                pdf.close()
 
         # הוספת מטאדאטה
         end_time = datetime.now()
@@ -304,23 +693,35 @@ class InputProcessingAgent(BaseAgent):
 
     def _generate_file_id(self, path: Path) -> str:
         """יצירת מזהה ייחודי לקובץ"""
-        with open(path, 'rb') as f:
-            file_hash = hashlib.md5(f.read(10000)).hexdigest()[:8]
+        file_hash = hashlib.md5(_read_prefix(path, 10000)).hexdigest()[:8]
         return f"{path.stem}_{file_hash}"
 
     def _is_already_processed(self, file_id: str) -> bool:
         """בדיקה אם קובץ כבר עובד"""
-        result_file = self.output_dir / "normalized" / f"{file_id}.json"
-        return result_file.exists()
+        return os.path.exists(self._normalized_prefix + file_id + ".json")
 
     def _get_cached_result(self, file_id: str) -> Dict:
         """קבלת תוצאה שמורה"""
-        result_file = self.output_dir / "normalized" / f"{file_id}.json"
-        with open(result_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self._normalized_prefix + file_id + ".json", 'rb') as f:
+            return _json_loads_lenient(f.read())
 
-    def _process_pdf(self, path: Path) -> Dict:
-        """עיבוד קובץ PDF"""
+    def _process_pdf(
+        self,
+        path: Path,
+        file_id: Optional[str] = None,
+        pdf=None,
+        first_page: Optional[Dict] = None
+    ) -> Dict:
+        """
+        עיבוד קובץ PDF
+
+        Args:
+            path: נתיב הקובץ
+            file_id: מזהה הקובץ - ב-PDF גדול מאוד העמודים נכתבים לקובץ JSONL
+                לצד התוצאה במקום להישמר ב-content["sections"]
+            pdf: הקובץ כבר פתוח ב-pdfplumber (נסגר ע"י הקורא), אם יש
+            first_page: מידע העמוד הראשון מהסיווג - הטקסט והטבלאות שלו לא מחולצים שוב
+        """
         if not pdfplumber:
             return {
                 "error": "pdfplumber not installed",
@@ -335,22 +736,33 @@ class InputProcessingAgent(BaseAgent):
         }
 
         warnings = []
+        text_parts = []
 
-        with pdfplumber.open(path) as pdf:
-            content["metadata"]["page_count"] = len(pdf.pages)
+        page_count, pages = self._open_pdf_pages(path, pdf, first_page)
+        content["metadata"]["page_count"] = page_count
 
-            for i, page in enumerate(pdf.pages):
-                # חילוץ טקסט
-                text = page.extract_text() or ""
-                content["full_text"] += f"\n--- עמוד {i+1} ---\n{text}"
-                content["sections"].append({
+        sections_file = None
+        if file_id is not None and page_count > _PDF_STREAM_MIN_PAGES:
+            sections_path = self._normalized_prefix + file_id + ".pages.jsonl"
+            sections_file = open(sections_path, 'wb')
+            content["sections_file"] = sections_path
+
+        try:
+            for i, (text, tables) in enumerate(pages):
+                # טקסט
+                text_parts.append(f"\n--- עמוד {i+1} ---\n")
+                text_parts.append(text)
+                section = {
                     "page": i + 1,
                     "text": text,
                     "char_count": len(text)
-                })
+                }
+                if sections_file is None:
+                    content["sections"].append(section)
+                else:
+                    sections_file.write(json_dumps(section) + b"\n")
 
-                # חילוץ טבלאות
-                tables = page.extract_tables() or []
+                # טבלאות
                 for j, table in enumerate(tables):
                     content["tables"].append({
                         "page": i + 1,
@@ -363,6 +775,11 @@ class InputProcessingAgent(BaseAgent):
                 # בדיקת איכות
                 if len(text) < 50:
                     warnings.append(f"עמוד {i+1}: טקסט מועט - ייתכן שנדרש OCR")
+        finally:
+            if sections_file is not None:
+                sections_file.close()
+
+        content["full_text"] = "".join(text_parts)
 
         return {
             "content": content,
@@ -374,6 +791,76 @@ class InputProcessingAgent(BaseAgent):
             }
         }
 
+    def _open_pdf_pages(
+        self,
+        path: Path,
+        pdf=None,
+        first_page: Optional[Dict] = None
+    ) -> Tuple[int, Iterator[Tuple[str, List]]]:
+        """
+        פתיחת PDF לחילוץ עמוד אחר עמוד
+
+        Args:
+            path: נתיב הקובץ
+            pdf: הקובץ כבר פתוח ב-pdfplumber, אם יש - אחרת נפתח ונסגר כאן
+            first_page: מידע העמוד הראשון, אם כבר חולץ
+
+        Returns:
+            (מספר עמודים, איטרטור של (טקסט, טבלאות) לפי סדר העמודים) -
+            קובץ קטן נקרא בתהליך הנוכחי, קובץ גדול בתהליכים נפרדים
+        """
+        owned = pdf is None
+        if owned:
+            pdf = pdfplumber.open(path)
+        page_count = len(pdf.pages)
+        if page_count < _PDF_PARALLEL_MIN_PAGES or self._pdf_workers < 2:
+            if first_page is None or not page_count:
+                pages = (_extract_page(page) for page in pdf.pages)
+            else:
+                pages = self._iter_after_first_page(pdf, first_page)
+            return page_count, self._iter_pdf_pages(pdf, pages) if owned else pages
+
+        if owned:
+            pdf.close()
+        return page_count, self._iter_pages_parallel(path, page_count)
+
+    @staticmethod
+    def _iter_after_first_page(pdf, first_page: Dict) -> Iterator[Tuple[str, List]]:
+        """העמוד הראשון ממידע הסיווג, ושאר העמודים מחולצים מה-PDF הפתוח"""
+        yield first_page["text"], first_page["tables"]
+        for page in pdf.pages[1:]:
+            yield _extract_page(page)
+
+    @staticmethod
+    def _iter_pdf_pages(pdf, pages: Iterator[Tuple[str, List]]) -> Iterator[Tuple[str, List]]:
+        """מעבר על עמודי PDF שנפתח כאן (נסגר בסוף המעבר)"""
+        with pdf:
+            yield from pages
+
+    def _iter_pages_parallel(self, path: Path, page_count: int) -> Iterator[Tuple[str, List]]:
+        """
+        חילוץ עמודי PDF במקביל - טווחי עמודים לתהליכים נפרדים, מוחזרים לפי הסדר
+
+        כל טווח משתחרר מהזיכרון אחרי שנצרך.
+
+        Args:
+            path: נתיב קובץ ה-PDF
+            page_count: מספר העמודים
+        """
+        if self._pdf_pool is None:
+            self._pdf_pool = ProcessPoolExecutor(
+                max_workers=self._pdf_workers, mp_context=_process_pool_context()
+            )
+
+        chunk = max(1, page_count // (self._pdf_workers * 2))
+        futures = deque(
+            self._pdf_pool.submit(_extract_page_range, str(path), start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        )
+
+        while futures:
+            yield from futures.popleft().result()
+
     def _process_text(self, path: Path, encoding: str) -> Dict:
         """עיבוד קובץ טקסט"""
         with open(path, 'r', encoding=encoding, errors='replace') as f:
@@ -383,7 +870,7 @@ class InputProcessingAgent(BaseAgent):
             "content": {
                 "full_text": text,
                 "line_count": text.count('\n') + 1,
-                "word_count": len(text.split()),
+                "word_count": _count_words(text),
                 "char_count": len(text)
             },
             "quality_report": {
@@ -395,10 +882,17 @@ class InputProcessingAgent(BaseAgent):
 
     def _process_json(self, path: Path) -> Dict:
         """עיבוד קובץ JSON"""
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        raw = path.read_bytes()
+        try:
+            data = json_loads(raw)
+            stdlib = False
+        except ValueError:
+            # NaN/Infinity או מספר שלם גדול - רק json מפענח, וגם יקודד בשמירה
+            data = json.loads(raw.decode('utf-8'))
+            stdlib = True
 
         return {
+            "_stdlib_json": stdlib,
             "content": {
                 "data": data,
                 "type": type(data).__name__,
@@ -413,16 +907,10 @@ class InputProcessingAgent(BaseAgent):
 
     def _process_csv(self, path: Path, encoding: str) -> Dict:
         """עיבוד קובץ CSV"""
-        import csv
-
-        rows = []
         with open(path, 'r', encoding=encoding, errors='replace') as f:
             reader = csv.reader(f)
-            for row in reader:
-                rows.append(row)
-
-        headers = rows[0] if rows else []
-        data = rows[1:] if len(rows) > 1 else []
+            headers = next(reader, [])
+            data = list(reader)
 
         return {
             "content": {
@@ -470,27 +958,33 @@ class InputProcessingAgent(BaseAgent):
 
     def _save_result(self, file_id: str, result: Dict, output_format: str):
         """שמירת תוצאת עיבוד"""
-        # שמירה כ-JSON
-        json_file = self.output_dir / "normalized" / f"{file_id}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-
-        # שמירת דוח
-        self._save_processing_report(file_id, result)
+        # שמירה כ-JSON - בקידוד שבו פוענח הקלט (ראו _process_json)
+        stdlib = result.pop("_stdlib_json", False)
+        with open(self._normalized_prefix + file_id + ".json", 'wb') as f:
+            f.write(_json_dumps_lenient(result, stdlib))
+
+        # שמירת דוח - ברקע, מחוץ לנתיב העיבוד. עותק רדוד: הקורא מקבל את result
+        # ועשוי לשנות אותו לפני שהדוח נכתב
+        future = self._io_pool.submit(self._save_processing_report, file_id, dict(result))
+        future.add_done_callback(self._log_report_error)
+
+    def _log_report_error(self, future: Future):
+        """רישום שגיאה בכתיבת דוח שרץ ברקע"""
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"Failed to write processing report: {error}")
 
     def _save_processing_report(self, file_id: str, result: Dict):
         """שמירת דוח עיבוד"""
-        report_file = self.output_dir / "reports" / f"{file_id}_report.md"
+        report_file = self._reports_prefix + file_id + "_report.md"
 
         classification = result.get("classification", {})
         quality = result.get("quality_report", {})
-        content = result.get("content", {})
+        content = result.get("content") or {}
 
-        status_emoji = {"success": "", "partial": "", "failed": ""}.get(
-            result.get("status", ""), ""
-        )
+        status_emoji = _STATUS_EMOJI.get(result.get("status", ""), "")
 
-        report = f"""# דוח עיבוד - {Path(result.get('source_file', '')).name}
+        parts = [f"""# דוח עיבוד - {Path(result.get('source_file', '')).name}
 
 ## סיכום
 - **מזהה:** {file_id}
@@ -508,18 +1002,17 @@ class InputProcessingAgent(BaseAgent):
 
 ## איכות
 - **ציון ביטחון:** {quality.get('confidence_score', 0):.0%}
-"""
+"""]
 
         if quality.get('warnings'):
-            report += "\n### אזהרות \n"
-            for w in quality['warnings']:
-                report += f"- {w}\n"
+            parts.append("\n### אזהרות \n")
+            parts.extend(f"- {w}\n" for w in quality['warnings'])
 
         if result.get('error'):
-            report += f"\n### שגיאות \n{result['error']}\n"
+            parts.append(f"\n### שגיאות \n{result['error']}\n")
 
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
+            f.write("".join(parts))
 
     def _record_processing(self, result: Dict):
         """רישום עיבוד בהיסטוריה"""
@@ -531,7 +1024,7 @@ class InputProcessingAgent(BaseAgent):
             "processing_time": result.get("processing_time_seconds")
         }
         self.processing_history.append(record)
-        self._save_processing_history()
+        self._append_processing_history(record)
 
     def validate_content(self, content: Dict) -> Dict:
         """
@@ -552,20 +1045,23 @@ class InputProcessingAgent(BaseAgent):
             issues.append({"type": "empty_content", "severity": "error"})
             score *= 0
 
-        # בדיקת תווים בעייתיים
-        problematic_chars = ['\x00', '\ufffd']
-        for char in problematic_chars:
-            if char in text:
-                issues.append({"type": "problematic_chars", "char": repr(char), "severity": "warning"})
-                score *= 0.9
+        # בדיקת תווים בעייתיים - מעבר אחד על טקסט תקין; רק אם נמצא תו
+        # בעייתי בודקים (מהמופע הראשון והלאה) אילו מהם מופיעים
+        match = _BAD_CHARS_RE.search(text) if text else None
+        if match is not None:
+            for char in _PROBLEMATIC_CHARS:
+                if text.find(char, match.start()) != -1:
+                    issues.append({"type": "problematic_chars", "char": repr(char), "severity": "warning"})
+                    score *= 0.9
 
         # בדיקת עקביות טבלאות
         tables = content.get("tables", [])
         for i, table in enumerate(tables):
-            if not table.get("data"):
+            data = table.get("data")
+            if not data:
                 continue
-            col_counts = [len(row) for row in table["data"]]
-            if len(set(col_counts)) > 1:
+            first = len(data[0])
+            if any(len(row) != first for row in data):
                 issues.append({
                     "type": "inconsistent_table",
                     "table_index": i,
@@ -598,6 +1094,17 @@ class InputProcessingAgent(BaseAgent):
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def close(self):
+        """המתנה לדוחות שבתור, סגירת מאגרי ה-threads/התהליכים ויומן ההיסטוריה"""
+        self._io_pool.shutdown(wait=True)
+        if self._pdf_pool is not None:
+            self._pdf_pool.shutdown(wait=True)
+            self._pdf_pool = None
+        if self._history_log is not None:
+            self._history_log.close()
+            self._history_log = None
+        super().close()
+
     def get_status(self) -> Dict[str, Any]:
         """קבלת סטטוס הסוכן"""
         recent = self.processing_history[-10:] if self.processing_history else []
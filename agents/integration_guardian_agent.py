@@ -9,13 +9,209 @@ import os
 import re
 import ast
 import json
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple, Union
 from pathlib import Path
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
-from .base_agent import BaseAgent, DOCS_DIR, PROJECT_ROOT
+from .base_agent import (
+    BaseAgent, DOCS_DIR, PROJECT_ROOT, _DATACLASS_SLOTS, _process_pool_context
+)
+
+
+# מספר הקבצים המרבי שנרשם לכל קטגוריה במבנה הפרויקט
+_STRUCTURE_FILES_LIMIT = 20
+
+# מספר הקבצים לניתוח שמעליו אינדקס הייבוא נבנה בתהליכים נפרדים
+_INDEX_PARALLEL_MIN_FILES = 64
+
+# עומק ברירת המחדל של תלויים עקיפים בשינוי ממשק (מחיקה / שינוי שם)
+_IMPACT_MAX_DEPTH = 3
+
+# מילים בנתיב שמסמנות קובץ API / קובץ DB
+_API_INDICATORS = ('api', 'routes', 'endpoints', 'views', 'handlers')
+_DB_INDICATORS = ('models', 'schema', 'migration', 'database', 'db')
+
+# מספר ניתוחי קבצים (_FileAnalysis) שנשמרים בזיכרון
+_ANALYSIS_CACHE_SIZE = 512
+
+
+class _FileAnalysis:
+    """
+    מעבר יחיד על AST של קובץ שאוסף את כל מה שהסוכן קורא ממנו
+
+    לולאת ast.walk אחת עם בחירה לפי סוג הצומת - מהירה פי 3 מ-ast.NodeVisitor
+    (שקורא למתודה לכל צומת). בסדר המעבר לרוחב, בשמות פונקציה כפולים נשמרת
+    החתימה העמוקה ביותר.
+
+    Attributes:
+        signatures: חתימות פונקציות לפי שם (def רגיל, כולל מתודות)
+        modules: שם מלא לכל import; ב-import יחסי עם נקודות מובילות (".base_agent")
+        names: כל רכיב בשמות המודולים והשמות שמיובאים מהם - "from agents.base_agent
+            import BaseAgent" נותן agents, base_agent ו-BaseAgent, כך שאפשר למצוא
+            מייבאים לפי שם קובץ (stem) גם של מודול בתוך חבילה
+        endpoints: נתיבי Flask/FastAPI מהמעצבים של הפונקציות
+        tables: מחלקות SQLAlchemy (יורשות מ-Base או מ-db.Model)
+    """
+
+    __slots__ = ("signatures", "modules", "names", "endpoints", "tables")
+
+    # מעצבי endpoints: אובייקט -> מתודות
+    _ROUTE_DECORATORS = {
+        "app": {"get", "post", "put", "delete", "patch"},
+        "router": {"get", "post", "put", "delete", "patch"},
+        "blueprint": {"route"},
+    }
+
+    def __init__(self, tree: ast.AST):
+        self.signatures: Dict[str, Dict] = {}
+        self.modules: List[str] = []
+        self.names: Set[str] = set()
+        self.endpoints: List[str] = []
+        self.tables: List[str] = []
+
+        for node in ast.walk(tree):
+            node_type = type(node)
+            if node_type is ast.FunctionDef:
+                args = node.args
+                self.signatures[node.name] = {
+                    "args": [arg.arg for arg in args.args],
+                    "defaults_count": len(args.defaults),
+                    "has_vararg": args.vararg is not None,
+                    "has_kwarg": args.kwonlyargs is not None
+                }
+                if node.decorator_list:
+                    self._record_endpoints(node)
+            elif node_type is ast.AsyncFunctionDef:
+                if node.decorator_list:
+                    self._record_endpoints(node)
+            elif node_type is ast.ClassDef:
+                self._record_table(node)
+            elif node_type is ast.Import:
+                for alias in node.names:
+                    self.modules.append(alias.name)
+                    self.names.update(alias.name.split("."))
+            elif node_type is ast.ImportFrom:
+                self.modules.append("." * node.level + (node.module or ""))
+                if node.module:
+                    self.names.update(node.module.split("."))
+                self.names.update(alias.name for alias in node.names)
+
+    def _record_endpoints(self, node):
+        """נתיבים מ-@app.get("/x") / @router.post(...) / @blueprint.route(...)"""
+        for decorator in node.decorator_list:
+            if not (isinstance(decorator, ast.Call) and decorator.args
+                    and isinstance(decorator.func, ast.Attribute)
+                    and isinstance(decorator.func.value, ast.Name)):
+                continue
+            methods = self._ROUTE_DECORATORS.get(decorator.func.value.id)
+            route = decorator.args[0]
+            if (methods and decorator.func.attr in methods
+                    and isinstance(route, ast.Constant) and isinstance(route.value, str)):
+                self.endpoints.append(route.value)
+
+    def _record_table(self, node: ast.ClassDef):
+        """מחלקה שאחד מבסיסיה הוא Base / *Base / db.Model"""
+        for base in node.bases:
+            base_name = ast.unparse(base)
+            if "Base" in base_name or "db.Model" in base_name:
+                self.tables.append(node.name)
+                return
+
+
+# ניתוחים אחרונים לפי SHA-256 של הקוד (כמו ב-file_manifest) - המטמון מחזיק
+# digest של 32 בתים וניתוח לכל קובץ, לא את טקסט הקובץ עצמו
+_analysis_cache: "OrderedDict[bytes, _FileAnalysis]" = OrderedDict()
+
+
+def _analyze_source(source: str) -> _FileAnalysis:
+    """
+    ניתוח קוד Python במעבר אחד, שמור לפי SHA-256 של הקוד
+
+    בדיקה חוזרת של אותו קוד (למשל בהרצות חוזרות של check_compatibility)
+    לא מנתחת אותו שוב. התוצאה משותפת בין הקריאות - אין לשנות אותה.
+
+    Raises:
+        SyntaxError: אם הקוד לא תקין (שגיאות לא נשמרות)
+    """
+    key = hashlib.sha256(source.encode('utf-8', 'surrogatepass')).digest()
+    try:
+        analysis = _analysis_cache[key]
+        _analysis_cache.move_to_end(key)
+        return analysis
+    except KeyError:
+        pass
+
+    analysis = _analysis_cache[key] = _FileAnalysis(ast.parse(source))
+    if len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+    return analysis
+
+
+def _iter_files(path: str) -> Iterator[os.DirEntry]:
+    """
+    מעבר רקורסיבי על הקבצים בתיקייה עם os.scandir
+
+    DirEntry שומר את סוג הרשומה מקריאת התיקייה, כך שאין stat נוסף לכל קובץ
+    (כמו ב-Path.rglob ואחריו is_file). תיקייה שהיא קישור סמלי לא נסרקת
+    (כמו ב-rglob), ותיקייה שלא ניתן לקרוא מדולגת.
+
+    Args:
+        path: התיקייה לסריקה
+
+    Yields:
+        DirEntry לכל קובץ, כולל קישורים סמליים לקבצים
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_files(entry.path)
+                elif entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
+
+def _manifest_record(path: str, previous: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    רשומת manifest לקובץ Python (פונקציה ברמת המודול - רצה גם בתהליכי עבודה)
+
+    Args:
+        path: נתיב הקובץ
+        previous: הרשומה הקודמת של הקובץ, אם יש
+
+    Returns:
+        {"mtime_ns", "size", "sha256", "imports"} - הרשומה הקודמת אם הקובץ
+        לא השתנה, או None אם לא ניתן לקרוא אותו
+    """
+    try:
+        st = os.stat(path)
+        if (previous is not None and previous.get("mtime_ns") == st.st_mtime_ns
+                and previous.get("size") == st.st_size):
+            return previous
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if previous is not None and previous.get("sha256") == sha256:
+            imports = previous["imports"]
+        elif b"import" not in data:
+            # בלי המילה import אין ייבוא - חיפוש בתים מהיר במקום פענוח וניתוח
+            imports = []
+        else:
+            # ast.parse מקבל את הבתים ישירות - בלי העתק str של כל הקובץ
+            imports = sorted(IntegrationGuardianAgent._import_names(data))
+    except Exception:
+        return None
+
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha256, "imports": imports}
 
 
 class RiskLevel(Enum):
@@ -34,9 +230,9 @@ class ChangeType(Enum):
     RENAME = "rename"
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ProjectTechnology:
-    """מידע על טכנולוגיה בפרויקט"""
+    """מידע על טכנולוגיה בפרויקט (קבוע - זיהוי יוצר עותק עם detected/version)"""
     name: str
     type: str  # backend, frontend, database, mobile
     config_file: str
@@ -44,11 +240,11 @@ class ProjectTechnology:
     version: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ImpactAnalysis:
     """ניתוח השפעה"""
     direct_files: List[str] = field(default_factory=list)
-    indirect_files: List[str] = field(default_factory=list)
+    indirect_files: Set[str] = field(default_factory=set)
     api_endpoints: List[str] = field(default_factory=list)
     db_tables: List[str] = field(default_factory=list)
     ui_components: List[str] = field(default_factory=list)
@@ -92,17 +288,46 @@ class IntegrationGuardianAgent(BaseAgent):
         "app.json": ProjectTechnology("React Native", "mobile", "app.json"),
     }
 
+    # תיקיות ברמה העליונה של הפרויקט -> קטגוריה במבנה הפרויקט
+    CATEGORY_MAP = {
+        "src": "src", "app": "src",
+        "components": "components",
+        "api": "api", "routes": "api", "endpoints": "api",
+        "lib": "lib", "utils": "lib", "helpers": "lib",
+        "prisma": "db", "db": "db", "database": "db", "models": "db",
+        "tests": "tests", "test": "tests", "__tests__": "tests",
+    }
+
     # דפוסים לזיהוי תלויות
     IMPORT_PATTERNS = {
         "python": r'^(?:from|import)\s+([\w.]+)',
         "javascript": r'(?:import|require)\s*\(?[\'"]([^"\']+)[\'"]',
     }
 
+    # דפוסים מקומפלים - פעם אחת בטעינת המחלקה ולא בכל קריאה
+    _IMPORT_RE = re.compile(IMPORT_PATTERNS["python"], re.MULTILINE)
+    # שורות import (גם מוזחות) והמילים שבהן, לחיפוש תלויים לפי שם מודול
+    _IMPORT_LINE_RE = re.compile(r'^[ \t]*(?:from|import)[ \t]+(.+)$', re.MULTILINE)
+    _WORD_RE = re.compile(r'\w+')
+    # דפוסי Flask/FastAPI
+    _ENDPOINT_RES = tuple(re.compile(p) for p in [
+        r'@app\.(?:get|post|put|delete|patch)\s*\(["\']([^"\']+)',
+        r'@router\.(?:get|post|put|delete|patch)\s*\(["\']([^"\']+)',
+        r'@blueprint\.route\s*\(["\']([^"\']+)',
+    ])
+    # דפוסי SQLAlchemy
+    _TABLE_RE = re.compile(r'class\s+(\w+)\s*\([^)]*(?:Base|db\.Model)')
+
     def __init__(self, config: Optional[Dict] = None):
         super().__init__("integration_guardian", config)
         self.detected_technologies: List[ProjectTechnology] = []
         self.file_dependencies: Dict[str, Set[str]] = {}
         self.api_contracts: Dict[str, Dict] = {}
+        # אינדקס ייבוא הפוך של PROJECT_ROOT: לכל שם - הקבצים שמייבאים אותו.
+        # נבנה בחיפוש התלויים הראשון, מתוך state["file_manifest"]
+        self._import_graph: Optional[Dict[str, Set[str]]] = None
+        # תהליכים לניתוח הקבצים בבניית האינדקס (ast.parse לא משתחרר מה-GIL)
+        self._index_workers = self.config.get("index_workers", os.cpu_count() or 1)
         self._init_state()
 
     def _init_state(self):
@@ -131,7 +356,8 @@ class IntegrationGuardianAgent(BaseAgent):
         elif action == "analyze_impact":
             return self.analyze_impact(
                 kwargs.get("files", []),
-                kwargs.get("change_type", ChangeType.MODIFY)
+                kwargs.get("change_type", ChangeType.MODIFY),
+                kwargs.get("max_depth")
             )
         elif action == "check_compatibility":
             return self.check_backward_compatibility(
@@ -158,12 +384,17 @@ class IntegrationGuardianAgent(BaseAgent):
             "summary": {}
         }
 
-        # זיהוי טכנולוגיות
-        for config_file, tech in self.TECH_DETECTORS.items():
+        # זיהוי טכנולוגיות - תבניות TECH_DETECTORS משותפות ולא משתנות; כל סריקה
+        # מחליפה את רשימת הטכנולוגיות שזוהו
+        self.detected_technologies = []
+        for config_file, template in self.TECH_DETECTORS.items():
             config_path = path / config_file
             if config_path.exists():
-                tech.detected = True
-                tech.version = self._extract_version(config_path, tech.name)
+                tech = replace(
+                    template,
+                    detected=True,
+                    version=self._extract_version(config_path, template.name)
+                )
                 self.detected_technologies.append(tech)
 
                 result["technologies"][tech.type] = result["technologies"].get(tech.type, [])
@@ -176,6 +407,10 @@ class IntegrationGuardianAgent(BaseAgent):
         # סריקת מבנה תיקיות
         result["structure"] = self._scan_directory_structure(path)
 
+        # אינדקס הייבוא נבנה מחדש בחיפוש התלויים הבא
+        if path == PROJECT_ROOT:
+            self._import_graph = None
+
         # סיכום
         result["summary"] = {
             "backend": self._get_backend_summary(),
@@ -185,7 +420,8 @@ class IntegrationGuardianAgent(BaseAgent):
         }
 
         # שמירה למצב
-        self.state["project_scan"] = result
+        with self.mutate_state() as state:
+            state["project_scan"] = result
         self.save_state()
 
         self.log_action("scan_project", {"path": str(path), "technologies_found": len(self.detected_technologies)})
@@ -213,7 +449,7 @@ class IntegrationGuardianAgent(BaseAgent):
         return None
 
     def _scan_directory_structure(self, path: Path) -> Dict[str, List[str]]:
-        """סריקת מבנה תיקיות"""
+        """סריקת מבנה תיקיות (עד 20 קבצים לקטגוריה - הסריקה נעצרת שם)"""
         structure = {
             "src": [],
             "components": [],
@@ -223,23 +459,24 @@ class IntegrationGuardianAgent(BaseAgent):
             "tests": []
         }
 
-        for item in path.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                if item.name in ['src', 'app']:
-                    structure["src"] = [str(f.relative_to(path)) for f in item.rglob("*") if f.is_file()][:20]
-                elif item.name == 'components':
-                    structure["components"] = [str(f.relative_to(path)) for f in item.rglob("*") if f.is_file()][:20]
-                elif item.name in ['api', 'routes', 'endpoints']:
-                    structure["api"] = [str(f.relative_to(path)) for f in item.rglob("*") if f.is_file()][:20]
-                elif item.name in ['lib', 'utils', 'helpers']:
-                    structure["lib"] = [str(f.relative_to(path)) for f in item.rglob("*") if f.is_file()][:20]
-                elif item.name in ['prisma', 'db', 'database', 'models']:
-                    structure["db"] = [str(f.relative_to(path)) for f in item.rglob("*") if f.is_file()][:20]
-                elif item.name in ['tests', 'test', '__tests__']:
-                    structure["tests"] = [str(f.relative_to(path)) for f in item.rglob("*") if f.is_file()][:20]
+        # מעבר אחד על הרמה העליונה; כל תיקייה מוכרת נסרקת עד למגבלת הקבצים
+        with os.scandir(path) as entries:
+            for entry in entries:
+                category = self.CATEGORY_MAP.get(entry.name)
+                if category is not None and entry.is_dir():
+                    structure[category] = self._collect_files(entry.path, path)
 
         return structure
 
+    @staticmethod
+    def _collect_files(directory: str, root: Path) -> List[str]:
+        """עד _STRUCTURE_FILES_LIMIT קבצים מתיקייה, כנתיבים יחסיים לשורש"""
+        prefix = os.path.join(str(root), "")
+        return [
+            entry.path[len(prefix):]
+            for entry in islice(_iter_files(directory), _STRUCTURE_FILES_LIMIT)
+        ]
+
     def _get_backend_summary(self) -> Dict[str, Any]:
         """סיכום backend"""
         backend_tech = [t for t in self.detected_technologies if t.type == "backend"]
@@ -274,10 +511,31 @@ class IntegrationGuardianAgent(BaseAgent):
     def analyze_impact(
         self,
         files: List[str],
-        change_type: ChangeType = ChangeType.MODIFY
+        change_type: ChangeType = ChangeType.MODIFY,
+        max_depth: Optional[int] = None
     ) -> Dict[str, Any]:
-        """ניתוח השפעה לפני שינוי"""
+        """
+        ניתוח השפעה לפני שינוי
+
+        Args:
+            files: הקבצים שמשתנים
+            change_type: סוג השינוי
+            max_depth: עומק התלויים העקיפים (1 - רק מי שמייבא ישירות). ברירת
+                מחדל: מחיקה ושינוי שם משנים את הממשק ומתפשטים עד
+                _IMPACT_MAX_DEPTH; שינוי מימוש והוספה נעצרים בעומק 1
+
+        Returns:
+            קבצים מושפעים, endpoints, טבלאות, רמת סיכון ו-breaking changes
+        """
+        if max_depth is None:
+            max_depth = (
+                _IMPACT_MAX_DEPTH if change_type in (ChangeType.DELETE, ChangeType.RENAME) else 1
+            )
+
         impact = ImpactAnalysis()
+        # שלב ראשון: מי שמייבא ישירות; שלב שני: BFS חסום לעומק max_depth
+        visited = {self._project_relpath(f) for f in files}
+        frontier = deque()
 
         for file_path in files:
             # קבצים מושפעים ישירות
@@ -285,7 +543,11 @@ class IntegrationGuardianAgent(BaseAgent):
 
             # מציאת קבצים תלויים
             dependents = self._find_dependents(file_path)
-            impact.indirect_files.extend(dependents)
+            impact.indirect_files.update(dependents)
+            for dependent in dependents:
+                if dependent not in visited:
+                    visited.add(dependent)
+                    frontier.append((dependent, 1))
 
             # בדיקת API endpoints
             if self._is_api_file(file_path):
@@ -297,8 +559,19 @@ class IntegrationGuardianAgent(BaseAgent):
                 tables = self._extract_tables(file_path)
                 impact.db_tables.extend(tables)
 
-        # הסרת כפילויות
-        impact.indirect_files = list(set(impact.indirect_files) - set(impact.direct_files))
+        # תלויים עקיפים - כל קובץ נבדק פעם אחת
+        while frontier:
+            rel_path, depth = frontier.popleft()
+            if depth >= max_depth:
+                continue
+            for dependent in self._module_dependents(Path(rel_path).stem, rel_path):
+                if dependent not in visited:
+                    visited.add(dependent)
+                    impact.indirect_files.add(dependent)
+                    frontier.append((dependent, depth + 1))
+
+        # קבצים ישירים לא נספרים גם כעקיפים
+        impact.indirect_files.difference_update(impact.direct_files)
 
         # חישוב רמת סיכון
         impact.risk_level = self._calculate_risk_level(impact, change_type)
@@ -308,7 +581,7 @@ class IntegrationGuardianAgent(BaseAgent):
 
         result = {
             "direct_files": impact.direct_files,
-            "indirect_files": impact.indirect_files,
+            "indirect_files": sorted(impact.indirect_files),
             "api_endpoints": impact.api_endpoints,
             "db_tables": impact.db_tables,
             "ui_components": impact.ui_components,
@@ -325,39 +598,149 @@ class IntegrationGuardianAgent(BaseAgent):
         return result
 
     def _find_dependents(self, file_path: str) -> List[str]:
-        """מציאת קבצים שתלויים בקובץ נתון"""
-        dependents = []
-        file_path = Path(file_path)
+        """
+        מציאת קבצים שתלויים בקובץ נתון
 
-        if not file_path.exists():
-            return dependents
+        חיפוש באינדקס הייבוא ההפוך - בלי קריאת קבצים. האינדקס משקף את הקבצים
+        מאז scan_project האחרון, ומתעדכן לקבצים שמדווחים ב-validate_change
+        וב-generate_change_report.
 
-        # שם המודול
-        module_name = file_path.stem
+        Returns:
+            נתיבים יחסיים ל-PROJECT_ROOT של קבצים שמייבאים את המודול, ממוינים
+        """
+        if not os.path.exists(file_path):
+            return []
 
-        # חיפוש קבצים שמייבאים את המודול
-        for py_file in PROJECT_ROOT.rglob("*.py"):
-            if py_file == file_path:
-                continue
+        return self._module_dependents(Path(file_path).stem, self._project_relpath(file_path))
 
-            try:
-                content = py_file.read_text(encoding='utf-8')
-                if re.search(rf'(?:from|import)\s+.*{module_name}', content):
-                    dependents.append(str(py_file.relative_to(PROJECT_ROOT)))
-            except Exception:
-                pass
+    def _module_dependents(self, module_name: str, skip: Optional[str] = None) -> List[str]:
+        """הקבצים שמייבאים שם מודול, לפי האינדקס (בלי skip), ממוינים"""
+        return sorted(
+            f for f in self._get_import_graph().get(module_name, ()) if f != skip
+        )
+
+    def _get_import_graph(self) -> Dict[str, Set[str]]:
+        """
+        האינדקס ההפוך (שם -> קבצים מייבאים), נבנה במעבר אחד על קבצי ה-py
+
+        state["file_manifest"] שומר לכל קובץ זמן שינוי, גודל, SHA-256 ושמות
+        import: קובץ שזמן השינוי והגודל שלו לא השתנו לא נקרא, וקובץ שתוכנו
+        זהה (אותו SHA-256) לא מנותח מחדש. בלי שינויים הבנייה היא stat לכל קובץ.
+        """
+        if self._import_graph is None:
+            prefix = os.path.join(str(PROJECT_ROOT), "")
+            previous = self.state.get("file_manifest", {})
+            manifest = {}
+            stale = []
+            for entry in _iter_files(str(PROJECT_ROOT)):
+                if not entry.name.endswith('.py'):
+                    continue
+                rel_path = entry.path[len(prefix):]
+                record = previous.get(rel_path)
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if (record is not None and record.get("mtime_ns") == st.st_mtime_ns
+                        and record.get("size") == st.st_size):
+                    manifest[rel_path] = record
+                else:
+                    stale.append((rel_path, entry.path, record))
+
+            # קריאה וניתוח של הקבצים שהשתנו - בתהליכים נפרדים כשהם רבים
+            paths = [path for _, path, _ in stale]
+            records = [record for _, _, record in stale]
+            if len(stale) >= _INDEX_PARALLEL_MIN_FILES and self._index_workers > 1:
+                with ProcessPoolExecutor(
+                    max_workers=self._index_workers, mp_context=_process_pool_context()
+                ) as pool:
+                    results = list(pool.map(_manifest_record, paths, records, chunksize=32))
+            else:
+                results = list(map(_manifest_record, paths, records))
+            for (rel_path, _, _), record in zip(stale, results):
+                if record is not None:
+                    manifest[rel_path] = record
+
+            graph: Dict[str, Set[str]] = {}
+            for rel_path, record in manifest.items():
+                for name in record["imports"]:
+                    graph.setdefault(name, set()).add(rel_path)
+            self._import_graph = graph
+
+            if manifest != previous:
+                with self.mutate_state() as state:
+                    state["file_manifest"] = manifest
+                self.save_state()
+
+        return self._import_graph
+
+    def _project_relpath(self, file_path: str) -> Optional[str]:
+        """נתיב יחסי ל-PROJECT_ROOT, או None אם הקובץ מחוץ לפרויקט"""
+        path = os.path.abspath(file_path)
+        prefix = os.path.join(os.path.abspath(str(PROJECT_ROOT)), "")
+        return path[len(prefix):] if path.startswith(prefix) else None
+
+    def _invalidate_files(self, files: List[str]):
+        """
+        עדכון אינדקס הייבוא לקבצים שהשתנו, נוספו או נמחקו
 
-        return dependents
+        Args:
+            files: נתיבי הקבצים (מוחלטים, או יחסיים לתיקייה הנוכחית)
+        """
+        if self._import_graph is None:
+            return
+
+        for file_path in files:
+            rel_path = self._project_relpath(file_path)
+            if rel_path is None or not rel_path.endswith('.py'):
+                continue
 
-    def _is_api_file(self, file_path: str) -> bool:
-        """בדיקה אם קובץ הוא חלק מ-API"""
-        indicators = ['api', 'routes', 'endpoints', 'views', 'handlers']
-        return any(ind in file_path.lower() for ind in indicators)
+            with self.mutate_state() as state:
+                manifest = state.setdefault("file_manifest", {})
+                old_record = manifest.pop(rel_path, None)
+            for name in old_record["imports"] if old_record else ():
+                importers = self._import_graph.get(name)
+                if importers is not None:
+                    importers.discard(rel_path)
+
+            record = _manifest_record(os.path.join(str(PROJECT_ROOT), rel_path))
+            if record is not None:
+                with self.mutate_state():
+                    manifest[rel_path] = record
+                for name in record["imports"]:
+                    self._import_graph.setdefault(name, set()).add(rel_path)
+
+    @classmethod
+    def _import_names(cls, content: Union[str, bytes]) -> Set[str]:
+        """
+        השמות שקובץ מייבא (מודולים, חבילות ושמות מיובאים)
 
-    def _is_db_file(self, file_path: str) -> bool:
-        """בדיקה אם קובץ קשור ל-DB"""
-        indicators = ['models', 'schema', 'migration', 'database', 'db']
-        return any(ind in file_path.lower() for ind in indicators)
+        לפי ה-AST, כך ש-import בתוך מחרוזת או הערה לא נספר. קובץ שלא ניתן
+        לנתח - כל המילים בשורות ה-import שלו.
+
+        Args:
+            content: תוכן הקובץ; בתים מנותחים ישירות לפי הצהרת ה-coding (PEP 263)
+        """
+        try:
+            return _FileAnalysis(ast.parse(content)).names
+        except (SyntaxError, ValueError):
+            if isinstance(content, bytes):
+                content = content.decode('utf-8', errors='replace')
+            return set(cls._WORD_RE.findall(" ".join(cls._IMPORT_LINE_RE.findall(content))))
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_api_file(file_path: str) -> bool:
+        """בדיקה אם קובץ הוא חלק מ-API (שמור לפי נתיב)"""
+        lowered = file_path.lower()
+        return any(ind in lowered for ind in _API_INDICATORS)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_db_file(file_path: str) -> bool:
+        """בדיקה אם קובץ קשור ל-DB (שמור לפי נתיב)"""
+        lowered = file_path.lower()
+        return any(ind in lowered for ind in _DB_INDICATORS)
 
     def _extract_endpoints(self, file_path: str) -> List[str]:
         """חילוץ endpoints מקובץ API"""
@@ -369,16 +752,12 @@ class IntegrationGuardianAgent(BaseAgent):
 
         try:
             content = path.read_text(encoding='utf-8')
-            # דפוסי Flask/FastAPI
-            patterns = [
-                r'@app\.(?:get|post|put|delete|patch)\s*\(["\']([^"\']+)',
-                r'@router\.(?:get|post|put|delete|patch)\s*\(["\']([^"\']+)',
-                r'@blueprint\.route\s*\(["\']([^"\']+)',
-            ]
-
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                endpoints.extend(matches)
+            try:
+                endpoints.extend(_analyze_source(content).endpoints)
+            except (SyntaxError, ValueError):
+                # לא Python תקין - חיפוש טקסטואלי
+                for pattern in self._ENDPOINT_RES:
+                    endpoints.extend(pattern.findall(content))
 
         except Exception:
             pass
@@ -395,10 +774,11 @@ class IntegrationGuardianAgent(BaseAgent):
 
         try:
             content = path.read_text(encoding='utf-8')
-            # דפוסי SQLAlchemy
-            pattern = r'class\s+(\w+)\s*\([^)]*(?:Base|db\.Model)'
-            matches = re.findall(pattern, content)
-            tables.extend(matches)
+            try:
+                tables.extend(_analyze_source(content).tables)
+            except (SyntaxError, ValueError):
+                # לא Python תקין - חיפוש טקסטואלי
+                tables.extend(self._TABLE_RE.findall(content))
 
         except Exception:
             pass
@@ -472,11 +852,8 @@ class IntegrationGuardianAgent(BaseAgent):
         warnings = []
 
         try:
-            old_tree = ast.parse(old_code)
-            new_tree = ast.parse(new_code)
-
-            old_functions = self._extract_function_signatures(old_tree)
-            new_functions = self._extract_function_signatures(new_tree)
+            old_functions = _analyze_source(old_code).signatures
+            new_functions = _analyze_source(new_code).signatures
 
             # בדיקת פונקציות שהוסרו
             for func_name in old_functions:
@@ -500,22 +877,6 @@ class IntegrationGuardianAgent(BaseAgent):
             "recommendation": "Proceed with changes" if not issues else "Review breaking changes before proceeding"
         }
 
-    def _extract_function_signatures(self, tree: ast.AST) -> Dict[str, Dict]:
-        """חילוץ חתימות פונקציות"""
-        signatures = {}
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                args = node.args
-                signatures[node.name] = {
-                    "args": [arg.arg for arg in args.args],
-                    "defaults_count": len(args.defaults),
-                    "has_vararg": args.vararg is not None,
-                    "has_kwarg": args.kwonlyargs is not None
-                }
-
-        return signatures
-
     def _compare_signatures(self, func_name: str, old_sig: Dict, new_sig: Dict) -> List[str]:
         """השוואת חתימות פונקציות"""
         issues = []
@@ -537,7 +898,14 @@ class IntegrationGuardianAgent(BaseAgent):
         return issues
 
     def validate_change(self, change_plan: Dict) -> Dict[str, Any]:
-        """אימות תכנית שינוי"""
+        """
+        אימות תכנית שינוי
+
+        Args:
+            change_plan: files, db_changes, migration, api_changes, types_updated.
+                עם max_depth (ו-change_type אופציונלי, למשל "modify") מצורף גם
+                ניתוח השפעה עד העומק הזה תחת "impact"
+        """
         validation = {
             "valid": True,
             "checks": [],
@@ -551,6 +919,17 @@ class IntegrationGuardianAgent(BaseAgent):
                 validation["errors"].append(f"File not found: {file_path}")
                 validation["valid"] = False
 
+        # הקבצים בתכנית עשויים להשתנות - רענון האינדקס שלהם
+        self._invalidate_files(change_plan.get("files", []))
+
+        # ניתוח השפעה עם תלויים עקיפים עד העומק המבוקש
+        if change_plan.get("max_depth") is not None:
+            validation["impact"] = self.analyze_impact(
+                change_plan.get("files", []),
+                ChangeType(change_plan.get("change_type", ChangeType.MODIFY.value)),
+                change_plan["max_depth"]
+            )
+
         # בדיקת migration אם יש שינויי DB
         if change_plan.get("db_changes") and not change_plan.get("migration"):
             validation["warnings"].append("DB changes detected but no migration specified")
@@ -581,9 +960,10 @@ class IntegrationGuardianAgent(BaseAgent):
         try:
             content = path.read_text(encoding='utf-8')
             # Python imports
-            pattern = r'^(?:from|import)\s+([\w.]+)'
-            matches = re.findall(pattern, content, re.MULTILINE)
-            imports = list(set(matches))
+            try:
+                imports = list(set(_analyze_source(content).modules))
+            except (SyntaxError, ValueError):
+                imports = list(set(self._IMPORT_RE.findall(content)))
 
         except Exception as e:
             return {"error": f"Error reading file: {e}"}
@@ -620,6 +1000,8 @@ class IntegrationGuardianAgent(BaseAgent):
         breaking_changes: List[str]
     ) -> str:
         """יצירת דוח שינויים"""
+        self._invalidate_files(files_changed + files_added + files_deleted)
+
         report = f"""
 📝 סיכום שינויים:
 ══════════════════════════════════════
@@ -185,10 +185,11 @@ class SecurityAgent(BaseAgent):
         results["summary"] = self._summarize_findings(results["findings"])
 
         # שמירה להיסטוריה
-        self.state["scan_history"].append({
-            "timestamp": results["timestamp"],
-            "summary": results["summary"]
-        })
+        with self.mutate_state() as state:
+            state["scan_history"].append({
+                "timestamp": results["timestamp"],
+                "summary": results["summary"]
+            })
 
         # טיפול בממצאים קריטיים
         self._handle_critical_findings(results["findings"])
@@ -363,28 +364,30 @@ class SecurityAgent(BaseAgent):
         for finding in critical_findings:
             self.log(f"CRITICAL finding: {finding['type']} in {finding.get('file', 'unknown')}", "error")
 
-            # הוספה לפעולות ממתינות
-            self.pending_actions.append({
-                "id": finding["id"],
-                "action": "fix_critical_vulnerability",
-                "finding": finding,
-                "created_at": datetime.now().isoformat(),
-                "status": "pending"
-            })
-
-        self.state["pending_approvals"] = self.pending_actions
+        # הוספה לפעולות ממתינות (הרשימה נשמרת גם ב-state)
+        with self.mutate_state() as state:
+            for finding in critical_findings:
+                self.pending_actions.append({
+                    "id": finding["id"],
+                    "action": "fix_critical_vulnerability",
+                    "finding": finding,
+                    "created_at": datetime.now().isoformat(),
+                    "status": "pending"
+                })
+            state["pending_approvals"] = self.pending_actions
         self.save_state()
 
     def approve_action(self, action_id: str) -> Dict[str, Any]:
         """אישור פעולה ממתינה"""
         for action in self.pending_actions:
             if action["id"] == action_id:
-                action["status"] = "approved"
-                action["approved_at"] = datetime.now().isoformat()
+                with self.mutate_state() as state:
+                    action["status"] = "approved"
+                    action["approved_at"] = datetime.now().isoformat()
 
-                self.state["actions_taken"].append(action)
-                self.pending_actions.remove(action)
-                self.state["pending_approvals"] = self.pending_actions
+                    state["actions_taken"].append(action)
+                    self.pending_actions.remove(action)
+                    state["pending_approvals"] = self.pending_actions
                 self.save_state()
 
                 self.log_action("action_approved", {"action_id": action_id})
@@ -396,12 +399,13 @@ class SecurityAgent(BaseAgent):
         """דחיית פעולה ממתינה"""
         for action in self.pending_actions:
             if action["id"] == action_id:
-                action["status"] = "rejected"
-                action["rejected_at"] = datetime.now().isoformat()
-                action["rejection_reason"] = reason
+                with self.mutate_state() as state:
+                    action["status"] = "rejected"
+                    action["rejected_at"] = datetime.now().isoformat()
+                    action["rejection_reason"] = reason
 
-                self.pending_actions.remove(action)
-                self.state["pending_approvals"] = self.pending_actions
+                    self.pending_actions.remove(action)
+                    state["pending_approvals"] = self.pending_actions
                 self.save_state()
 
                 self.log_action("action_rejected", {"action_id": action_id, "reason": reason})
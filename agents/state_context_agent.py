@@ -435,9 +435,8 @@ class StateContextAgent(BaseAgent):
             "timestamp": datetime.now().isoformat()
         }
 
-        if "alerts" not in self.state:
-            self.state["alerts"] = []
-        self.state["alerts"].append(alert)
+        with self.mutate_state() as state:
+            state.setdefault("alerts", []).append(alert)
         self.save_state()
 
         self.log("warning", f"REGRESSION ALERT: {description}")
@@ -450,9 +449,8 @@ class StateContextAgent(BaseAgent):
             "timestamp": datetime.now().isoformat()
         }
 
-        if "alerts" not in self.state:
-            self.state["alerts"] = []
-        self.state["alerts"].append(alert)
+        with self.mutate_state() as state:
+            state.setdefault("alerts", []).append(alert)
         self.save_state()
 
         self.log("warning", f"CONFLICT ALERT: {description}")
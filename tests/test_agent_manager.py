@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the agent manager.
+בדיקות למנהל הסוכנים - הודעות, שידורים ויומן אירועים
+"""
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.agent_manager as agent_manager
+import agents.base_agent as base_agent
+from agents.agent_manager import AgentManager
+from agents.base_agent import BaseAgent
+
+
+class DummyAgent(BaseAgent):
+    """Minimal agent for manager tests."""
+
+    def run(self, *args, **kwargs):
+        return {"args": list(args), **kwargs}
+
+    def get_status(self):
+        return {"runs": len(self.get_action_history())}
+
+    def close(self):
+        self.close_calls = getattr(self, "close_calls", 0) + 1
+        super().close()
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Agent manager writing its state to a temp directory."""
+    monkeypatch.setattr(agent_manager, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "LOGS_DIR", tmp_path)
+
+    mgr = AgentManager()
+    for name in ("alpha", "beta", "gamma"):
+        mgr.register_agent(DummyAgent(name))
+    with mgr:
+        yield mgr
+
+
+class TestMessaging:
+    """Tests for direct messages and broadcasts."""
+
+    def test_messages_sorted_by_priority(self, manager):
+        """Higher priority first, then send order."""
+        manager.send_message("alpha", "beta", "note", "low")
+        manager.send_message("alpha", "beta", "note", "high", priority=5)
+        manager.send_message("alpha", "beta", "note", "low2")
+
+        contents = [m.content for m in manager.get_messages("beta")]
+        assert contents == ["high", "low", "low2"]
+        assert manager.get_messages("beta") == []
+
+    def test_unknown_receiver_rejected(self, manager):
+        """Messages to unregistered agents are not accepted."""
+        assert manager.send_message("alpha", "nobody", "note", "x") is False
+        assert manager.get_message_stats()["total"] == 0
+
+    def test_broadcast_reaches_every_agent(self, manager):
+        """A broadcast read by one agent is still delivered to the others."""
+        manager.broadcast("alpha", "announce", "hello")
+
+        assert [m.content for m in manager.get_messages("beta")] == ["hello"]
+        assert [m.content for m in manager.get_messages("gamma")] == ["hello"]
+        assert manager.get_messages("beta") == []
+
+    def test_read_history(self, manager):
+        """unread_only=False returns messages that were already read."""
+        manager.send_message("alpha", "beta", "note", "first")
+        manager.get_messages("beta")
+
+        history = manager.get_messages("beta", unread_only=False)
+        assert [m.content for m in history] == ["first"]
+
+    def test_message_stats_and_cleanup(self, manager):
+        """Counters track reads and cleanup drops read messages."""
+        manager.send_message("alpha", "beta", "note", "x")
+        manager.broadcast("alpha", "announce", "y")
+        assert manager.get_message_stats() == {
+            "total": 2, "unread": 2, "by_type": {"note": 1, "announce": 1}
+        }
+
+        manager.get_messages("beta")
+        assert manager.get_message_stats()["unread"] == 0
+
+        manager.cleanup()
+        # alpha and gamma have not read the broadcast yet
+        assert manager.get_message_stats()["total"] == 1
+
+
+class TestEventLog:
+    """Tests for event logging and persistence."""
+
+    def test_run_agent_logs_events(self, manager):
+        """run_agent records start and completion events."""
+        result = manager.run_agent("alpha", 1, mode="x")
+
+        assert result == {"args": [1], "mode": "x"}
+        types = [e["type"] for e in manager.get_event_log(2)]
+        assert types == ["agent_started", "agent_completed"]
+
+    def test_events_reloaded_after_close(self, manager):
+        """A new manager loads the events saved when the previous one closed."""
+        manager.run_agent("alpha")
+        manager.close()
+        manager.close()
+
+        with AgentManager() as reloaded:
+            assert reloaded.get_event_log(3) == manager.get_event_log(3)
+
+        assert [a.close_calls for a in manager.agents.values()] == [1, 1, 1]
+
+
+class TestParallel:
+    """Tests for run_agents_parallel."""
+
+    def test_tasks_of_one_agent_run_serially(self, manager):
+        """Duplicate agent names run one after another; the last result is kept."""
+        running = {"alpha": 0, "beta": 0}
+        overlap = []
+        lock = threading.Lock()
+
+        def run(name):
+            def wrapper(*args, **kwargs):
+                with lock:
+                    running[name] += 1
+                    overlap.append(running[name] > 1)
+                time.sleep(0.02)
+                with lock:
+                    running[name] -= 1
+                return {"args": list(args)}
+            return wrapper
+
+        for name in running:
+            manager.get_agent(name).run = run(name)
+
+        results = manager.run_agents_parallel([
+            {"agent_name": "alpha", "args": [1]},
+            {"agent_name": "beta", "args": [2]},
+            {"agent_name": "alpha", "args": [3]},
+        ])
+        assert results == {"alpha": {"args": [3]}, "beta": {"args": [2]}}
+        assert not any(overlap)
+
+class TestAgentState:
+    """Tests for BaseAgent state handling."""
+
+    def test_save_waits_for_mutate_state(self, manager):
+        """A save from another thread waits until the mutate_state() block exits."""
+        agent = manager.get_agent("alpha")
+        saver = threading.Thread(target=agent.save_state)
+        with agent.mutate_state() as state:
+            state["items"] = [1]
+            saver.start()
+            saver.join(0.1)
+            assert saver.is_alive()
+            state["items"].append(2)
+        saver.join()
+
+        assert base_agent.json_loads(agent._state_file.read_bytes())["items"] == [1, 2]
+
+    def test_failed_save_keeps_previous_state(self, manager, monkeypatch):
+        """A save that fails mid-write leaves the previous state file intact."""
+        agent = manager.get_agent("alpha")
+        with agent.mutate_state() as state:
+            state["items"] = [1]
+        agent.save_state()
+
+        def fail(fd):
+            raise OSError("disk full")
+
+        with agent.mutate_state() as state:
+            state["items"].append(2)
+        with monkeypatch.context() as m, pytest.raises(OSError):
+            m.setattr(base_agent.os, "fsync", fail)
+            agent.save_state()
+
+        assert base_agent.json_loads(agent._state_file.read_bytes())["items"] == [1]
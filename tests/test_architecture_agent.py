@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the architecture agent.
+בדיקות לסוכן הארכיטקטורה - שמירת ADRs ביומן וטעינה מחדש
+"""
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.architecture_agent as architecture_agent
+import agents.base_agent as base_agent
+from agents.architecture_agent import ArchitectureAgent
+
+
+@pytest.fixture
+def agent_dir(tmp_path, monkeypatch):
+    """Agents writing their files to a temp directory."""
+    monkeypatch.setattr(architecture_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "LOGS_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def new_agent(agent_dir):
+    """Factory for agents that are closed when the test ends."""
+    agents = []
+
+    def factory():
+        agents.append(ArchitectureAgent())
+        return agents[-1]
+
+    yield factory
+    for agent in agents:
+        agent.close()
+
+
+def create_adr(agent, title, defer=False):
+    return agent.create_adr(title, "context", "decision", "reasoning", [], "none", defer=defer)
+
+
+class TestADRPersistence:
+    """Tests for the ADR snapshot + change log."""
+
+    def test_changes_reloaded_from_log(self, new_agent):
+        """A new agent sees ADRs created and updated by the previous one."""
+        agent = new_agent()
+        create_adr(agent, "Use SQLite")
+        create_adr(agent, "Use Flask")
+        agent.update_adr_status(2, "accepted")
+
+        reloaded = new_agent()
+        assert [(a["id"], a["status"]) for a in reloaded.list_adrs()] == [
+            (1, "proposed"), (2, "accepted")
+        ]
+        assert reloaded.get_status()["active_adrs"] == 1
+
+    def test_deferred_changes_written_on_flush(self, new_agent):
+        """defer=True keeps changes in memory until flush()."""
+        agent = new_agent()
+        create_adr(agent, "Use SQLite", defer=True)
+        assert new_agent().list_adrs() == []
+
+        assert agent.flush()["adrs"] is True
+        assert [a["title"] for a in new_agent().list_adrs()] == ["Use SQLite"]
+
+    def test_log_compacted_into_snapshot(self, agent_dir, new_agent, monkeypatch):
+        """A large log is folded into adrs.json and replay is idempotent."""
+        monkeypatch.setattr(architecture_agent, "_ADR_LOG_COMPACT_RATIO", 0)
+        monkeypatch.setattr(architecture_agent, "_ADR_LOG_COMPACT_MIN", 0)
+        agent = new_agent()
+        create_adr(agent, "Use SQLite")
+        create_adr(agent, "Use Flask")
+
+        adr_dir = agent_dir / "architecture" / "adrs"
+        assert (adr_dir / "adrs.json").exists()
+        assert (adr_dir / "adrs.log.jsonl").read_bytes() == b""
+
+        # log left over from a crash between snapshot and truncate
+        (adr_dir / "adrs.log.jsonl").write_bytes(
+            b'{"op": "create", "adr": {"id": 1, "title": "Use SQLite", "status": "proposed",'
+            b' "context": "", "decision": "", "reasoning": "", "alternatives": [],'
+            b' "consequences": "", "created_at": "2024-01-01T00:00:00"}}\n'
+        )
+        assert [a["id"] for a in new_agent().list_adrs()] == [1, 2]
+
+
+    def test_failed_snapshot_keeps_previous_files(self, agent_dir, new_agent, monkeypatch):
+        """A snapshot that fails mid-write leaves adrs.json and the log intact."""
+        agent = new_agent()
+        create_adr(agent, "Use SQLite")
+        agent._save_adrs()
+        create_adr(agent, "Use Flask")
+
+        def fail(fd):
+            raise OSError("disk full")
+
+        with monkeypatch.context() as m, pytest.raises(OSError):
+            m.setattr(base_agent.os, "fsync", fail)
+            agent._save_adrs()
+
+        adr_dir = agent_dir / "architecture" / "adrs"
+        snapshot = base_agent.json_loads((adr_dir / "adrs.json").read_bytes())
+        assert [a["title"] for a in snapshot] == ["Use SQLite"]
+        assert [a["title"] for a in new_agent().list_adrs()] == ["Use SQLite", "Use Flask"]
+
+class TestDependencies:
+    """Tests for dependency ordering and cycle detection."""
+
+    def test_dependency_order_and_cycles(self, new_agent):
+        """Components are ordered after their dependencies; cycles are reported."""
+        agent = new_agent()
+        for name, deps in [
+            ("web", ["api"]), ("api", ["db"]), ("db", []),
+            ("a", ["b"]), ("b", ["a"]), ("self", ["self"]),
+        ]:
+            agent.register_component(name, "python", name, "http", deps)
+
+        order, cycles = agent._topo_sort()
+        assert order == ["db", "api", "web"]
+        assert cycles == [["a", "b"], ["self"]]
+
+        issues = agent.check_consistency()["issues"]
+        assert issues == [{"type": "CIRCULAR_DEPENDENCY", "components": [["a", "b"], ["self"]]}]
+
+        agent.update_dependencies("b", [])
+        assert agent.check_consistency()["issues"] == [
+            {"type": "CIRCULAR_DEPENDENCY", "components": [["self"]]}
+        ]
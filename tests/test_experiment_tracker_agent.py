@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the experiment tracker agent.
+בדיקות לסוכן מעקב הניסויים - יומן שינויים וטעינה מחדש
+"""
+import pytest
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.base_agent as base_agent
+import agents.experiment_tracker_agent as experiment_tracker_agent
+from agents.experiment_tracker_agent import ExperimentTrackerAgent
+
+
+@pytest.fixture
+def agent_dir(tmp_path, monkeypatch):
+    """Agents writing their files to a temp directory."""
+    monkeypatch.setattr(experiment_tracker_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "LOGS_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def new_agent(agent_dir):
+    """Factory for agents that are closed when the test ends."""
+    agents = []
+
+    def factory():
+        agents.append(ExperimentTrackerAgent())
+        return agents[-1]
+
+    yield factory
+    for agent in agents:
+        agent.close()
+
+
+def create_experiment(agent, name, exp_type="ab_test"):
+    return agent.create_experiment(name, "hypothesis", exp_type, {"dpi": 300}, [{"name": "acc"}])
+
+
+class TestPersistence:
+    """Tests for the experiments snapshot + journal."""
+
+    def test_changes_reloaded_from_journal(self, new_agent):
+        """A new agent sees experiments created and updated by the previous one."""
+        agent = new_agent()
+        first = create_experiment(agent, "first")
+        second = create_experiment(agent, "second")
+        agent.start_experiment(first.id)
+        agent.record_results(second.id, {"acc": 0.9}, "ההיפותזה אושרה")
+
+        reloaded = new_agent()
+        assert reloaded.get_experiment_details(first.id)["status"] == "running"
+        assert reloaded.get_experiment_details(second.id) == agent.get_experiment_details(second.id)
+
+    def test_journal_compacted_into_snapshot(self, agent_dir, new_agent, monkeypatch):
+        """A large journal is folded into experiments.json."""
+        monkeypatch.setattr(experiment_tracker_agent, "_JOURNAL_COMPACT_SIZE", 0)
+        agent = new_agent()
+        create_experiment(agent, "first")
+
+        experiments_dir = agent_dir / "experiments"
+        assert (experiments_dir / "experiments.log.jsonl").read_bytes() == b""
+        assert [e["name"] for e in new_agent().list_experiments()] == ["first"]
+
+    def test_failed_snapshot_keeps_previous_files(self, agent_dir, new_agent, monkeypatch):
+        """A snapshot that fails mid-write leaves experiments.json and the journal intact."""
+        agent = new_agent()
+        create_experiment(agent, "first")
+        agent._save_experiments()
+        create_experiment(agent, "second")
+
+        def fail(fd):
+            raise OSError("disk full")
+
+        with monkeypatch.context() as m, pytest.raises(OSError):
+            m.setattr(experiment_tracker_agent.os, "fsync", fail)
+            agent._save_experiments()
+
+        experiments_dir = agent_dir / "experiments"
+        assert [e["name"] for e in base_agent.json_loads(
+            (experiments_dir / "experiments.json").read_bytes()
+        )] == ["first"]
+        assert sorted(e["name"] for e in new_agent().list_experiments()) == ["first", "second"]
+
+    def test_saved_record_matches_asdict(self, new_agent):
+        """The shallow save dict has exactly the dataclass fields."""
+        agent = new_agent()
+        exp = create_experiment(agent, "first")
+        assert experiment_tracker_agent._experiment_to_json(exp) == asdict(exp)
+
+    def test_close_releases_handles(self, new_agent):
+        """close() closes the journal and counter.bin; a second call does nothing."""
+        agent = new_agent()
+        exp = create_experiment(agent, "first")
+        agent.close()
+        agent.close()
+
+        assert agent._journal is None and agent._counter_fd is None
+        assert new_agent().get_experiment_details(exp.id)["name"] == "first"
+
+    def test_ids_not_reused(self, agent_dir, new_agent):
+        """Ids come from counter.bin, not from the number of loaded experiments."""
+        agent = new_agent()
+        create_experiment(agent, "first")
+        create_experiment(agent, "second")
+
+        # registry rolled back to one experiment - the next id must not be exp-002
+        (agent_dir / "experiments" / "experiments.log.jsonl").write_bytes(
+            (agent_dir / "experiments" / "experiments.log.jsonl").read_bytes().splitlines(True)[0]
+        )
+        reloaded = new_agent()
+        assert create_experiment(reloaded, "third").id == "exp-003"
+
+    def test_hypothesis_confirmed_derived_for_old_records(self, agent_dir, new_agent):
+        """Records saved before hypothesis_confirmed existed get it from the conclusion."""
+        agent = new_agent()
+        exp = create_experiment(agent, "first")
+        agent.record_results(exp.id, {"acc": 0.9}, "ההיפותזה אושרה")
+        assert exp.hypothesis_confirmed is True
+
+        record = asdict(exp)
+        del record["hypothesis_confirmed"]
+        (agent_dir / "experiments" / "experiments.log.jsonl").write_bytes(b"")
+        (agent_dir / "experiments" / "experiments.json").write_bytes(
+            base_agent.json_dumps([record])
+        )
+        assert new_agent().experiments[exp.id].hypothesis_confirmed is True
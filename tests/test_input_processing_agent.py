@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the input processing agent.
+בדיקות לסוכן עיבוד הקלטים - זיהוי encoding ועיבוד קבצי טקסט
+"""
+import math
+import pytest
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.base_agent as base_agent
+import agents.input_processing_agent as input_processing_agent
+from agents.input_processing_agent import InputProcessingAgent, _count_words, _sniff_encoding
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Agent writing its outputs to a temp directory."""
+    monkeypatch.setattr(base_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "LOGS_DIR", tmp_path)
+    agent = make_agent(tmp_path)
+    yield agent
+    agent.close()
+
+
+def make_agent(tmp_path):
+    return InputProcessingAgent({
+        "input_dir": str(tmp_path / "input"),
+        "output_dir": str(tmp_path / "output"),
+        "versions_dir": str(tmp_path / "versions"),
+    })
+
+
+class TestEncoding:
+    """Tests for the fast encoding sniff."""
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("שלום".encode("utf-8-sig"), "utf-8-sig"),
+        ("שלום".encode("utf-16"), "utf-16"),
+        (b"plain ascii", "utf-8"),
+        ("שלום עולם".encode("utf-8"), "utf-8"),
+        # multi-byte character cut at the end of the sample
+        ("שלום".encode("utf-8")[:-1], "utf-8"),
+        ("שלום עולם".encode("cp1255"), "cp1255"),
+        ("The café was closed for the season.".encode("cp1252"), "cp1252"),
+    ])
+    def test_sniff(self, raw, expected):
+        """BOM, valid UTF-8, then the cp1255 Hebrew byte share."""
+        assert _sniff_encoding(raw) == expected
+
+    def test_text_file_processed_with_detected_encoding(self, agent, tmp_path):
+        """A cp1255 file is classified and decoded without replacement chars."""
+        path = tmp_path / "hebrew.txt"
+        path.write_bytes("שלום עולם\nשורה שנייה\n".encode("cp1255"))
+
+        result = agent.process_file(str(path))
+        assert result["classification"]["encoding"] == "cp1255"
+        assert result["content"]["full_text"] == "שלום עולם\nשורה שנייה\n"
+        assert result["content"]["word_count"] == 4
+
+        # close() waits for the report written in the background
+        agent.close()
+        assert (tmp_path / "output" / "reports" / f"{result['id']}_report.md").exists()
+
+
+class TestJson:
+    """Tests for JSON input."""
+
+    def test_non_finite_floats_survive_cache(self, agent, tmp_path):
+        """NaN/Infinity are written back as-is and read from the cached result."""
+        path = tmp_path / "values.json"
+        path.write_text('{"x": NaN, "y": Infinity, "z": 1.5}', encoding="utf-8")
+
+        fresh = agent.process_file(str(path))
+        cached = agent.process_file(str(path))
+        assert "_stdlib_json" not in fresh
+        for result in (fresh, cached):
+            data = result["content"]["data"]
+            assert math.isnan(data["x"])
+            assert data["y"] == math.inf
+            assert data["z"] == 1.5
+
+
+class TestReports:
+    """Tests for the processing report written in the background."""
+
+    def test_report_ignores_caller_changes(self, agent, tmp_path, monkeypatch):
+        """Changing the returned result does not reach the report still in the queue."""
+        changed = threading.Event()
+        write_report = agent._save_processing_report
+        monkeypatch.setattr(agent, "_save_processing_report", lambda file_id, result: (
+            changed.wait(5), write_report(file_id, result)
+        ))
+        path = tmp_path / "notes.txt"
+        path.write_text("hello world", encoding="utf-8")
+
+        result = agent.process_file(str(path))
+        result["status"] = "edited"
+        del result["classification"]
+        changed.set()
+        agent.close()
+
+        report = (tmp_path / "output" / "reports" / f"{result['id']}_report.md").read_text(
+            encoding="utf-8"
+        )
+        assert "success" in report and "edited" not in report
+        assert "**סוג:** txt" in report
+
+
+class TestClassification:
+    """Tests for file classification."""
+
+    def test_metadata_only_skips_quality_checks(self, agent, tmp_path):
+        """metadata_only keeps the cheap fields and marks quality as skipped."""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello world", encoding="utf-8")
+
+        full = agent.classify_input(str(path))
+        quick = agent.classify_input(str(path), metadata_only=True)
+        assert quick["quality_indicators"] == {"estimated_quality": "unknown", "skipped": True}
+        for key in ("file_type", "file_size", "encoding", "language"):
+            assert quick[key] == full[key]
+
+
+    def test_metadata_only_pdf_extracts_text_only(self, agent, tmp_path, monkeypatch):
+        """A PDF without a /Font hint is opened, but only page 0 text is extracted."""
+        calls = []
+
+        class FakePage:
+            def extract_text(self):
+                calls.append("text")
+                return ""
+
+            def extract_tables(self):
+                calls.append("tables")
+                return []
+
+            @property
+            def images(self):
+                calls.append("images")
+                return []
+
+        class FakePdf:
+            pages = [FakePage()]
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        monkeypatch.setattr(input_processing_agent, "pdfplumber", SimpleNamespace(
+            open=lambda path: FakePdf()
+        ))
+        monkeypatch.setattr(input_processing_agent, "_read_first_page", lambda pdf: pytest.fail(
+            "metadata_only must not read tables or images"
+        ))
+        path = tmp_path / "scan.pdf"
+        path.write_bytes(b"%PDF-1.4\n")
+
+        result = agent.classify_input(str(path), metadata_only=True)
+        assert result["file_type"] == "pdf_scanned"
+        assert calls == ["text"]
+
+
+class TestTextStats:
+    """Tests for text statistics."""
+
+    @pytest.mark.parametrize("text", [
+        "", " ", "one", "שלום עולם", "ab cd ef", " ab  cd\n", "a\u2003b\tc",
+    ])
+    @pytest.mark.parametrize("chunk", [1, 2, 3, 1 << 16])
+    def test_count_words_matches_split(self, text, chunk, monkeypatch):
+        """Chunked counting agrees with str.split() across chunk boundaries."""
+        monkeypatch.setattr(input_processing_agent, "_WORD_COUNT_CHUNK", chunk)
+        assert _count_words(text) == len(text.split())
+
+
+class TestHistory:
+    """Tests for the append-only processing history."""
+
+    def test_history_reloaded_and_compacted(self, agent, tmp_path, monkeypatch):
+        """Records are appended one line each and trimmed on compaction."""
+        monkeypatch.setattr(input_processing_agent, "_HISTORY_KEEP", 2)
+        monkeypatch.setattr(input_processing_agent, "_HISTORY_COMPACT_LINES", 3)
+        for i in range(3):
+            path = tmp_path / f"file{i}.txt"
+            path.write_text(f"text {i}", encoding="utf-8")
+            agent.process_file(str(path))
+
+        history_file = tmp_path / "output" / "processing_history.jsonl"
+        assert len(history_file.read_bytes().splitlines()) == 3
+        reloaded = make_agent(tmp_path)
+        reloaded.close()
+        assert [r["file"] for r in reloaded.processing_history] == ["file1.txt", "file2.txt"]
+
+        (tmp_path / "file3.txt").write_text("text 3", encoding="utf-8")
+        agent.process_file(str(tmp_path / "file3.txt"))
+        assert len(history_file.read_bytes().splitlines()) == 2
+
+    def test_legacy_history_migrated(self, tmp_path, monkeypatch):
+        """A processing_history.json from before the log is loaded and converted."""
+        monkeypatch.setattr(base_agent, "LOGS_DIR", tmp_path)
+        (tmp_path / "output").mkdir()
+        (tmp_path / "output" / "processing_history.json").write_bytes(
+            b'[{"id": "a", "file": "a.txt", "status": "success"}]'
+        )
+
+        agent = make_agent(tmp_path)
+        agent.close()
+        assert agent.get_status()["total_processed"] == 1
+        assert (tmp_path / "output" / "processing_history.jsonl").exists()
+
+
+class TestValidation:
+    """Tests for content validation."""
+
+    @pytest.mark.parametrize("text, chars", [
+        ("clean text", []),
+        ("bad\x00text", ["'\\x00'"]),
+        ("bad\ufffdtext\x00", ["'\\x00'", repr("\ufffd")]),
+    ])
+    def test_problematic_chars(self, agent, text, chars):
+        """Each problematic character is reported once, in a fixed order."""
+        result = agent.validate_content({"full_text": text})
+        assert [i["char"] for i in result["issues"]] == chars
+        assert result["score"] == pytest.approx(0.9 ** len(chars))
+
+    def test_inconsistent_table(self, agent):
+        """Tables whose rows differ in length are flagged."""
+        result = agent.validate_content({"full_text": "x", "tables": [
+            {"data": [["a", "b"], ["c", "d"]]},
+            {"data": [["a", "b"], ["c"]]},
+            {"data": []},
+        ]})
+        assert [i.get("table_index") for i in result["issues"]] == [1]
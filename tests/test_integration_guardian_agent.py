@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the integration guardian agent.
+בדיקות לסוכן שומר האינטגרציה - אינדקס ייבוא וניתוח השפעה
+"""
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.base_agent as base_agent
+import agents.integration_guardian_agent as integration_guardian_agent
+from agents.integration_guardian_agent import IntegrationGuardianAgent
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A small Python project used as PROJECT_ROOT."""
+    monkeypatch.setattr(base_agent, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(base_agent, "LOGS_DIR", tmp_path)
+
+    root = tmp_path / "project"
+    monkeypatch.setattr(integration_guardian_agent, "PROJECT_ROOT", root)
+    write(root / "core.py", "import os\n\ndef run(a, b=1):\n    return a\n")
+    write(root / "api" / "routes.py", "from core import run\n")
+    write(root / "tests" / "test_core.py", "import core\n")
+    write(root / "notes.py", 'TEXT = "from core import run"\n')
+    return root
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestDependents:
+    """Tests for the reverse import index."""
+
+    def test_dependents_found_through_index(self, project):
+        """Only files with a real import line are dependents."""
+        agent = IntegrationGuardianAgent()
+        assert agent._find_dependents(str(project / "core.py")) == [
+            str(Path("api") / "routes.py"), str(Path("tests") / "test_core.py")
+        ]
+
+    def test_reported_changes_update_index(self, project):
+        """Files passed to generate_change_report are re-read into the index."""
+        agent = IntegrationGuardianAgent()
+        agent._find_dependents(str(project / "core.py"))
+
+        write(project / "api" / "routes.py", "import json\n")
+        write(project / "cli.py", "from core import run\n")
+        agent.generate_change_report(
+            [str(project / "api" / "routes.py")], [str(project / "cli.py")], [], []
+        )
+
+        assert agent._find_dependents(str(project / "core.py")) == [
+            "cli.py", str(Path("tests") / "test_core.py")
+        ]
+
+    def test_manifest_reused_across_agents(self, project, monkeypatch):
+        """A new agent re-parses only files that changed since the saved manifest."""
+        IntegrationGuardianAgent()._find_dependents(str(project / "core.py"))
+
+        parsed = []
+        original = IntegrationGuardianAgent._import_names.__func__
+        monkeypatch.setattr(IntegrationGuardianAgent, "_import_names", classmethod(
+            lambda cls, content: parsed.append(content) or original(cls, content)
+        ))
+        write(project / "notes.py", "import core\n")
+
+        agent = IntegrationGuardianAgent()
+        assert "notes.py" in agent._find_dependents(str(project / "core.py"))
+        assert parsed == [b"import core\n"]
+        assert agent.state["file_manifest"]["notes.py"]["imports"] == ["core"]
+
+
+    def test_index_built_in_process_pool(self, project, monkeypatch):
+        """Above _INDEX_PARALLEL_MIN_FILES changed files are parsed in non-fork workers."""
+        monkeypatch.setattr(integration_guardian_agent, "_INDEX_PARALLEL_MIN_FILES", 2)
+        start_methods = []
+        pool_class = integration_guardian_agent.ProcessPoolExecutor
+
+        def spy(*args, **kwargs):
+            start_methods.append(kwargs["mp_context"].get_start_method())
+            return pool_class(*args, **kwargs)
+
+        monkeypatch.setattr(integration_guardian_agent, "ProcessPoolExecutor", spy)
+        agent = IntegrationGuardianAgent({"index_workers": 2})
+        assert agent._find_dependents(str(project / "core.py")) == [
+            str(Path("api") / "routes.py"), str(Path("tests") / "test_core.py")
+        ]
+        assert start_methods and start_methods[0] != "fork"
+        routes = agent.state["file_manifest"][str(Path("api") / "routes.py")]
+        assert routes["imports"] == ["core", "run"]
+
+class TestImpact:
+    """Tests for impact analysis."""
+
+    def test_transitive_dependents_bounded_by_depth(self, project):
+        """Interface changes reach importers of importers, up to max_depth."""
+        write(project / "app.py", "from api import routes\n")
+        write(project / "main.py", "import app\n")
+        agent = IntegrationGuardianAgent()
+        core = str(project / "core.py")
+        routes = str(Path("api") / "routes.py")
+        test_core = str(Path("tests") / "test_core.py")
+
+        def indirect(change_type, max_depth=None):
+            return sorted(agent.analyze_impact([core], change_type, max_depth)["indirect_files"])
+
+        assert indirect(integration_guardian_agent.ChangeType.MODIFY) == sorted([routes, test_core])
+        assert indirect(integration_guardian_agent.ChangeType.DELETE) == sorted([
+            "app.py", "main.py", routes, test_core
+        ])
+        assert indirect(integration_guardian_agent.ChangeType.DELETE, 2) == sorted([
+            "app.py", routes, test_core
+        ])
+
+        plan = {"files": [core], "max_depth": 2}
+        assert sorted(agent.validate_change(plan)["impact"]["indirect_files"]) == sorted([
+            "app.py", routes, test_core
+        ])
+
+    def test_non_utf8_source_indexed(self, project):
+        """A file with a PEP 263 coding declaration is parsed in its own encoding."""
+        (project / "legacy.py").write_bytes(
+            "# -*- coding: cp1255 -*-\nimport core\nTITLE = 'שלום'\n".encode("cp1255")
+        )
+        agent = IntegrationGuardianAgent()
+        assert "legacy.py" in agent._find_dependents(str(project / "core.py"))
+
+
+class TestFileAnalysis:
+    """Tests for the single-pass AST analysis."""
+
+    def test_endpoints_and_tables(self, project):
+        """Routes come from decorators (also async), tables from model base classes."""
+        write(project / "api" / "views.py", (
+            '"""Example: @app.get("/docs")"""\n'
+            "@app.get('/users')\n"
+            "def users(): pass\n"
+            "@router.post(\"/items\")\n"
+            "async def items(): pass\n"
+            "class User(Base): pass\n"
+            "class Order(db.Model): pass\n"
+            "class Helper(object): pass\n"
+        ))
+        agent = IntegrationGuardianAgent()
+        views = str(project / "api" / "views.py")
+        assert agent._extract_endpoints(views) == ["/users", "/items"]
+        assert agent._extract_tables(views) == ["User", "Order"]
+
+    def test_analysis_cached_by_digest(self, project):
+        """The analysis cache is keyed by the SHA-256 digest, not the source text."""
+        source = "def f(a): pass\n" * 100
+        analysis = integration_guardian_agent._analyze_source(source)
+        assert integration_guardian_agent._analyze_source(source) is analysis
+        assert source not in integration_guardian_agent._analysis_cache
+        assert all(len(key) == 32 for key in integration_guardian_agent._analysis_cache)
+
+    def test_backward_compatibility(self, project):
+        """Removed functions and new required arguments are breaking changes."""
+        result = IntegrationGuardianAgent().check_backward_compatibility(
+            "def f(a, b=1): pass\ndef g(): pass\n",
+            "def f(a, b, c=1): pass\n",
+        )
+        assert result["issues"] == [
+            "Function 'g' was removed - breaking change",
+            "Function 'f' now requires more arguments - breaking change",
+        ]
+
+
+class TestScan:
+    """Tests for technology detection."""
+
+    def test_rescan_does_not_accumulate_or_mutate_templates(self, project, tmp_path):
+        """Each scan reports only its own project; the shared templates are untouched."""
+        write(project / "package.json", '{"version": "1.2.3"}')
+        other = tmp_path / "other"
+        write(other / "pubspec.yaml", "version: 0.1.0\n")
+
+        agent = IntegrationGuardianAgent()
+        agent.scan_project(project)
+        agent.scan_project(project)
+        assert agent.get_status()["technologies_detected"] == 1
+        assert agent.detected_technologies[0].version == "1.2.3"
+
+        summary = agent.scan_project(other)["summary"]
+        assert summary["backend"] == {"framework": "Unknown", "language": "Unknown"}
+        assert summary["mobile"] == {"framework": "Flutter"}
+        assert not any(t.detected for t in IntegrationGuardianAgent.TECH_DETECTORS.values())